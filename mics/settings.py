@@ -1,4 +1,5 @@
 # Django settings for mics project.
+import os
 
 DEBUG = True
 TEMPLATE_DEBUG = DEBUG
@@ -31,7 +32,8 @@ CACHES = {
         'BINARY': False,
         'OPTIONS': {  # Maps to pylibmc "behaviors"
             'tcp_nodelay': True,
-            'ketama': True
+            'ketama': True,
+            'cas': True
         }
     }
 }
@@ -71,6 +73,20 @@ MEDIA_ROOT = ''
 # Examples: "http://example.com/media/", "http://media.example.com/"
 MEDIA_URL = ''
 
+# Absolute filesystem path to the directory that will hold generated export files.
+EXPORTS_ROOT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'exports')
+
+# Seconds a pending or running export job may go without progress before it is treated as failed and queued again.
+EXPORT_JOB_TIMEOUT = 30 * 60
+
+# Seconds a cached indicator result may be served before it is recomputed, even without new answers.
+# None falls back to the cache's default timeout.
+INDICATOR_RESULTS_CACHE_TIMEOUT = None
+
+# Bootstrap replicates drawn for indicator standard errors, and the worker processes they are spread across.
+INDICATOR_BOOTSTRAP_REPLICATES = 200
+INDICATOR_REPLICATE_PROCESSES = None
+
 # Absolute path to the directory static files should be collected to.
 # Don't put anything in this directory yourself; store your static files
 # in apps' "static/" subdirectories and in STATICFILES_DIRS.
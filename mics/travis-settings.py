@@ -16,7 +16,8 @@ CACHES = {
         'BINARY': False,
         'OPTIONS': {  # Maps to pylibmc "behaviors"
             'tcp_nodelay': True,
-            'ketama': True
+            'ketama': True,
+            'cas': True
         }
     }
 }
\ No newline at end of file
@@ -26,7 +26,7 @@ class UploadCSVFileForm(forms.Form):
         return _file
 
     def _is_not_csv(self, _file):
-        return '\0' in _file.read()
+        return CSVUploader.is_not_csv(_file)
 
     def upload(self):
         _file = self.cleaned_data['file']
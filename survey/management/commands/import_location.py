@@ -1,6 +1,7 @@
 from django.core.management.base import BaseCommand, CommandError
 from rapidsms.contrib.locations.models import Location, LocationType
 from django.template.defaultfilters import slugify
+from survey.models.locations import deferred_auto_complete
 import csv
 
 class Command(BaseCommand):
@@ -15,8 +16,9 @@ class Command(BaseCommand):
             header = header.strip().replace("Name", "")
             location_type, created = LocationType.objects.get_or_create(name=header, slug=slugify(header))
             location_types.append(location_type)
-        for items in csv_file:
-            tree_parent = None
-            for index, item in enumerate(items):
-                tree_parent = Location.objects.get_or_create(name=item.strip(), type=location_types[index], tree_parent=tree_parent)[0]
+        with deferred_auto_complete():
+            for items in csv_file:
+                tree_parent = None
+                for index, item in enumerate(items):
+                    tree_parent = Location.objects.get_or_create(name=item.strip(), type=location_types[index], tree_parent=tree_parent)[0]
         self.stdout.write('Successfully imported!')
\ No newline at end of file
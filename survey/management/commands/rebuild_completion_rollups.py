@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from survey.models import Batch, BatchCompletionRollup
+
+
+class Command(BaseCommand):
+    args = '[batch_id ...]'
+    help = 'Recounts the completed and total households of each location and batch'
+
+    def handle(self, *args, **kwargs):
+        batches = Batch.objects.filter(id__in=args) if args else Batch.objects.all()
+        BatchCompletionRollup.rebuild(batches)
+        self.stdout.write('Successfully rebuilt completion rollups!')
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from rapidsms.contrib.locations.models import Location
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the tree fields used for location ancestor and descendant lookups'
+
+    def handle(self, *args, **kwargs):
+        Location._tree_manager.rebuild()
+        self.stdout.write('Successfully rebuilt location tree!')
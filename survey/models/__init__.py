@@ -19,6 +19,15 @@ from survey.models.users import UserProfile
 from survey.models.question_module import QuestionModule
 from survey.models.location_type_details import LocationTypeDetails
 from survey.models.batch_question_order import BatchQuestionOrder
+from survey.models.batch_flow import BatchFlow
+from survey.models.interview_progress import InterviewProgress
+from survey.models.batch_completion_rollup import BatchCompletionRollup
+from survey.models.open_batch_index import OpenBatchIndex
+from survey.models.export_job import ExportJob
+from survey.models.export_snapshot import ExportSnapshot
+from survey.models.location_ancestry import LocationAncestry
+from survey.models.location_search_index import LocationSearchIndex
+from survey.models.indicator_result_cache import IndicatorResultCache
 from survey.models.indicators import Indicator
 from survey.models.about_us_content import AboutUs
 __all__ = [
@@ -46,6 +55,15 @@ __all__ = [
     'QuestionModule',
     'LocationTypeDetails',
     'BatchQuestionOrder',
+    'BatchFlow',
+    'InterviewProgress',
+    'BatchCompletionRollup',
+    'OpenBatchIndex',
+    'ExportJob',
+    'ExportSnapshot',
+    'LocationAncestry',
+    'LocationSearchIndex',
+    'IndicatorResultCache',
     'LocationCode',
     'Indicator',
     'LocationWeight',
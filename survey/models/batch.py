@@ -4,7 +4,7 @@ from rapidsms.contrib.locations.models import Location
 
 from survey.models.surveys import Survey
 from survey.models.base import BaseModel
-from survey.utils.views_helper import get_descendants
+from survey.utils.views_helper import descendants_queryset, ancestors_queryset
 
 
 class Batch(BaseModel):
@@ -34,19 +34,20 @@ class Batch(BaseModel):
 
     @classmethod
     def currently_open_for(self, location):
-        locations = location.get_ancestors(include_self=True)
-        open_batches = BatchLocationStatus.objects.filter(location__in=locations)
-        if open_batches.count() > 0:
-            return open_batches.order_by('created').all()[:1].get().batch
+        from survey.models.open_batch_index import OpenBatchIndex
+        open_batches = OpenBatchIndex.statuses_for_any_of(ancestors_queryset(location, include_self=True))
+        if open_batches:
+            return open_batches[0].batch
 
     def get_groups(self):
         questions = self.all_questions()
         return list(set(map(lambda question: question.group, questions)))
 
-    def has_unanswered_question(self, member):
-        member_answers = member.all_answers(self)
-        for question in self.all_questions():
-            if not member.has_answered(question, member_answers) and member.belongs_to(question.group):
+    def has_unanswered_question(self, member, answered=None):
+        if answered is None:
+            answered = member.answered_question_ids(self)
+        for question in self.flow().questions:
+            if question.id not in answered and member.belongs_to(question.group):
                 return True
 
         return False
@@ -55,18 +56,23 @@ class Batch(BaseModel):
         from survey.models import BatchQuestionOrder
         return BatchQuestionOrder.get_batch_order_specific_questions(self, {})
 
+    def flow(self):
+        from survey.models.batch_flow import BatchFlow
+        return BatchFlow.for_batch(self)
+
     def open_for_location(self, location):
-        all_related_locations = get_descendants(location, include_self=False)
-        for related_location in all_related_locations:
-            self.open_locations.get_or_create(batch=self, location=related_location)
+        from survey.models.open_batch_index import OpenBatchIndex
+        already_open = set(self.open_locations.values_list('location', flat=True))
+        related_locations = descendants_queryset(location, include_self=False).values_list('id', flat=True)
+        BatchLocationStatus.objects.bulk_create([BatchLocationStatus(batch=self, location_id=location_id)
+                                                 for location_id in related_locations if location_id not in already_open])
+        OpenBatchIndex.invalidate()
         return self.open_locations.get_or_create(batch=self, location=location)
 
     def activate_non_response_for(self, location, status=True):
-        all_related_locations = location.get_descendants(include_self=True).all()
-        for related_location in all_related_locations:
-            batch_location_status = self.open_locations.get(location=related_location)
-            batch_location_status.non_response = status
-            batch_location_status.save()
+        from survey.models.open_batch_index import OpenBatchIndex
+        self.open_locations.filter(location__in=descendants_queryset(location)).update(non_response=status)
+        OpenBatchIndex.invalidate()
 
     def deactivate_non_response_for(self, location):
         self.activate_non_response_for(location, False)
@@ -135,8 +141,8 @@ class Batch(BaseModel):
 
     @classmethod
     def open_ordered_batches(cls, location):
-        batch_ids = BatchLocationStatus.objects.filter(location=location).values_list('batch', flat=True)
-        return Batch.objects.filter(id__in=batch_ids).order_by('order')
+        from survey.models.open_batch_index import OpenBatchIndex
+        return OpenBatchIndex.batches_for(location)
 
 
 
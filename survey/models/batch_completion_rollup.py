@@ -0,0 +1,195 @@
+import threading
+
+from django.db import models, transaction, IntegrityError
+from django.db.models import Count, Sum
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from rapidsms.contrib.locations.models import Location
+
+from survey.models.base import BaseModel
+from survey.models.batch import Batch, BatchLocationStatus
+from survey.models.household_batch_completion import HouseholdMemberBatchCompletion, HouseholdBatchCompletion
+from survey.models.households import Household, HouseholdMember, HouseholdHead
+from survey.utils.cache_versions import cache_version, invalidate_version
+from survey.utils.views_helper import descendants_queryset
+
+
+class BatchCompletionRollup(BaseModel):
+    """Completed and total households of a batch's survey living directly in a location."""
+    location = models.ForeignKey(Location, related_name="batch_completion_rollups")
+    batch = models.ForeignKey(Batch, related_name="completion_rollups")
+    total_households = models.PositiveIntegerField(default=0)
+    completed_households = models.PositiveIntegerField(default=0)
+
+    VERSION_KEY = "BatchCompletionRollup-version"
+
+    _local = threading.local()
+
+    class Meta:
+        app_label = 'survey'
+        unique_together = ('location', 'batch')
+
+    @classmethod
+    def version(cls):
+        return cache_version(cls.VERSION_KEY)
+
+    @classmethod
+    def invalidate(cls):
+        invalidate_version(cls.VERSION_KEY)
+
+    @classmethod
+    def completion_counts(cls, households, batch):
+        members = HouseholdMember.objects.filter(household__in=households).values('household').annotate(
+            members=Count('id'))
+        member_counts = dict([(count['household'], count['members']) for count in members])
+        completions = HouseholdMemberBatchCompletion.objects.filter(householdmember__household__in=households,
+                                                                    batch=batch)
+        completions = completions.values('householdmember__household').annotate(
+            members=Count('householdmember', distinct=True))
+        completed_counts = dict([(count['householdmember__household'], count['members']) for count in completions])
+        counts = {}
+        for household_id, location_id in households.values_list('id', 'location'):
+            count = counts.setdefault(location_id, [0, 0])
+            count[1] += 1
+            if completed_counts.get(household_id, 0) == member_counts.get(household_id, 0):
+                count[0] += 1
+        return counts
+
+    @classmethod
+    def recount(cls, location_id, batch):
+        pending = getattr(cls._local, 'pending', None)
+        if pending is not None:
+            pending.add((location_id, batch.id))
+            return
+        if not location_id:
+            return
+        households = Household.objects.filter(location=location_id, survey=batch.survey_id)
+        completed, total = cls.completion_counts(households, batch).get(location_id, [0, 0])
+        rollups = cls.objects.filter(location=location_id, batch=batch)
+        if not total:
+            rollups.delete()
+        elif not rollups.update(total_households=total, completed_households=completed):
+            savepoint = transaction.savepoint()
+            try:
+                cls.objects.create(location_id=location_id, batch=batch, total_households=total,
+                                   completed_households=completed)
+                transaction.savepoint_commit(savepoint)
+            except IntegrityError:
+                transaction.savepoint_rollback(savepoint)
+                rollups.update(total_households=total, completed_households=completed)
+        cls.invalidate()
+
+    @classmethod
+    def recount_locations(cls, location_ids, survey_id):
+        for batch in Batch.objects.filter(survey=survey_id):
+            for location_id in set(location_ids):
+                cls.recount(location_id, batch)
+
+    @classmethod
+    def rebuild(cls, batches=None):
+        for batch in (batches if batches is not None else Batch.objects.all()):
+            households = Household.objects.filter(survey=batch.survey_id).exclude(location=None)
+            counts = cls.completion_counts(households, batch)
+            cls.objects.filter(batch=batch).delete()
+            cls.objects.bulk_create([cls(location_id=location_id, batch=batch, total_households=total,
+                                         completed_households=completed)
+                                     for location_id, (completed, total) in counts.items()])
+        cls.invalidate()
+
+    @classmethod
+    def totals_under(cls, location, batch):
+        totals = cls.objects.filter(batch=batch, location__in=descendants_queryset(location)).aggregate(
+            completed=Sum('completed_households'), total=Sum('total_households'))
+        return totals['completed'] or 0, totals['total'] or 0
+
+
+class deferred_rollups(object):
+    """Collects rollup recounts made inside the block and runs each of them once on exit."""
+
+    def __enter__(self):
+        if getattr(BatchCompletionRollup._local, 'pending', None) is None:
+            BatchCompletionRollup._local.pending = set()
+            self.owner = True
+        else:
+            self.owner = False
+
+    def __exit__(self, *args):
+        if not self.owner:
+            return
+        pending = BatchCompletionRollup._local.pending
+        BatchCompletionRollup._local.pending = None
+        batches = Batch.objects.in_bulk(set([batch_id for location_id, batch_id in pending]))
+        for location_id, batch_id in pending:
+            if batch_id in batches:
+                BatchCompletionRollup.recount(location_id, batches[batch_id])
+
+
+def _recount_household(household_id, batch):
+    location_id = Household.objects.filter(id=household_id).values_list('location', flat=True)
+    if location_id:
+        BatchCompletionRollup.recount(location_id[0], batch)
+
+
+@receiver(post_save, sender=HouseholdMemberBatchCompletion)
+@receiver(post_delete, sender=HouseholdMemberBatchCompletion)
+def recount_member_completion(sender, instance, **kwargs):
+    if not instance.batch_id:
+        return
+    household_id = HouseholdMember.objects.filter(id=instance.householdmember_id).values_list('household', flat=True)
+    if household_id:
+        _recount_household(household_id[0], Batch.objects.get(id=instance.batch_id))
+
+
+@receiver(post_save, sender=HouseholdBatchCompletion)
+@receiver(post_delete, sender=HouseholdBatchCompletion)
+def recount_household_completion(sender, instance, **kwargs):
+    if instance.batch_id and instance.household_id:
+        _recount_household(instance.household_id, Batch.objects.get(id=instance.batch_id))
+
+
+@receiver(post_save, sender=HouseholdMember)
+@receiver(post_save, sender=HouseholdHead)
+@receiver(post_delete, sender=HouseholdMember)
+@receiver(post_delete, sender=HouseholdHead)
+def recount_household_members(sender, instance, created=True, **kwargs):
+    if not created:
+        return
+    household = Household.objects.filter(id=instance.household_id).values_list('location', 'survey')
+    if household:
+        BatchCompletionRollup.recount_locations([household[0][0]], household[0][1])
+
+
+@receiver(pre_save, sender=Household)
+def remember_household_location(sender, instance, **kwargs):
+    previous = Household.objects.filter(id=instance.id).values_list('location', 'survey') if instance.id else []
+    instance._rollup_previous = previous[0] if previous else None
+
+
+@receiver(post_save, sender=Household)
+@receiver(post_delete, sender=Household)
+def recount_household(sender, instance, **kwargs):
+    previous = getattr(instance, '_rollup_previous', None)
+    if previous and previous != (instance.location_id, instance.survey_id):
+        BatchCompletionRollup.recount_locations([previous[0]], previous[1])
+    BatchCompletionRollup.recount_locations([instance.location_id], instance.survey_id)
+
+
+@receiver(pre_save, sender=Batch)
+def remember_batch_survey(sender, instance, **kwargs):
+    previous = Batch.objects.filter(id=instance.id).values_list('survey', flat=True) if instance.id else []
+    instance._rollup_previous_survey = previous[0] if previous else None
+
+
+@receiver(post_save, sender=Batch)
+def rebuild_batch_rollups(sender, instance, created, **kwargs):
+    if created or getattr(instance, '_rollup_previous_survey', None) != instance.survey_id:
+        BatchCompletionRollup.rebuild([instance])
+
+
+@receiver(post_delete, sender=Batch)
+@receiver(post_save, sender=BatchLocationStatus)
+@receiver(post_delete, sender=BatchLocationStatus)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_rollup_version(sender, instance, **kwargs):
+    BatchCompletionRollup.invalidate()
@@ -0,0 +1,184 @@
+from django.core.cache import cache
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+
+from survey.models.answer_rule import AnswerRule
+from survey.models.batch import Batch
+from survey.models.batch_question_order import BatchQuestionOrder
+from survey.models.householdgroups import HouseholdMemberGroup, GroupCondition
+from survey.models.question import Question
+from survey.utils.cache_versions import cache_version, invalidate_version
+
+
+class BatchFlow(object):
+    """Question order, groups and rules of a batch, compiled once per version.
+
+    Memcache only holds the plan of question ids, orders and rule ids, which stays small for any batch; each
+    process loads the models behind it once and keeps the compiled flow until the version changes.
+    """
+    CACHE_KEY = "BatchFlow-%s-%s"
+    VERSION_KEY = "BatchFlow-version-%s"
+
+    _compiled = {}
+
+    def __init__(self, batch, version=None, plan=None):
+        self.batch_id = batch.id
+        self.batch_created = batch.created
+        self.version = version
+        self.questions = []
+        self.question_orders = {}
+        self.groups = []
+        self.groups_by_id = {}
+        self.questions_by_group = {}
+        self.last_question_of_group = {}
+        self.parents = {}
+        self.rules = {}
+        if plan:
+            self.load(plan)
+        else:
+            self.compile(batch)
+
+    def compile(self, batch):
+        batch_question_orders = BatchQuestionOrder.objects.select_related('question__group').prefetch_related(
+            'question__group__conditions').filter(batch=batch).order_by('order')
+        orders = [(batch_question_order.question, batch_question_order.order)
+                  for batch_question_order in batch_question_orders]
+        question_ids = [question.id for question, order in orders if not question.subquestion]
+        parent_ids = dict(Question.objects.filter(parent__in=question_ids).values_list('id', 'parent'))
+        rules = AnswerRule.objects.select_related('question', 'next_question', 'validate_with_question',
+                                                  'validate_with_option').filter(
+            question__in=question_ids + parent_ids.keys())
+        self._build(orders, parent_ids, rules)
+
+    def load(self, plan):
+        questions = Question.objects.select_related('group').prefetch_related('group__conditions').in_bulk(
+            [question_id for question_id, order in plan['orders']])
+        orders = [(questions[question_id], order) for question_id, order in plan['orders']
+                  if question_id in questions]
+        rules = AnswerRule.objects.select_related('question', 'next_question', 'validate_with_question',
+                                                  'validate_with_option').filter(id__in=plan['rules']).order_by('id')
+        self._build(orders, plan['parents'], rules)
+
+    def _build(self, orders, parent_ids, rules):
+        last_orders = {}
+        for question, order in orders:
+            self.question_orders[question.id] = order
+            if question.subquestion:
+                continue
+            self.questions.append(question)
+            self.questions_by_group.setdefault(question.group_id, []).append(question)
+            if question.group and question.group_id not in self.groups_by_id:
+                self.groups_by_id[question.group_id] = question.group
+            if question.order is not None and order >= last_orders.get(question.group_id, 0):
+                last_orders[question.group_id] = order
+                self.last_question_of_group[question.group_id] = question
+
+        self.groups = sorted(self.groups_by_id.values(), key=lambda group: group.order)
+        questions_by_id = dict([(question.id, question) for question in self.questions])
+        for subquestion_id, parent_id in parent_ids.items():
+            if parent_id in questions_by_id:
+                self.parents[subquestion_id] = questions_by_id[parent_id]
+
+        rule_ids = []
+        for rule in rules:
+            self.rules.setdefault(rule.question_id, []).append(rule)
+            rule_ids.append(rule.id)
+        self.plan = {'batch_created': self.batch_created, 'parents': parent_ids, 'rules': rule_ids,
+                     'orders': [(question.id, order) for question, order in orders]}
+
+    def order_of(self, question):
+        return self.question_orders.get(question.id, 0)
+
+    def parent_of(self, question):
+        if not question.subquestion:
+            return question
+        return self.parents.get(question.id, None) or question.parent
+
+    def group_of(self, question):
+        return self.groups_by_id.get(question.group_id, None) or question.group
+
+    def groups_from(self, order_above=0):
+        order_above = order_above or 0
+        return [group for group in self.groups if group.order >= order_above]
+
+    def questions_in(self, group, order_above=0):
+        return [question for question in self.questions_by_group.get(group.id, [])
+                if self.question_orders[question.id] > order_above]
+
+    def rules_for(self, question):
+        return self.rules.get(question.id, [])
+
+    def is_last_question_of_group(self, question):
+        return self.last_question_of_group.get(question.group_id, None) == question
+
+    def next_question_orders(self, question):
+        if not question:
+            return 0, 0
+        question = self.parent_of(question)
+        group = self.group_of(question)
+        if self.is_last_question_of_group(question):
+            return group.order + 1, 0
+        return group.order, self.order_of(question)
+
+    @classmethod
+    def for_batch(cls, batch):
+        version = cache_version(cls.VERSION_KEY % batch.id)
+        flow = cls._compiled.get(batch.id, None)
+        if flow and flow.version == version and flow.batch_created == batch.created:
+            return flow
+
+        plan = cache.get(cls.CACHE_KEY % (batch.id, version))
+        if plan and plan['batch_created'] == batch.created:
+            flow = cls(batch, version, plan)
+        else:
+            flow = cls(batch, version)
+            cache.set(cls.CACHE_KEY % (batch.id, version), flow.plan)
+        cls._compiled[batch.id] = flow
+        return flow
+
+    @classmethod
+    def invalidate(cls, batch_ids):
+        for batch_id in set(batch_ids):
+            cls._compiled.pop(batch_id, None)
+            invalidate_version(cls.VERSION_KEY % batch_id)
+
+    @classmethod
+    def invalidate_all(cls):
+        cls.invalidate(list(Batch.objects.values_list('id', flat=True)) + cls._compiled.keys())
+
+    @classmethod
+    def invalidate_for_questions(cls, question_ids, batch_ids=None):
+        batch_ids = list(batch_ids or [])
+        batch_ids.extend(BatchQuestionOrder.objects.filter(question__in=question_ids).values_list('batch', flat=True))
+        cls.invalidate(batch_ids)
+
+
+@receiver(post_save, sender=BatchQuestionOrder)
+@receiver(post_delete, sender=BatchQuestionOrder)
+def invalidate_flow_on_batch_question_order_change(sender, instance, **kwargs):
+    BatchFlow.invalidate([instance.batch_id])
+
+
+@receiver(post_save, sender=AnswerRule)
+@receiver(post_delete, sender=AnswerRule)
+def invalidate_flow_on_answer_rule_change(sender, instance, **kwargs):
+    BatchFlow.invalidate_for_questions([instance.question_id], batch_ids=[instance.batch_id])
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def invalidate_flow_on_question_change(sender, instance, **kwargs):
+    BatchFlow.invalidate_for_questions([instance.id, instance.parent_id])
+
+
+@receiver(post_save, sender=HouseholdMemberGroup)
+@receiver(post_delete, sender=HouseholdMemberGroup)
+@receiver(post_save, sender=GroupCondition)
+@receiver(post_delete, sender=GroupCondition)
+def invalidate_flow_on_group_change(sender, instance, **kwargs):
+    BatchFlow.invalidate_all()
+
+
+@receiver(m2m_changed, sender=GroupCondition.groups.through)
+def invalidate_flow_on_group_conditions_change(sender, instance, **kwargs):
+    BatchFlow.invalidate_all()
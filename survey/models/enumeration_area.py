@@ -1,6 +1,9 @@
 from rapidsms.contrib.locations.models import Location
 from survey.models import BaseModel
 from django.db import models
+from django.db.models.signals import m2m_changed
+from django.dispatch import receiver
+from django.utils import timezone
 
 
 class EnumerationArea(BaseModel):
@@ -11,6 +14,21 @@ class EnumerationArea(BaseModel):
     def __unicode__(self):
         return self.name
 
+    def first_location(self):
+        ea_locations = self.locations.all()[:1]
+        return ea_locations[0] if ea_locations else None
+
+    def update_located_households_and_investigators(self):
+        from survey.models import Household, Investigator, BatchCompletionRollup, IndicatorResultCache
+        location = self.first_location()
+        households = Household.objects.filter(ea=self)
+        previous = set(households.values_list('location', 'survey'))
+        households.update(location=location, modified=timezone.now())
+        for location_id, survey_id in previous:
+            BatchCompletionRollup.recount_locations([location_id, location.id if location else None], survey_id)
+        Investigator.objects.filter(ea=self).update(location=location)
+        IndicatorResultCache.invalidate_locations()
+
     def parent_location(self):
         location = self.locations.all()[0]
         from survey.models import LocationTypeDetails
@@ -20,6 +38,24 @@ class EnumerationArea(BaseModel):
     def get_siblings(self):
         return self.under_(self.parent_location())
 
+    @classmethod
+    def in_any_of(cls, locations):
+        return cls.objects.filter(locations__in=locations)
+
     @classmethod
     def under_(cls, selected_location):
-        return cls.objects.filter(locations__in=selected_location.get_descendants()).distinct('name', 'survey')
\ No newline at end of file
+        return cls.objects.filter(locations__in=selected_location.get_descendants()).distinct('name', 'survey')
+
+
+@receiver(m2m_changed, sender=EnumerationArea.locations.through)
+def update_location_of_households_and_investigators(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ['post_add', 'post_remove', 'post_clear']:
+        return
+    if not reverse:
+        return instance.update_located_households_and_investigators()
+    if pk_set is None:
+        from survey.models import Household, Investigator
+        pk_set = set(Household.objects.filter(location=instance).values_list('ea', flat=True))
+        pk_set.update(Investigator.objects.filter(location=instance).values_list('ea', flat=True))
+    for enumeration_area in EnumerationArea.objects.filter(id__in=pk_set):
+        enumeration_area.update_located_households_and_investigators()
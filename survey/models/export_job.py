@@ -0,0 +1,171 @@
+import csv
+import hashlib
+import os
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import models
+from django.db.models import Count, Max
+from django.utils import timezone
+
+from survey.models.base import BaseModel
+from survey.models.batch import Batch
+from survey.models.surveys import Survey
+
+
+class ExportJob(BaseModel):
+    RESULTS = 'RESULTS'
+    INVESTIGATOR_COMPLETION = 'INVESTIGATOR_COMPLETION'
+    REPORT_TYPES = ((RESULTS, 'Survey results'), (INVESTIGATOR_COMPLETION, 'Investigator completion'))
+
+    PENDING = 'PENDING'
+    RUNNING = 'RUNNING'
+    COMPLETED = 'COMPLETED'
+    FAILED = 'FAILED'
+    EXPIRED = 'EXPIRED'
+    STATUSES = ((PENDING, 'Pending'), (RUNNING, 'Running'), (COMPLETED, 'Completed'), (FAILED, 'Failed'),
+                (EXPIRED, 'Expired'))
+
+    report_type = models.CharField(max_length=30, choices=REPORT_TYPES, default=RESULTS)
+    survey = models.ForeignKey(Survey, null=True, related_name="export_jobs")
+    batch = models.ForeignKey(Batch, null=True, related_name="export_jobs")
+    status = models.CharField(max_length=15, choices=STATUSES, default=PENDING)
+    processed = models.PositiveIntegerField(default=0)
+    total = models.PositiveIntegerField(default=0)
+    fingerprint = models.CharField(max_length=40, db_index=True)
+    file_name = models.CharField(max_length=255, blank=True)
+    error = models.TextField(blank=True)
+
+    class Meta:
+        app_label = 'survey'
+        get_latest_by = 'created'
+
+    @classmethod
+    def queue(cls, report_type, survey=None, batch=None):
+        from survey.tasks import export_task
+        if report_type == cls.RESULTS and batch:
+            survey = batch.survey
+        fingerprint = cls.fingerprint_for(report_type, survey, batch)
+        jobs = cls.objects.filter(report_type=report_type, survey=survey, batch=batch, fingerprint=fingerprint,
+                                  status__in=[cls.PENDING, cls.RUNNING, cls.COMPLETED]).order_by('-created')
+        stalled_before = cls._timed_out_before()
+        for job in jobs:
+            if job.status in [cls.PENDING, cls.RUNNING] and job.modified < stalled_before:
+                cls.objects.filter(id=job.id).update(status=cls.FAILED, error='No progress before timeout.')
+            elif job.status != cls.COMPLETED or job.has_file():
+                return job
+        job = cls.objects.create(report_type=report_type, survey=survey, batch=batch, fingerprint=fingerprint)
+        export_task.delay(job.id)
+        return cls.objects.get(id=job.id)
+
+    @classmethod
+    def _timed_out_before(cls):
+        return timezone.now() - timedelta(seconds=getattr(settings, 'EXPORT_JOB_TIMEOUT', 1800))
+
+    @classmethod
+    def _sources_for(cls, report_type, survey, batch):
+        from survey.models import Household, HouseholdMember, Investigator, Question, NumericalAnswer, TextAnswer, \
+            MultiChoiceAnswer, HouseholdMemberBatchCompletion, HouseholdBatchCompletion, LocationTypeDetails, \
+            BatchLocationStatus
+        households = Household.objects.filter(survey=survey)
+        open_locations = BatchLocationStatus.objects.filter(batch=batch) if batch else \
+            BatchLocationStatus.objects.filter(batch__survey=survey)
+        location_sources = [LocationTypeDetails.objects.all(), open_locations]
+        if report_type == cls.INVESTIGATOR_COMPLETION:
+            member_completions = HouseholdMemberBatchCompletion.objects.all()
+            household_completions = HouseholdBatchCompletion.objects.all()
+            if survey:
+                member_completions = member_completions.filter(household__survey=survey)
+                household_completions = household_completions.filter(household__survey=survey)
+            else:
+                households = Household.objects.all()
+            return location_sources + [Investigator.objects.all(), households, member_completions,
+                                       household_completions]
+        questions = Question.objects.filter(batches=batch) if batch else Question.objects.filter(batches__survey=survey)
+        sources = location_sources + [households, HouseholdMember.objects.filter(household__survey=survey), questions]
+        for answer_class in [NumericalAnswer, TextAnswer, MultiChoiceAnswer]:
+            sources.append(answer_class.objects.filter(household__survey=survey))
+        return sources
+
+    @classmethod
+    def fingerprint_for(cls, report_type, survey=None, batch=None):
+        from survey.models import LocationAncestry
+        state = [report_type, survey.id if survey else None, batch.id if batch else None, LocationAncestry.version()]
+        for queryset in cls._sources_for(report_type, survey, batch):
+            aggregates = queryset.aggregate(count=Count('id'), last_id=Max('id'), modified=Max('modified'))
+            state.append((aggregates['count'], aggregates['last_id'], aggregates['modified']))
+        return hashlib.sha1(repr(state)).hexdigest()
+
+    def file_path(self):
+        return os.path.join(settings.EXPORTS_ROOT, self.file_name)
+
+    def has_file(self):
+        return bool(self.file_name) and os.path.exists(self.file_path())
+
+    def is_ready(self):
+        return self.status in [self.COMPLETED, self.EXPIRED] and self.has_file()
+
+    def download_name(self):
+        if self.report_type == self.INVESTIGATOR_COMPLETION:
+            return 'investigator.csv'
+        return '%s.csv' % (self.batch.name if self.batch else self.survey.name)
+
+    def progress(self):
+        if self.status in [self.COMPLETED, self.EXPIRED]:
+            return 100
+        return self.processed * 100 / self.total if self.total else 0
+
+    def run(self):
+        self.status = self.RUNNING
+        self.processed = 0
+        self.error = ''
+        self.save()
+        try:
+            self.file_name = self._write(self._rows())
+        except Exception, e:
+            ExportJob.objects.filter(id=self.id).update(status=self.FAILED, error=str(e))
+            raise
+        self.status = self.COMPLETED
+        self.processed = self.total
+        self.save()
+        self._discard_previous()
+        return self
+
+    def _rows(self):
+        from survey.models import Investigator, ExportSnapshot
+        if self.report_type == self.INVESTIGATOR_COMPLETION:
+            rows = Investigator.generate_completion_report(self.survey, batch=self.batch)
+            self._start(len(rows) - 1)
+            return rows
+        snapshot = ExportSnapshot.for_survey(self.survey, self.batch)
+        return snapshot.refresh(started=self._start, progress=self._advance).report_rows()
+
+    def _start(self, total):
+        self.total = total
+        self.save()
+
+    def _advance(self, households):
+        self.processed += households
+        ExportJob.objects.filter(id=self.id).update(processed=self.processed, modified=timezone.now())
+
+    def _write(self, rows):
+        if not os.path.isdir(settings.EXPORTS_ROOT):
+            os.makedirs(settings.EXPORTS_ROOT)
+        file_name = 'export-%d-%s.csv' % (self.id, self.fingerprint[:8])
+        path = os.path.join(settings.EXPORTS_ROOT, file_name)
+        with open(path + '.part', 'wb') as export_file:
+            writer = csv.writer(export_file)
+            for row in rows:
+                writer.writerow(row)
+        os.rename(path + '.part', path)
+        return file_name
+
+    def _discard_previous(self):
+        # Superseded jobs stay downloadable for a timeout so clients still polling them can finish.
+        previous = ExportJob.objects.filter(report_type=self.report_type, survey=self.survey, batch=self.batch,
+                                            created__lt=self.created).exclude(id=self.id)
+        previous.filter(status__in=[self.COMPLETED, self.FAILED]).update(status=self.EXPIRED, modified=timezone.now())
+        for job in previous.filter(status=self.EXPIRED, modified__lt=self._timed_out_before()):
+            if job.has_file():
+                os.remove(job.file_path())
+            job.delete()
@@ -0,0 +1,163 @@
+import csv
+import datetime
+import hashlib
+import os
+import tempfile
+
+from django.conf import settings
+from django.db import models
+from django.db.models import Count, Max
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from survey.models.base import BaseModel
+from survey.models.batch import Batch
+from survey.models.households import Household
+from survey.models.question import NumericalAnswer, TextAnswer, MultiChoiceAnswer
+from survey.models.surveys import Survey
+
+
+class ExportSnapshot(BaseModel):
+    """Results export of a survey or batch kept on disk, one row per member keyed by household id.
+
+    A refresh only re-renders households touched after the high water mark and merges them into the stored rows.
+    Location names, option texts and ages are not tied to a household, so a change to any of them since the stored
+    rows were rendered (tracked by the location ancestry version, an option set version and the render date) makes
+    the refresh render every household again.
+    """
+    survey = models.ForeignKey(Survey, related_name="export_snapshots")
+    batch = models.ForeignKey(Batch, null=True, related_name="export_snapshots")
+    high_water_mark = models.DateTimeField(null=True)
+    file_name = models.CharField(max_length=255, blank=True)
+    rendered_households = models.PositiveIntegerField(default=0)
+    location_version = models.CharField(max_length=32, blank=True)
+    options_version = models.CharField(max_length=32, blank=True)
+    rendered_on = models.DateField(null=True)
+
+    class Meta:
+        app_label = 'survey'
+
+    @classmethod
+    def for_survey(cls, survey, batch=None):
+        if batch:
+            survey = batch.survey
+        snapshot, created = cls.objects.get_or_create(survey=survey, batch=batch)
+        return snapshot
+
+    def file_path(self):
+        return os.path.join(settings.EXPORTS_ROOT, self.file_name)
+
+    def has_file(self):
+        return bool(self.file_name) and os.path.exists(self.file_path())
+
+    def refresh(self, started=None, progress=None):
+        from survey.services.results_download_service import ResultsDownloadService
+        service = ResultsDownloadService(survey=self.survey, batch=self.batch)
+        high_water_mark = timezone.now()
+        header = service.set_report_headers()
+        household_ids = service.household_ids()
+        render_state = self._render_state(service)
+        stored_counts = None
+        if render_state == (self.location_version, self.options_version, self.rendered_on):
+            stored_counts = self._stored_row_counts(header)
+        previous = []
+        changed = household_ids
+        if stored_counts is not None:
+            changed = household_ids & (self._changed_household_ids() | self._resized_household_ids(stored_counts))
+            previous = ((household_id, row) for household_id, row in self._stored_rows()
+                        if household_id in household_ids and household_id not in changed)
+        if started:
+            started(len(changed))
+        fresh = service.iter_household_rows(household_ids=changed, progress=progress)
+        self.file_name = self._write(header, self._merged(previous, fresh))
+        self.high_water_mark = high_water_mark
+        self.location_version, self.options_version, self.rendered_on = render_state
+        self.rendered_households = len(changed)
+        self.save()
+        return self
+
+    def report_rows(self):
+        for household_id, row in self._stored_rows(with_header=True):
+            yield row
+
+    def _stored_rows(self, with_header=False):
+        with open(self.file_path(), 'rb') as snapshot_file:
+            for row in csv.reader(snapshot_file):
+                if row[0]:
+                    yield int(row[0]), row[1:]
+                elif with_header:
+                    yield None, row[1:]
+
+    def _render_state(self, service):
+        from survey.models import LocationAncestry, QuestionOption
+        options = QuestionOption.objects.filter(question__in=[question.id for question in service.questions])
+        options = options.aggregate(count=Count('id'), modified=Max('modified'))
+        options_version = hashlib.md5("%s-%s" % (options['count'], options['modified'])).hexdigest()
+        return LocationAncestry.version(), options_version, datetime.date.today()
+
+    def _stored_row_counts(self, header):
+        if not self.high_water_mark or not self.has_file():
+            return None
+        counts = {}
+        for household_id, row in self._stored_rows(with_header=True):
+            if household_id is None:
+                if row != header:
+                    return None
+                continue
+            counts[household_id] = counts.get(household_id, 0) + 1
+        return counts
+
+    def _changed_household_ids(self):
+        from survey.models import Household, HouseholdMember, NumericalAnswer, TextAnswer, MultiChoiceAnswer, \
+            HouseholdMemberBatchCompletion, InterviewProgress
+        since = self.high_water_mark
+        changed = set(Household.objects.filter(survey=self.survey, modified__gt=since).values_list('id', flat=True))
+        for model in [HouseholdMember, NumericalAnswer, TextAnswer, MultiChoiceAnswer, HouseholdMemberBatchCompletion,
+                      InterviewProgress]:
+            changed.update(model.objects.filter(household__survey=self.survey,
+                                                modified__gt=since).values_list('household_id', flat=True))
+        changed.discard(None)
+        return changed
+
+    def _resized_household_ids(self, stored_counts):
+        from survey.models import HouseholdMember
+        members = HouseholdMember.objects.filter(household__survey=self.survey).values('household').annotate(
+            members=Count('id'))
+        current_counts = dict([(count['household'], count['members']) for count in members])
+        household_ids = set(current_counts.keys()) | set(stored_counts.keys())
+        return set([household_id for household_id in household_ids
+                    if current_counts.get(household_id, 0) != stored_counts.get(household_id, 0)])
+
+    def _merged(self, previous, fresh):
+        fresh = iter(fresh)
+        pending = next(fresh, None)
+        for household_id, row in previous:
+            while pending is not None and pending[0] < household_id:
+                yield pending
+                pending = next(fresh, None)
+            yield household_id, row
+        while pending is not None:
+            yield pending
+            pending = next(fresh, None)
+
+    def _write(self, header, rows):
+        if not os.path.isdir(settings.EXPORTS_ROOT):
+            os.makedirs(settings.EXPORTS_ROOT)
+        file_name = 'snapshot-%d.csv' % self.id
+        with tempfile.NamedTemporaryFile(dir=settings.EXPORTS_ROOT, prefix=file_name + '.', suffix='.part',
+                                         delete=False) as snapshot_file:
+            writer = csv.writer(snapshot_file)
+            writer.writerow([''] + header)
+            for household_id, row in rows:
+                writer.writerow([household_id] + row)
+        os.rename(snapshot_file.name, os.path.join(settings.EXPORTS_ROOT, file_name))
+        return file_name
+
+
+@receiver(post_delete, sender=NumericalAnswer)
+@receiver(post_delete, sender=TextAnswer)
+@receiver(post_delete, sender=MultiChoiceAnswer)
+def touch_household_of_deleted_answer(sender, instance, **kwargs):
+    if instance.household_id:
+        Household.objects.filter(id=instance.household_id).update(modified=timezone.now())
@@ -2,7 +2,6 @@ from django.db import models
 from django.db.models import Sum
 
 from survey.models.base import BaseModel
-from survey.models.investigator import Investigator
 from survey.models.question import Question, QuestionOption
 
 
@@ -22,11 +21,8 @@ class Formula(BaseModel):
         return self.count or self.groups
 
     def compute_for_location(self, location):
-        investigators = Investigator.lives_under_location(location)
-        if self.numerator.is_multichoice():
-            return self.compute_multichoice_question_for_investigators(investigators)
-        else:
-            return self.compute_numerical_question_for_investigators(investigators)
+        from survey.services.formula_engine import FormulaEngine
+        return FormulaEngine(self).compute_for_location(location)
 
     def compute_for_next_location_type_in_the_hierarchy(self, current_location):
         locations = current_location.get_children()
@@ -108,11 +104,10 @@ class Formula(BaseModel):
         denominator_number = 1
 
         if self.groups:
-            all_members_in_group = []
-            for household in survey.survey_household.all().filter(investigator=investigator):
-                all_members_in_group.append(household.members_belonging_to_group(self.groups))
-
-            denominator_number = len(all_members_in_group)
+            from survey.models import HouseholdMember
+            denominator_number = HouseholdMember.objects.filter(self.groups.members_filter(),
+                                                                household__survey=survey,
+                                                                household__investigator=investigator).count()
         elif self.count:
             denominator_number = self.get_denominator_sum_based_on_question_type(investigator, self.count)
 
@@ -1,6 +1,10 @@
+import datetime
+
 from django.db import models
+from django.db.models import Count, Q
 from django.utils.datastructures import SortedDict
 from survey.models.base import BaseModel
+from survey.utils.views_helper import descendants_mapping, descendants_filter
 
 
 class HouseholdMemberGroup(BaseModel):
@@ -28,22 +32,51 @@ class HouseholdMemberGroup(BaseModel):
     def remove_related_questions(self):
         self.question_group.clear()
 
+    def members_filter(self):
+        members_filter = Q()
+        for condition in self.get_all_conditions():
+            members_filter &= condition.members_filter()
+        return members_filter
+
     def household_members_count_per_location_in(self, locations, survey):
-        data = SortedDict()
-        all_households = survey.survey_household.all()
         from survey.models import HouseholdMember
+        locations = list(locations)
+        mapping = descendants_mapping(locations)
+        members = HouseholdMember.objects.filter(self.members_filter(),
+                                                 descendants_filter(locations, 'household__location__'),
+                                                 household__survey=survey)
+        counts = {}
+        for row in members.values('household__location').annotate(total=Count('id')):
+            if row['household__location'] not in mapping:
+                continue
+            location_id = mapping[row['household__location']]
+            counts[location_id] = counts.get(location_id, 0) + row['total']
+        data = SortedDict()
         for location in locations:
-            location_descendants = location.get_descendants(include_self=True).values_list('id', flat=True)
-            households = all_households.filter(ea__locations__in=location_descendants).values_list('id', flat=True)
-            all_members = HouseholdMember.objects.filter(household__id__in=households).select_subclasses()
-            qualified_members = filter(lambda member: member.belongs_to(self), all_members)
-            data[location] = {self.name: len(qualified_members)}
+            data[location] = {self.name: counts.get(location.id, 0)}
         return data
 
+    def ea_counts_for_locations(self, locations, survey):
+        from survey.models import HouseholdMember
+        mapping = descendants_mapping(locations)
+        members = HouseholdMember.objects.filter(self.members_filter(),
+                                                 descendants_filter(locations, 'household__location__'),
+                                                 household__survey=survey)
+        counts = {}
+        for row in members.values('household__ea', 'household__location').annotate(total=Count('id')):
+            if row['household__location'] not in mapping:
+                continue
+            location_counts = counts.setdefault(row['household__ea'], {}).setdefault(
+                mapping[row['household__location']], {})
+            location_counts[self.name] = location_counts.get(self.name, 0) + row['total']
+        return counts
+
     def hierarchical_result_for(self, location_parent, survey):
         locations = location_parent.get_children().order_by('name')[:10]
-        answers = self.household_members_count_per_location_in(locations, survey)
-        return answers
+        return self.results_for_locations(locations, survey)
+
+    def results_for_locations(self, locations, survey):
+        return self.household_members_count_per_location_in(locations, survey)
 
     @classmethod
     def max_order(cls):
@@ -73,6 +106,8 @@ class GroupCondition(BaseModel):
         'GENERAL': 'GENERAL'
     }
 
+    DAYS_IN_YEAR = 365.2425
+
     value = models.CharField(max_length=50)
     attribute = models.CharField(max_length=20, default='AGE', choices=GROUP_TYPES.items())
     condition = models.CharField(max_length=20, default='EQUALS', choices=CONDITIONS.items())
@@ -100,6 +135,56 @@ class GroupCondition(BaseModel):
     def is_less_than(self, value):
         return int(value) <= int(self.value)
 
+    def members_filter(self):
+        attribute = self.attribute.upper()
+        if attribute == self.GROUP_TYPES['AGE']:
+            return self._age_filter()
+        lookups = {self.GROUP_TYPES['GENDER']: ('male', True),
+                   self.GROUP_TYPES['GENERAL']: ('householdhead__isnull', False)}
+        field, when_true = lookups[attribute]
+        matching = [value for value in (True, False) if self.matches_condition(value)]
+        if len(matching) == 2:
+            return Q()
+        if not matching:
+            return Q(pk__in=[])
+        return Q(**{field: when_true if matching[0] else not when_true})
+
+    def _age_in_years(self, days):
+        return int(days / self.DAYS_IN_YEAR)
+
+    def _fewest_days_for_age(self, age):
+        days = int((age - 1) * self.DAYS_IN_YEAR) - 2
+        while self._age_in_years(days) < age:
+            days += 1
+        return days
+
+    def _most_days_for_age(self, age):
+        days = int((age + 2) * self.DAYS_IN_YEAR) + 2
+        while self._age_in_years(days) > age:
+            days -= 1
+        return days
+
+    def _born_at_least_years_ago(self, age):
+        days = self._fewest_days_for_age(age)
+        return Q(date_of_birth__lte=datetime.date.today() - datetime.timedelta(days=days))
+
+    def _born_at_most_years_ago(self, age):
+        days = self._most_days_for_age(age)
+        return Q(date_of_birth__gte=datetime.date.today() - datetime.timedelta(days=days))
+
+    def _age_filter(self):
+        if self.condition == self.CONDITIONS['GREATER_THAN']:
+            return self._born_at_least_years_ago(int(self.value))
+        if self.condition == self.CONDITIONS['LESS_THAN']:
+            return self._born_at_most_years_ago(int(self.value))
+        try:
+            age = int(self.value)
+        except ValueError:
+            return Q(pk__in=[])
+        if str(age) != str(self.value):
+            return Q(pk__in=[])
+        return self._born_at_least_years_ago(age) & self._born_at_most_years_ago(age)
+
     class Meta:
         app_label = 'survey'
         unique_together = ('value', 'attribute', 'condition')
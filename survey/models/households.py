@@ -14,6 +14,7 @@ from survey.models.base import BaseModel
 from survey.models.batch import Batch
 from survey.models.investigator import Investigator
 from survey.models.householdgroups import HouseholdMemberGroup, GroupCondition
+from survey.utils.views_helper import descendants_queryset
 
 
 class Household(BaseModel):
@@ -23,6 +24,10 @@ class Household(BaseModel):
     random_sample_number = models.PositiveIntegerField(default=0, null=True, blank=True, verbose_name="Household Random Sample Number")
     survey = models.ForeignKey("Survey", null=True, related_name="survey_household")
     household_code = models.CharField(max_length=100, null=True, verbose_name="Household Code")
+    # The EA's first location, so totals grouped by it count each household once. Filtering by area
+    # goes through all of the EA's locations instead; see all_households_in.
+    location = models.ForeignKey(Location, null=True, blank=True, on_delete=models.SET_NULL,
+                                 related_name="households")
 
     MEMBERS_PER_PAGE = 4
     PREVIOUS_PAGE_TEXT = "%s: Back" % getattr(settings, 'USSD_PAGINATION', None).get('PREVIOUS')
@@ -31,6 +36,10 @@ class Household(BaseModel):
     class Meta:
         app_label = 'survey'
 
+    def save(self, *args, **kwargs):
+        self.location = self.ea.first_location() if self.ea_id else None
+        super(Household, self).save(*args, **kwargs)
+
     def get_head(self):
         household_head = None
         try:
@@ -40,12 +49,10 @@ class Household(BaseModel):
         return household_head
 
     def last_question_answered(self):
-        answered = []
-        for related_name in ['numericalanswer', 'textanswer', 'multichoiceanswer']:
-            answer = getattr(self, related_name).all()
-            if answer.exists(): answered.append(answer.latest())
+        answered = self.interview_progress.exclude(last_question=None).select_related('last_question').order_by(
+            '-last_answered_on')[:1]
         if answered:
-            return sorted(answered, key=lambda x: x.created, reverse=True)[0].question
+            return answered[0].last_question
 
     def has_next_question(self, batch):
         for household_member in self.household_member.all():
@@ -87,7 +94,9 @@ class Household(BaseModel):
             self.batch_completion_batches.get_or_create(household=self, investigator=self.investigator, batch=batch)
 
     def batch_reopen(self, batch):
-        self.completed_batches.filter(household=self).delete()
+        from survey.models.batch_completion_rollup import deferred_rollups
+        with deferred_rollups():
+            self.completed_batches.filter(household=self).delete()
 
     def can_retake_survey(self, batch, minutes):
         all_members = self.household_member.all()
@@ -181,11 +190,8 @@ class Household(BaseModel):
         return None
 
     def members_belonging_to_group(self, member_group):
-        members_in_group = []
-        for member in self.all_members():
-            if member.belongs_to(member_group):
-                members_in_group.append(member)
-        return members_in_group
+        members = HouseholdMember.objects.filter(member_group.members_filter(), household=self).order_by('surname')
+        return sorted(members.select_subclasses(), key=lambda member: not member.is_head())
 
     def has_answered_non_response(self):
         open_batch = Batch.currently_open_for(self.location)
@@ -230,12 +236,8 @@ class Household(BaseModel):
         all_households = Household.objects.filter(survey=survey)
         if ea:
             return all_households.filter(ea=ea)
-        return all_households.filter(ea__locations__in=location.get_descendants(include_self=True))
-
-    @property
-    def location(self):
-        ea_locations = self.ea.locations.all()[:1]
-        return None if not ea_locations.exists() else ea_locations[0]
+        from survey.models import EnumerationArea
+        return all_households.filter(ea__in=EnumerationArea.in_any_of(descendants_queryset(location)))
 
 
 class HouseholdMember(BaseModel):
@@ -279,7 +281,9 @@ class HouseholdMember(BaseModel):
                 return False
         return True
 
-    def get_member_groups(self, order_above=0):
+    def get_member_groups(self, order_above=0, batch=None):
+        if batch:
+            return [group for group in batch.flow().groups_from(order_above) if self.belongs_to(group)]
         order_above = order_above or 0
         all_groups = HouseholdMemberGroup.objects.select_related('conditions').filter(order__gte=order_above).order_by('order')
         return [group for group in all_groups if self.belongs_to(group)]
@@ -302,9 +306,14 @@ class HouseholdMember(BaseModel):
 
     def get_next_batch(self):
         open_ordered_batches = Batch.open_ordered_batches(self.get_location())
+        progress = dict([(batch_progress.batch_id, batch_progress) for batch_progress in self.interview_progress.all()])
 
         for batch in open_ordered_batches:
-            if not self.completed_member_batches.filter(batch=batch) and batch.has_unanswered_question(self):
+            batch_progress = progress.get(batch.id, None)
+            if batch_progress and batch_progress.completed:
+                continue
+            answered = batch_progress.answered_question_ids() if batch_progress else set()
+            if batch.has_unanswered_question(self, answered):
                 return batch
         return None
 
@@ -322,25 +331,23 @@ class HouseholdMember(BaseModel):
         return answers
 
     def last_question_answered(self):
-        answered = []
-        for related_name in ['numericalanswer', 'textanswer', 'multichoiceanswer']:
-            answer = getattr(self, related_name).all()
-            if answer.exists() and answer.filter(is_old=False).exists(): answered.append(answer.latest())
+        answered = self.interview_progress.exclude(last_question=None).select_related('last_question').order_by(
+            '-last_answered_on')[:1]
         if answered:
-            return sorted(answered, key=lambda x: x.created, reverse=True)[0].question
+            return answered[0].last_question
+
+    def answered_question_ids(self, batch):
+        progress = self.interview_progress.filter(batch=batch)
+        return progress[0].answered_question_ids() if progress else set()
 
     def has_answered(self, question, all_answers):
         answer_class = question.TYPE_OF_ANSWERS_CLASS[question.answer_type].lower()
         return question.id in all_answers[answer_class]
 
-    def next_unanswered_question_in(self, member_group, batch, order):
-        all_questions = []
-        for question in batch.all_questions():
-            if (question.question_batch_order.filter(batch=batch)[0].order > order) and (question.group == member_group):
-                all_questions.append(question)
-
-        answers = self.all_answers(batch)
-        for question in all_questions:
+    def next_unanswered_question_in(self, member_group, batch, order, answers=None):
+        if answers is None:
+            answers = self.all_answers(batch)
+        for question in batch.flow().questions_in(member_group, order_above=order):
             if not self.has_answered(question, answers):
                 return question
         return None
@@ -350,7 +357,8 @@ class HouseholdMember(BaseModel):
         try:
             if not answer:
                 answer = question.answer_class().objects.filter(householdmember=member, question=question, batch=batch, is_old=False)[0];
-            return question.get_next_question_by_rule(answer, self.household.investigator)
+            return question.get_next_question_by_rule(answer, self.household.investigator,
+                                                      rules=batch.flow().rules_for(question))
         except ObjectDoesNotExist, e:
             return self.next_question_in_order(batch, question)
 
@@ -360,27 +368,24 @@ class HouseholdMember(BaseModel):
         if not last_question_answered:
             last_question_answered = self.last_question_answered()
 
+        if batch:
+            return batch.flow().next_question_orders(last_question_answered)
+
         if last_question_answered:
             if last_question_answered.subquestion:
                 last_question_answered = last_question_answered.parent
 
-            if last_question_answered.is_last_question_of_group(batch):
-                group_order = last_question_answered.group.order + 1
-            else:
-                if batch:
-                    batch_question_order_filter = last_question_answered.question_batch_order.all().filter(batch=batch)
-                    question_order = batch_question_order_filter[0].order if batch_question_order_filter else 0
-                else:
-                    question_order = last_question_answered.order
-                group_order = last_question_answered.group.order
+            question_order = last_question_answered.order
+            group_order = last_question_answered.group.order
 
         return group_order, question_order
 
     def next_question_in_order(self, batch, last_question_answered=None):
         group_order, question_order = self.get_next_question_orders(last_question_answered, batch)
 
-        for member_group in self.get_member_groups(order_above=group_order):
-            next_group_question = self.next_unanswered_question_in(member_group, batch, question_order)
+        answers = self.all_answers(batch)
+        for member_group in self.get_member_groups(order_above=group_order, batch=batch):
+            next_group_question = self.next_unanswered_question_in(member_group, batch, question_order, answers)
             if next_group_question:
                 return next_group_question
         return None
@@ -439,6 +444,7 @@ class HouseholdMember(BaseModel):
         self.completed_member_batches.all().delete()
         for related_name in ['numericalanswer', 'textanswer', 'multichoiceanswer']:
             getattr(self, related_name).all().update(is_old=True)
+        self.interview_progress.all().delete()
 
     def answers_for(self, questions, general_group):
         answers = []
@@ -0,0 +1,104 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+from rapidsms.contrib.locations.models import Location
+
+from survey.models.householdgroups import HouseholdMemberGroup, GroupCondition
+from survey.models.households import Household, HouseholdMember, HouseholdHead
+from survey.models.question import Question, QuestionOption, NumericalAnswer, TextAnswer, MultiChoiceAnswer
+from survey.utils.cache_versions import cache_versions, invalidate_version
+
+
+class IndicatorResultCache(object):
+    QUESTION_VERSION_KEY = "IndicatorResultCache-question-%s"
+    GROUPS_VERSION_KEY = "IndicatorResultCache-groups"
+    LOCATIONS_VERSION_KEY = "IndicatorResultCache-locations"
+    RESULT_KEY = "IndicatorResult-%s-%s-%s-%s-%s"
+
+    @classmethod
+    def _version_keys(cls, formula):
+        keys = [cls.QUESTION_VERSION_KEY % question_id
+                for question_id in (formula.numerator_id, formula.denominator_id, formula.count_id) if question_id]
+        if formula.groups_id:
+            keys.append(cls.GROUPS_VERSION_KEY)
+        keys.append(cls.LOCATIONS_VERSION_KEY)
+        return keys
+
+    @classmethod
+    def _versions(cls, formula):
+        keys = cls._version_keys(formula)
+        versions = cache_versions(keys)
+        return hashlib.md5("-".join(["%s:%s" % (key, versions[key]) for key in keys])).hexdigest()
+
+    @classmethod
+    def key(cls, formula, location, survey, name):
+        return cls.RESULT_KEY % (formula.id, location.id, survey.id if survey else None, name, cls._versions(formula))
+
+    @classmethod
+    def fetch(cls, formula, location, survey, name, compute):
+        key = cls.key(formula, location, survey, name)
+        result = cache.get(key)
+        if result is None:
+            result = compute()
+            cache.set(key, result, getattr(settings, 'INDICATOR_RESULTS_CACHE_TIMEOUT', None))
+        return result
+
+    @classmethod
+    def invalidate_question(cls, question_id):
+        invalidate_version(cls.QUESTION_VERSION_KEY % question_id)
+
+    @classmethod
+    def invalidate_groups(cls):
+        invalidate_version(cls.GROUPS_VERSION_KEY)
+
+    @classmethod
+    def invalidate_locations(cls):
+        invalidate_version(cls.LOCATIONS_VERSION_KEY)
+
+
+@receiver(post_save, sender=NumericalAnswer)
+@receiver(post_delete, sender=NumericalAnswer)
+@receiver(post_save, sender=TextAnswer)
+@receiver(post_delete, sender=TextAnswer)
+@receiver(post_save, sender=MultiChoiceAnswer)
+@receiver(post_delete, sender=MultiChoiceAnswer)
+def invalidate_answered_question_results(sender, instance, **kwargs):
+    if instance.question_id:
+        IndicatorResultCache.invalidate_question(instance.question_id)
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def invalidate_question_results(sender, instance, **kwargs):
+    IndicatorResultCache.invalidate_question(instance.id)
+
+
+@receiver(post_save, sender=QuestionOption)
+@receiver(post_delete, sender=QuestionOption)
+def invalidate_question_option_results(sender, instance, **kwargs):
+    if instance.question_id:
+        IndicatorResultCache.invalidate_question(instance.question_id)
+
+
+@receiver(post_save, sender=HouseholdMemberGroup)
+@receiver(post_delete, sender=HouseholdMemberGroup)
+@receiver(post_save, sender=GroupCondition)
+@receiver(post_delete, sender=GroupCondition)
+@receiver(m2m_changed, sender=GroupCondition.groups.through)
+@receiver(post_save, sender=HouseholdMember)
+@receiver(post_delete, sender=HouseholdMember)
+@receiver(post_save, sender=HouseholdHead)
+@receiver(post_delete, sender=HouseholdHead)
+def invalidate_group_results(sender, instance, **kwargs):
+    IndicatorResultCache.invalidate_groups()
+
+
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+@receiver(post_save, sender=Household)
+@receiver(post_delete, sender=Household)
+def invalidate_location_results(sender, instance, **kwargs):
+    IndicatorResultCache.invalidate_locations()
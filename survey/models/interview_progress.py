@@ -0,0 +1,106 @@
+from django.db import models
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from survey.models.base import BaseModel
+from survey.models.batch import Batch
+from survey.models.household_batch_completion import HouseholdMemberBatchCompletion
+from survey.models.households import Household, HouseholdMember
+from survey.models.investigator import Investigator
+from survey.models.question import Question, NumericalAnswer, TextAnswer, MultiChoiceAnswer
+
+
+class InterviewProgress(BaseModel):
+    ANSWER_CLASSES = [NumericalAnswer, TextAnswer, MultiChoiceAnswer]
+
+    householdmember = models.ForeignKey(HouseholdMember, related_name="interview_progress")
+    household = models.ForeignKey(Household, null=True, related_name="interview_progress")
+    investigator = models.ForeignKey(Investigator, null=True, related_name="interview_progress")
+    batch = models.ForeignKey(Batch, related_name="interview_progress")
+    last_question = models.ForeignKey(Question, null=True, related_name="last_answered_progress")
+    last_answered_on = models.DateTimeField(null=True, db_index=True)
+    answered_questions = models.TextField(blank=True, default='')
+    completed = models.BooleanField(default=False)
+
+    class Meta:
+        app_label = 'survey'
+        unique_together = ('householdmember', 'batch')
+        get_latest_by = 'last_answered_on'
+
+    def answered_question_ids(self):
+        return set([int(question_id) for question_id in self.answered_questions.split(',') if question_id])
+
+    @classmethod
+    def join_question_ids(cls, question_ids):
+        return ','.join([str(question_id) for question_id in sorted(set(question_ids))])
+
+    @classmethod
+    def record(cls, answer):
+        progress, created = cls.objects.get_or_create(householdmember_id=answer.householdmember_id,
+                                                      batch_id=answer.batch_id,
+                                                      defaults={'household_id': answer.household_id})
+        # Answers from concurrent requests would otherwise overwrite each other's question ids.
+        progress = cls.objects.select_for_update().get(id=progress.id)
+        answered = progress.answered_question_ids()
+        answered.add(answer.question_id)
+        progress.answered_questions = cls.join_question_ids(answered)
+        progress.last_question_id = answer.question_id
+        progress.last_answered_on = answer.created
+        progress.investigator_id = answer.investigator_id
+        progress.save()
+        return progress
+
+    @classmethod
+    def rebuild_for(cls, householdmember_id, batch_id):
+        progress = cls.objects.filter(householdmember=householdmember_id, batch=batch_id)
+        if not progress.exists():
+            return
+        answers = []
+        for answer_class in cls.ANSWER_CLASSES:
+            answers.extend(answer_class.objects.filter(householdmember=householdmember_id, batch=batch_id,
+                                                       is_old=False).only('question', 'investigator', 'created'))
+        completed = HouseholdMemberBatchCompletion.objects.filter(householdmember=householdmember_id,
+                                                                  batch=batch_id).exists()
+        if not answers and not completed:
+            progress.delete()
+            return
+
+        last_answer = sorted(answers, key=lambda answer: answer.created, reverse=True)[0] if answers else None
+        progress.update(answered_questions=cls.join_question_ids([answer.question_id for answer in answers]),
+                        last_question=last_answer.question_id if last_answer else None,
+                        last_answered_on=last_answer.created if last_answer else None,
+                        completed=completed, modified=timezone.now())
+
+
+@receiver(post_save, sender=NumericalAnswer)
+@receiver(post_save, sender=TextAnswer)
+@receiver(post_save, sender=MultiChoiceAnswer)
+def record_interview_progress(sender, instance, created, **kwargs):
+    if created and not instance.is_old and instance.householdmember_id and instance.batch_id:
+        InterviewProgress.record(instance)
+
+
+@receiver(post_delete, sender=NumericalAnswer)
+@receiver(post_delete, sender=TextAnswer)
+@receiver(post_delete, sender=MultiChoiceAnswer)
+def rebuild_interview_progress(sender, instance, **kwargs):
+    if instance.householdmember_id and instance.batch_id:
+        InterviewProgress.rebuild_for(instance.householdmember_id, instance.batch_id)
+
+
+@receiver(post_save, sender=HouseholdMemberBatchCompletion)
+def mark_interview_progress_completed(sender, instance, created, **kwargs):
+    if created and instance.householdmember_id and instance.batch_id:
+        progress, _ = InterviewProgress.objects.get_or_create(householdmember_id=instance.householdmember_id,
+                                                              batch_id=instance.batch_id,
+                                                              defaults={'household_id': instance.household_id,
+                                                                        'investigator_id': instance.investigator_id})
+        if not progress.completed:
+            InterviewProgress.objects.filter(id=progress.id).update(completed=True, modified=timezone.now())
+
+
+@receiver(post_delete, sender=HouseholdMemberBatchCompletion)
+def mark_interview_progress_not_completed(sender, instance, **kwargs):
+    InterviewProgress.objects.filter(householdmember=instance.householdmember_id,
+                                     batch=instance.batch_id).update(completed=False)
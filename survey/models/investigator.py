@@ -1,16 +1,17 @@
 import datetime
 from django.conf import settings
-from django.core.cache import cache
 from django.core.paginator import Paginator
 from django.core.validators import MinLengthValidator, MaxLengthValidator, MinValueValidator, MaxValueValidator
 from django.db import models
 from django.utils.datastructures import SortedDict
-from rapidsms.contrib.locations.models import Location, LocationType
+from rapidsms.contrib.locations.models import Location
 from rapidsms.router import send
 from survey.investigator_configs import LEVEL_OF_EDUCATION, LANGUAGES, COUNTRY_PHONE_CODE
 from survey.models.backend import Backend
 from survey.models.base import BaseModel
 from survey.models.batch import BatchLocationStatus
+from survey.utils.views_helper import descendants_queryset, ancestors_queryset
+from survey.utils.session_state import cached_blob, set_in_cached_blob, reset_cached_blob, delete_cached_blob
 
 
 class Investigator(BaseModel):
@@ -28,6 +29,9 @@ class Investigator(BaseModel):
     backend = models.ForeignKey(Backend, null=True, verbose_name="Connection")
     weights = models.FloatField(default=0, blank=False)
     is_blocked = models.BooleanField(default=False)
+    # The EA's first location, as on Household; lives_under_location still matches any of the EA's locations.
+    location = models.ForeignKey(Location, null=True, blank=True, on_delete=models.SET_NULL,
+                                 related_name="investigators")
 
     HOUSEHOLDS_PER_PAGE = 4
     PREVIOUS_PAGE_TEXT = "%s: Back" % getattr(settings, 'USSD_PAGINATION', None).get('PREVIOUS')
@@ -47,45 +51,45 @@ class Investigator(BaseModel):
     def __init__(self, *args, **kwargs):
         super(Investigator, self).__init__(*args, **kwargs)
         self.identity = COUNTRY_PHONE_CODE + self.mobile_number
-        self.cache_key = "Investigator-%s" % self.pk
-        self.generate_cache()
 
     class Meta:
         app_label = 'survey'
 
+    def save(self, *args, **kwargs):
+        self.location = self.ea.first_location() if self.ea_id else None
+        super(Investigator, self).save(*args, **kwargs)
+
     def has_households(self, survey=None):
         all_households = self.households.all()
         survey_households = all_households.filter(survey=survey) if survey else all_households
         return survey_households.count() > 0
 
+    @property
+    def cache_key(self):
+        return "Investigator-%s" % self.pk
+
     def generate_cache(self):
-        if not cache.get(self.cache_key):
-            cache.set(self.cache_key, self.DEFAULT_CACHED_VALUES)
+        return cached_blob(self.cache_key, self.DEFAULT_CACHED_VALUES)
 
     def set_in_cache(self, key, value):
-        cached = cache.get(self.cache_key)
-        cached[key] = value
-        cache.set(self.cache_key, cached)
+        set_in_cached_blob(self.cache_key, key, value, self.DEFAULT_CACHED_VALUES)
 
     def get_from_cache(self, key):
-        return cache.get(self.cache_key)[key]
+        return self.generate_cache()[key]
 
     def clear_interview_caches(self):
-        cache.delete(self.cache_key)
+        delete_cached_blob(self.cache_key)
 
     def clear_all_cache_fields_except(self, field_name):
         old_field_value = self.get_from_cache(field_name)
-        cache.delete(self.cache_key)
-        self.generate_cache()
+        reset_cached_blob(self.cache_key, self.DEFAULT_CACHED_VALUES)
         self.set_in_cache(field_name, old_field_value)
 
     def last_answered(self):
-        answered = []
-        for related_name in ['numericalanswer', 'textanswer', 'multichoiceanswer']:
-            answer = getattr(self, related_name).select_related('householdmember').all()
-            if answer.exists(): answered.append(answer.latest())
+        answered = self.interview_progress.exclude(last_question=None).select_related(
+            'householdmember', 'last_question').order_by('-last_answered_on')[:1]
         if answered:
-            return sorted(answered, key=lambda x: x.created, reverse=True)[0]
+            return answered[0]
 
     def last_registered(self):
         members = []
@@ -96,7 +100,7 @@ class Investigator(BaseModel):
             return sorted(members, key=lambda x: x.created, reverse=True)[0]
 
     def last_answered_question(self):
-        return self.last_answered().question
+        return self.last_answered().last_question
 
     def member_answered(self, question, household_member, answer, batch):
         answer_class = question.answer_class()
@@ -201,17 +205,16 @@ class Investigator(BaseModel):
         return True
 
     def get_open_batch(self):
-        batch_locations = self.location.open_batches.all()
-        batches = [batch_location.batch for batch_location in batch_locations]
-        return batches
+        from survey.models.open_batch_index import OpenBatchIndex
+        return [batch_location.batch for batch_location in OpenBatchIndex.statuses_for(self.location)]
 
     def first_open_batch(self):
         open_batches = self.get_open_batch()
         return sorted(open_batches, key=lambda batch: batch.order)[0]
 
     def has_open_batch(self):
-        locations = self.location.get_ancestors(include_self=True)
-        return BatchLocationStatus.objects.filter(location__in=locations).exists()
+        from survey.models.open_batch_index import OpenBatchIndex
+        return len(OpenBatchIndex.statuses_for_any_of(ancestors_queryset(self.location, include_self=True))) > 0
 
     def created_member_within(self, minutes, open_survey=None):
         last_member = self.last_registered()
@@ -227,7 +230,7 @@ class Investigator(BaseModel):
         last_answered = self.last_answered()
         if not last_answered:
             return False
-        last_active = last_answered.created
+        last_active = last_answered.last_answered_on
         timeout = datetime.datetime.utcnow().replace(tzinfo=last_active.tzinfo) - datetime.timedelta(minutes=minutes)
         return last_active >= timeout
 
@@ -284,24 +287,10 @@ class Investigator(BaseModel):
 
     @classmethod
     def lives_under_location(cls, location):
-        locations = location.get_descendants(include_self=True)
-        return Investigator.objects.filter(ea__locations__in=locations)
+        from survey.models import EnumerationArea
+        return Investigator.objects.filter(ea__in=EnumerationArea.in_any_of(descendants_queryset(location)))
 
     @classmethod
     def generate_completion_report(cls, survey, batch=None):
-        header = ['Investigator', 'Phone Number']
-        header.extend(LocationType.objects.all().values_list('name', flat=True))
-        data = [header]
-        all_investigators = cls.objects.all()
-        for investigator in all_investigators:
-            if investigator.has_households(survey) and investigator.completed_batch_or_survey(survey, batch):
-                row = [investigator.name, investigator.mobile_number]
-                if investigator.location:
-                    row.extend(investigator.locations_in_hierarchy().values_list('name', flat=True))
-                data.append(row)
-        return data
-
-    @property
-    def location(self):
-        ea_locations = self.ea.locations.all()[:1]
-        return None if not ea_locations.exists() else ea_locations[0]
\ No newline at end of file
+        from survey.services.investigator_completion_report import InvestigatorCompletionReport
+        return InvestigatorCompletionReport(survey, batch=batch).generate_report()
@@ -0,0 +1,58 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from rapidsms.contrib.locations.models import Location
+
+from survey.utils.cache_versions import cache_version, invalidate_version
+
+
+class LocationAncestry(object):
+    VERSION_KEY = "LocationAncestry-version"
+
+    _version = None
+    _nodes = {}
+
+    @classmethod
+    def version(cls):
+        version = cache_version(cls.VERSION_KEY)
+        if version != cls._version:
+            cls._version = version
+            cls._nodes = {}
+        return version
+
+    @classmethod
+    def _load(cls, location_ids):
+        parent_attr = Location._mptt_meta.parent_attr
+        missing = set(location_ids) - set(cls._nodes.keys()) - set([None])
+        while missing:
+            parents = set()
+            for location_id, name, parent_id in Location.objects.filter(id__in=missing).values_list('id', 'name',
+                                                                                                    parent_attr):
+                cls._nodes[location_id] = (name, parent_id)
+                parents.add(parent_id)
+            missing = parents - set(cls._nodes.keys()) - set([None])
+
+    @classmethod
+    def _names(cls, location_id):
+        names = []
+        while location_id in cls._nodes:
+            name, location_id = cls._nodes[location_id]
+            names.insert(0, name)
+        return names
+
+    @classmethod
+    def names_for(cls, location_ids):
+        cls.version()
+        cls._load(location_ids)
+        return dict([(location_id, cls._names(location_id)) for location_id in location_ids
+                     if location_id in cls._nodes])
+
+    @classmethod
+    def invalidate(cls):
+        cls._nodes = {}
+        invalidate_version(cls.VERSION_KEY)
+
+
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_location_ancestry(sender, instance, **kwargs):
+    LocationAncestry.invalidate()
@@ -0,0 +1,82 @@
+import bisect
+import heapq
+import re
+
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from rapidsms.contrib.locations.models import Location
+
+from survey.models.locations import LocationAutoComplete
+from survey.utils.cache_versions import cache_version, invalidate_version
+
+
+class LocationSearchIndex(object):
+    """Sorted word index over the location autocomplete paths, answering prefix searches from memory."""
+    VERSION_KEY = "LocationSearchIndex-version"
+    SEPARATOR = " > "
+    SCAN_LIMIT = 1000
+
+    _version = None
+    _index = ([], [])
+
+    @classmethod
+    def tokenize(cls, text):
+        return re.findall(r'\w+', text.lower(), re.UNICODE)
+
+    @classmethod
+    def version(cls):
+        version = cache_version(cls.VERSION_KEY)
+        if version != cls._version:
+            cls._load()
+            cls._version = version
+        return version
+
+    @classmethod
+    def _load(cls):
+        entries = list(LocationAutoComplete.objects.exclude(location=None).values_list('location', 'text'))
+        tokens = []
+        for position, (location_id, text) in enumerate(entries):
+            tokens.extend([(token, position) for token in set(cls.tokenize(text))])
+        tokens.sort()
+        cls._index = (entries, tokens)
+
+    @classmethod
+    def _matching_entries(cls, tokens, prefix):
+        matches = set()
+        index = bisect.bisect_left(tokens, (prefix,))
+        while index < len(tokens) and tokens[index][0].startswith(prefix):
+            matches.add(tokens[index][1])
+            index += 1
+        return matches
+
+    @classmethod
+    def _rank(cls, text, query):
+        name = text.rsplit(cls.SEPARATOR, 1)[-1].lower()
+        return not name.startswith(query), text.count(cls.SEPARATOR), text.lower()
+
+    @classmethod
+    def search(cls, query, limit=10):
+        cls.version()
+        entries, tokens = cls._index
+        words = sorted(cls.tokenize(query), key=len, reverse=True)
+        if not words:
+            return []
+        matches = cls._matching_entries(tokens, words[0])
+        for word in words[1:]:
+            if len(matches) > cls.SCAN_LIMIT:
+                matches &= cls._matching_entries(tokens, word)
+            else:
+                matches = set([position for position in matches
+                               if any([token.startswith(word) for token in cls.tokenize(entries[position][1])])])
+        query = query.strip().lower()
+        best = heapq.nsmallest(limit, matches, key=lambda position: cls._rank(entries[position][1], query))
+        return [{'id': entries[position][0], 'text': entries[position][1]} for position in best]
+
+    @classmethod
+    def invalidate(cls):
+        invalidate_version(cls.VERSION_KEY)
+
+
+@receiver(post_delete, sender=Location)
+def invalidate_location_search_index(sender, instance, **kwargs):
+    LocationSearchIndex.invalidate()
@@ -1,8 +1,16 @@
+import threading
+
 from django.db import models
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from rapidsms.contrib.locations.models import Location
 from survey.models import BaseModel
+from survey.utils.views_helper import descendants_queryset, ancestors_queryset
+
+AUTO_COMPLETE_BATCH_SIZE = 1000
+AUTO_COMPLETE_FULL_REBUILD_THRESHOLD = 200
+
+_auto_complete_local = threading.local()
 
 
 class LocationCode(BaseModel):
@@ -25,25 +33,91 @@ class LocationAutoComplete(models.Model):
 
 
 def generate_auto_complete_text_for_location(location):
-    auto_complete = LocationAutoComplete.objects.filter(location=location)
-    if not auto_complete:
-        auto_complete = LocationAutoComplete(location=location)
-    else:
-        auto_complete = auto_complete[0]
-    parents = [location.name]
-    while location.tree_parent:
-        location = location.tree_parent
-        parents.append(location.name)
-    parents.reverse()
-    auto_complete.text = " > ".join(parents)
-    auto_complete.save()
+    rebuild_auto_complete_texts([location], include_descendants=False)
+
+
+def _auto_complete_texts(nodes):
+    texts = {}
+    for location_id in nodes:
+        pending = []
+        while location_id in nodes and location_id not in texts:
+            pending.append(location_id)
+            location_id = nodes[location_id][1]
+        for pending_id in reversed(pending):
+            name, parent_id = nodes[pending_id]
+            texts[pending_id] = "%s > %s" % (texts[parent_id], name) if parent_id in texts else name
+    return texts
+
+
+def _chunks(items, size):
+    items = list(items)
+    return [items[start:start + size] for start in range(0, len(items), size)]
+
+
+def _write_auto_complete_texts(texts, existing):
+    from survey.models.location_search_index import LocationSearchIndex
+    changed = [location_id for location_id, text in texts.items() if existing.get(location_id) != text]
+    if changed:
+        LocationSearchIndex.invalidate()
+    for location_ids in _chunks(changed, AUTO_COMPLETE_BATCH_SIZE):
+        LocationAutoComplete.objects.filter(location__in=location_ids).delete()
+        LocationAutoComplete.objects.bulk_create([LocationAutoComplete(location_id=location_id, text=texts[location_id])
+                                                  for location_id in location_ids])
+
+
+def rebuild_auto_complete_texts(locations=None, include_descendants=True):
+    parent_attr = Location._mptt_meta.parent_attr
+    fields = ('id', 'name', parent_attr)
+    if locations is None:
+        nodes = dict([(row[0], row[1:]) for row in Location.objects.values_list(*fields)])
+        existing = dict(LocationAutoComplete.objects.values_list('location', 'text'))
+        _write_auto_complete_texts(_auto_complete_texts(nodes), existing)
+        return
+    nodes, targets = {}, set()
+    for location in locations:
+        rows = list(ancestors_queryset(location, include_self=True).values_list(*fields))
+        if include_descendants:
+            descendants = list(descendants_queryset(location, include_self=False).values_list(*fields))
+            targets.update([row[0] for row in descendants])
+            rows.extend(descendants)
+        nodes.update([(row[0], row[1:]) for row in rows])
+        targets.add(location.id)
+    texts = _auto_complete_texts(nodes)
+    texts = dict([(location_id, texts[location_id]) for location_id in targets if location_id in texts])
+    existing = {}
+    for location_ids in _chunks(texts.keys(), AUTO_COMPLETE_BATCH_SIZE):
+        existing.update(LocationAutoComplete.objects.filter(location__in=location_ids).values_list('location', 'text'))
+    _write_auto_complete_texts(texts, existing)
+
+
+class deferred_auto_complete(object):
+    """Suppresses per-save autocomplete maintenance inside the block and rebuilds the touched locations on exit."""
+
+    def __enter__(self):
+        if getattr(_auto_complete_local, 'pending', None) is None:
+            _auto_complete_local.pending = set()
+            self.owner = True
+        else:
+            self.owner = False
+
+    def __exit__(self, *args):
+        if not self.owner:
+            return
+        pending = _auto_complete_local.pending
+        _auto_complete_local.pending = None
+        if len(pending) > AUTO_COMPLETE_FULL_REBUILD_THRESHOLD:
+            rebuild_auto_complete_texts()
+        elif pending:
+            rebuild_auto_complete_texts(Location.objects.filter(id__in=pending))
 
 
 @receiver(post_save, sender=Location)
 def create_location_auto_complete_text(sender, instance, **kwargs):
-    generate_auto_complete_text_for_location(instance)
-    for location in instance.get_descendants():
-        generate_auto_complete_text_for_location(location)
+    pending = getattr(_auto_complete_local, 'pending', None)
+    if pending is not None:
+        pending.add(instance.id)
+    else:
+        rebuild_auto_complete_texts([instance])
 
 
 def auto_complete_text(self):
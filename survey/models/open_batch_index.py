@@ -0,0 +1,62 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from survey.models.batch import Batch, BatchLocationStatus
+from survey.models.surveys import Survey
+from survey.utils.cache_versions import cache_version, invalidate_version
+
+
+class OpenBatchIndex(object):
+    VERSION_KEY = "OpenBatchIndex-version"
+
+    _version = None
+    _entries = {}
+
+    @classmethod
+    def version(cls):
+        version = cache_version(cls.VERSION_KEY)
+        if version != cls._version:
+            cls._version = version
+            cls._entries = {}
+        return version
+
+    @classmethod
+    def statuses_for(cls, location):
+        if not location:
+            return []
+        cls.version()
+        if location.id not in cls._entries:
+            statuses = BatchLocationStatus.objects.filter(location=location).select_related('batch__survey')
+            cls._entries[location.id] = sorted(statuses, key=lambda status: status.created)
+        return cls._entries[location.id]
+
+    @classmethod
+    def statuses_for_any_of(cls, locations):
+        statuses = []
+        for location in locations:
+            statuses.extend(cls.statuses_for(location))
+        return sorted(statuses, key=lambda status: status.created)
+
+    @classmethod
+    def batches_for(cls, location):
+        return sorted([status.batch for status in cls.statuses_for(location)], key=lambda batch: batch.order)
+
+    @classmethod
+    def open_survey_for(cls, location):
+        surveys = [status.batch.survey for status in cls.statuses_for(location) if status.batch.survey]
+        return sorted(surveys, key=lambda survey: survey.id)[0] if surveys else None
+
+    @classmethod
+    def invalidate(cls):
+        cls._entries = {}
+        invalidate_version(cls.VERSION_KEY)
+
+
+@receiver(post_save, sender=BatchLocationStatus)
+@receiver(post_delete, sender=BatchLocationStatus)
+@receiver(post_save, sender=Batch)
+@receiver(post_delete, sender=Batch)
+@receiver(post_save, sender=Survey)
+@receiver(post_delete, sender=Survey)
+def invalidate_open_batch_index(sender, instance, **kwargs):
+    OpenBatchIndex.invalidate()
@@ -2,11 +2,13 @@ from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist, ValidationError
 from django.core.paginator import Paginator
 from django.db import models
+from django.db.models import Count
 from django.utils.datastructures import SortedDict
 from survey.models.households import Household, HouseholdMember
 from survey.models.investigator import Investigator
 from survey.models.base import BaseModel
 from survey.models.batch import Batch
+from survey.utils.views_helper import descendants_mapping, descendants_filter
 
 
 class Question(BaseModel):
@@ -89,8 +91,8 @@ class Question(BaseModel):
             options_list.append(self.NEXT_PAGE_TEXT)
         return "\n".join(options_list)
 
-    def get_next_question_by_rule(self, answer, investigator):
-        all_rules = self.rule.all()
+    def get_next_question_by_rule(self, answer, investigator, rules=None):
+        all_rules = self.rule.all() if rules is None else rules
         for rule in all_rules:
             if rule.validate(answer):
                 return rule.action_to_take(investigator, answer)
@@ -132,18 +134,43 @@ class Question(BaseModel):
 
     def hierarchical_result_for(self, location_parent, survey):
         locations = location_parent.get_children().order_by('name')[:10]
+        return self.results_for_locations(locations, survey)
+
+    def results_for_locations(self, locations, survey):
         answers = self.multichoiceanswer.all()
         return self._format_answer(locations, answers, survey)
 
     def _format_answer(self, locations, answers, survey):
+        locations = list(locations)
         question_options = self.options.all()
+        mapping = descendants_mapping(locations)
+        counts = {}
+        answers = answers.filter(descendants_filter(locations, 'household__location__'), household__survey=survey)
+        for row in answers.values('household__location', 'answer').annotate(total=Count('id')):
+            if row['household__location'] not in mapping:
+                continue
+            key = (mapping[row['household__location']], row['answer'])
+            counts[key] = counts.get(key, 0) + row['total']
         data = SortedDict()
         for location in locations:
-            households = Household.all_households_in(location, survey)
-            data[location] = {option.text: answers.filter(answer=option, household__in=households).count() for option in
-                              question_options}
+            data[location] = {option.text: counts.get((location.id, option.id), 0) for option in question_options}
         return data
 
+    def ea_counts_for_locations(self, locations, survey):
+        mapping = descendants_mapping(locations)
+        options = dict(self.options.values_list('id', 'text'))
+        answers = self.multichoiceanswer.filter(descendants_filter(locations, 'household__location__'),
+                                                household__survey=survey)
+        counts = {}
+        for row in answers.values('household__ea', 'household__location', 'answer').annotate(total=Count('id')):
+            if row['answer'] not in options or row['household__location'] not in mapping:
+                continue
+            location_counts = counts.setdefault(row['household__ea'], {}).setdefault(
+                mapping[row['household__location']], {})
+            text = options[row['answer']]
+            location_counts[text] = location_counts.get(text, 0) + row['total']
+        return counts
+
 
 class QuestionOption(BaseModel):
     question = models.ForeignKey(Question, null=True, related_name="options")
@@ -34,6 +34,9 @@ class Survey(BaseModel):
 
     @classmethod
     def currently_open_survey(cls, location=None):
+        if location:
+            from survey.models.open_batch_index import OpenBatchIndex
+            return OpenBatchIndex.open_survey_for(location)
         for survey in Survey.objects.all():
             if survey.is_open(location):
                 return survey
@@ -1,5 +1,10 @@
+import json
+
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
 from rapidsms.contrib.locations.models import Location
-from survey.models import Household
+from survey.models import Household, BatchCompletionRollup, BatchLocationStatus
+from survey.utils.views_helper import descendants_mapping
 
 
 class BatchCompletionRates:
@@ -13,12 +18,20 @@ class BatchCompletionRates:
             return 0
 
     def percent_completed_households(self, location, survey, ea=None):
+        if not ea and survey == self.batch.survey:
+            return self.calculate_percent(*BatchCompletionRollup.totals_under(location, self.batch))
         all_households = Household.all_households_in(location, survey, ea)
         return self.percentage_completed(all_households)
 
     def percentage_completed(self, all_households):
-        completed_households = filter(lambda household: household.has_completed_batch(self.batch), all_households)
-        return self.calculate_percent(len(completed_households), all_households.count())
+        counts = BatchCompletionRollup.completion_counts(all_households, self.batch).values()
+        return self.calculate_percent(sum([completed for completed, total in counts]),
+                                      sum([total for completed, total in counts]))
+
+    def total_households(self, location, survey, ea=None):
+        if not ea and survey == self.batch.survey:
+            return BatchCompletionRollup.totals_under(location, self.batch)[1]
+        return Household.all_households_in(location, survey, ea).count()
 
 
 class BatchLocationCompletionRates(BatchCompletionRates):
@@ -29,9 +42,9 @@ class BatchLocationCompletionRates(BatchCompletionRates):
         self.all_households = Household.all_households_in(self.location, batch.survey, ea)
 
     def percent_completed_households(self):
-        all_households = self.all_households
-        completed_households = filter(lambda household: household.has_completed_batch(self.batch), all_households)
-        return self.calculate_percent(len(completed_households), all_households.count())
+        if not self.ea:
+            return self.calculate_percent(*BatchCompletionRollup.totals_under(self.location, self.batch))
+        return self.percentage_completed(self.all_households)
 
     def interviewed_households(self):
         _interviewed_households = []
@@ -53,25 +66,50 @@ class BatchHighLevelLocationsCompletionRates(BatchCompletionRates):
         _completion_rates =[]
         for location in self.locations:
             attribute = {'location': location,
-                         'total_households': Household.all_households_in(location, self.batch.survey, self.ea).count(),
+                         'total_households': self.total_households(location, self.batch.survey, self.ea),
                          'completed_households_percent': self.percent_completed_households(location, self.batch.survey, self.ea)}
             _completion_rates.append(attribute)
         return _completion_rates
 
 
-class BatchSurveyCompletionRates:
+class BatchSurveyCompletionRates(BatchCompletionRates):
+    CACHE_KEY = "SurveyCompletion-%s-%s-%s"
+
     def __init__(self, location_type):
         self.location_type = location_type
         self.locations = Location.objects.filter(type=location_type)
 
+    def _rollup_totals(self, survey):
+        mapping = descendants_mapping(self.locations)
+        rollups = BatchCompletionRollup.objects.filter(batch__survey=survey).values_list(
+            'batch', 'completed_households', 'total_households', 'location')
+        totals = {}
+        for batch_id, completed, total, location_id in rollups:
+            if location_id not in mapping:
+                continue
+            count = totals.setdefault((mapping[location_id], batch_id), [0, 0])
+            count[0] += completed
+            count[1] += total
+        return totals
+
     def get_completion_formatted_for_json(self, survey):
-        all_batches = survey.batch.all()
+        batch_ids = list(survey.batch.values_list('id', flat=True))
+        open_locations = set(BatchLocationStatus.objects.filter(batch__survey=survey).values_list('location',
+                                                                                                  flat=True))
+        totals = self._rollup_totals(survey)
         completion_rates_dict = {}
-        number_of_batches = len(all_batches)
-
-        for location in self.locations:
-            percent_completed = 0.0
-            percent_completed = reduce(lambda percent_completed, rate: percent_completed + rate,
-                                       map(lambda batch: BatchLocationCompletionRates(batch, location).percent_completed_households(), all_batches))
-            completion_rates_dict[location.name] = percent_completed/number_of_batches if survey.is_open_for(location) else -1
+        for location_id, name in self.locations.values_list('id', 'name'):
+            if location_id not in open_locations:
+                completion_rates_dict[name] = -1
+                continue
+            percents = [self.calculate_percent(*totals.get((location_id, batch_id), [0, 0])) for batch_id in batch_ids]
+            completion_rates_dict[name] = sum(percents) / len(batch_ids)
         return completion_rates_dict
+
+    def completion_json(self, survey):
+        key = self.CACHE_KEY % (BatchCompletionRollup.version(), survey.id, self.location_type.id)
+        json_dump = cache.get(key)
+        if json_dump is None:
+            json_dump = json.dumps(self.get_completion_formatted_for_json(survey), cls=DjangoJSONEncoder)
+            cache.set(key, json_dump)
+        return json_dump
@@ -10,25 +10,37 @@ FIRST_LINE = 0
 
 
 class CSVUploader:
+    SNIFF_SIZE = 8192
 
     def __init__(self, file):
         self.file = file
 
+    @classmethod
+    def is_not_csv(cls, _file):
+        _file.seek(FIRST_LINE)
+        leading_chunk = _file.read(cls.SNIFF_SIZE)
+        _file.seek(FIRST_LINE)
+        return '\0' in leading_chunk
+
     def file_is_not_csv(self):
-        return '\0' in self.file.read()
+        return self.is_not_csv(self.file)
 
     def headers(self):
+        self.read_file_from_begging()
         return csv.reader(self.file).next()
 
+    def rows(self):
+        self.read_file_from_begging()
+        csv_file = csv.reader(self.file)
+        next(csv_file, None)
+        return csv_file
+
     def split_content(self):
         if self.file_is_not_csv():
-            return [], []
-        self.read_file_from_begging()
+            return [], iter([])
         csv_file = csv.reader(self.file)
-        all_rows = [row for row in csv_file]
-        headers = all_rows[FIRST_LINE]
-        all_rows.pop(FIRST_LINE)
-        return headers, all_rows
+        headers = next(csv_file, [])
+        return headers, csv_file
 
     def read_file_from_begging(self):
         self.file.seek(FIRST_LINE)
@@ -1,50 +1,68 @@
-from rapidsms.contrib.locations.models import Location, LocationType
+from rapidsms.contrib.locations.models import LocationType
 
 from survey.models import UploadErrorLog, EnumerationArea
 from survey.services.csv_uploader import UploadService
+from survey.services.location_path_index import LocationPathIndex
 
 
 class UploadEA(UploadService):
     MODEL = 'EA'
+    BATCH_SIZE = 1000
 
-    @classmethod
-    def parents_locations_match(cls, location, given_parents):
-        location_parents = location.get_ancestors().values_list('name', flat=True)
-        check = [parent_name in location_parents for parent_name in given_parents]
-        return check.count(True) == len(given_parents)
-
-    def check_errors_(self, index,  row, headers, skip_column, lowest_location_column):
-        lowest_location_name = row[lowest_location_column]
-        location = Location.objects.filter(name=lowest_location_name, tree_parent__name__iexact=row[skip_column-1].lower())
-        if not location.exists():
+    def check_errors_(self, index, row, headers, skip_column, lowest_location_column):
+        names = row[:skip_column] + [row[lowest_location_column]]
+        if not self.location_index.has_parented_name(names):
             self.log_error(index+1, 'There is no %s with name: %s, in %s.' %
                                     (headers[lowest_location_column].lower(), row[lowest_location_column], row[skip_column-1]))
             return
-        if not self.parents_locations_match(location[0], row[:skip_column-1]):
-            self.log_error(index+1, 'The location hierarchy %s >> %s does not exist.' % ((' >> '.join(row[:skip_column])), lowest_location_name))
+        location_id = self.location_index.location_id(names)
+        if not location_id:
+            self.log_error(index+1, 'The location hierarchy %s >> %s does not exist.' % ((' >> '.join(row[:skip_column])), row[lowest_location_column]))
             return
-        return location[0]
+        return location_id
 
     def check_location_errors(self, index, row, headers):
         first_ea_column_number = headers.index('EA')
         return self.check_errors_(index,  row, headers,
                                   skip_column=first_ea_column_number, lowest_location_column=-2)
 
-    def save_ea(self, index, row, location, survey):
+    def ea_name(self, index, row):
         first_ea_column_number = -3
         second_ea_column_number = -1
         ea_name = row[first_ea_column_number] or row[second_ea_column_number]
-        if ea_name:
-            ea = EnumerationArea.objects.get_or_create(name=ea_name, survey=survey)[0]
-            ea.locations.add(location)
-        else:
+        if not ea_name:
             self.log_error(index+1, 'Enumeration Area name required.')
+        return ea_name
+
+    def save_eas(self, ea_locations, survey):
+        if not ea_locations:
+            return
+        eas = EnumerationArea.objects.filter(survey=survey)
+        existing = dict(eas.values_list('name', 'id'))
+        EnumerationArea.objects.bulk_create([EnumerationArea(name=name, survey=survey)
+                                             for name in ea_locations if name not in existing])
+        ea_ids = dict(eas.values_list('name', 'id'))
+        through = EnumerationArea.locations.through
+        linked = set(through.objects.filter(enumerationarea__in=ea_ids.values()).values_list('enumerationarea',
+                                                                                               'location'))
+        links = set([(ea_ids[name], location_id) for name, location_ids in ea_locations.items()
+                     for location_id in location_ids]) - linked
+        through.objects.bulk_create([through(enumerationarea_id=ea_id, location_id=location_id)
+                                     for ea_id, location_id in links], batch_size=self.BATCH_SIZE)
+        relocated = set([ea_id for ea_id, location_id in links]) & set(existing.values())
+        for ea in EnumerationArea.objects.filter(id__in=relocated):
+            ea.update_located_households_and_investigators()
 
     def create_ea(self, reader, headers, survey):
+        self.location_index = LocationPathIndex(headers.index('EA') + 1)
+        ea_locations = {}
         for index, row in enumerate(reader):
-            location = self.check_location_errors(index, row, headers)
-            if location:
-                self.save_ea(index, row, location, survey)
+            location_id = self.check_location_errors(index, row, headers)
+            if location_id:
+                ea_name = self.ea_name(index, row)
+                if ea_name:
+                    ea_locations.setdefault(ea_name, set()).add(location_id)
+        self.save_eas(ea_locations, survey)
 
     def upload(self, survey):
         headers, reader = self.csv_uploader.split_content()
@@ -0,0 +1,71 @@
+import numpy
+from django.db.models import Sum
+from survey.models import Investigator
+
+
+class FormulaEngine(object):
+    """Computes a formula for every investigator under a location with grouped queries and array math."""
+
+    def __init__(self, formula):
+        self.formula = formula
+
+    def _investigators(self, location):
+        investigators = Investigator.lives_under_location(location).order_by('id')
+        rows = list(investigators.values_list('id', 'weights'))
+        index = dict([(investigator_id, position) for position, (investigator_id, weights) in enumerate(rows)])
+        weights = numpy.array([weights for investigator_id, weights in rows], dtype=float)
+        return investigators, index, weights
+
+    def _sums_per_investigator(self, question, investigators, index):
+        sums = numpy.zeros(len(index))
+        answers = question.answer_class().objects.filter(question=question, investigator__in=investigators)
+        for row in answers.values('investigator').annotate(total=Sum('answer')):
+            if row['investigator'] in index:
+                sums[index[row['investigator']]] = row['total'] or 0
+        return sums
+
+    def _apply(self, numerators, denominators, weights):
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            values = (numerators * weights / denominators) * 100
+        return numpy.where(denominators != 0, values, 0)
+
+    def _numerator_sums_per_option(self, options, investigators, index):
+        numerator, denominator = self.formula.numerator, self.formula.denominator
+        option_index = dict([(option.id, position) for position, option in enumerate(options)])
+        answers = numerator.answer_class().objects.filter(question=numerator, investigator__in=investigators)
+        picks = set(answers.values_list('investigator', 'answer', 'household'))
+        household_sums = denominator.answer_class().objects.filter(
+            question=denominator, household__in=answers.values('household')).values('household').annotate(
+            total=Sum('answer'))
+        household_sums = dict([(row['household'], row['total'] or 0) for row in household_sums])
+        picks = [(index[investigator_id], option_index[option_id], household_sums.get(household_id, 0))
+                 for investigator_id, option_id, household_id in picks
+                 if investigator_id in index and option_id in option_index]
+        sums = numpy.zeros((len(index), len(options)))
+        if picks:
+            rows, columns, totals = zip(*picks)
+            numpy.add.at(sums, (numpy.array(rows), numpy.array(columns)), numpy.array(totals, dtype=float))
+        return sums
+
+    def compute_numerical(self, location):
+        investigators, index, weights = self._investigators(location)
+        if not index:
+            return 0
+        numerators = self._sums_per_investigator(self.formula.numerator, investigators, index)
+        denominators = self._sums_per_investigator(self.formula.denominator, investigators, index)
+        return float(self._apply(numerators, denominators, weights).mean())
+
+    def compute_multichoice(self, location):
+        options = list(self.formula.numerator.options.all())
+        investigators, index, weights = self._investigators(location)
+        if not index:
+            return dict([(option.text, 0) for option in options])
+        numerators = self._numerator_sums_per_option(options, investigators, index)
+        denominators = self._sums_per_investigator(self.formula.denominator, investigators, index)
+        values = self._apply(numerators, denominators[:, numpy.newaxis], weights[:, numpy.newaxis]).mean(axis=0)
+        return dict([(option.text, float(value)) for option, value in zip(options, values)])
+
+    def compute_for_location(self, location):
+        if self.formula.numerator.is_multichoice():
+            return self.compute_multichoice(location)
+        return self.compute_numerical(location)
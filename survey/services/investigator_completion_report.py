@@ -0,0 +1,78 @@
+from django.db.models import Count
+from rapidsms.contrib.locations.models import LocationType
+from survey.models import Investigator, Household, HouseholdMember, HouseholdMemberBatchCompletion, \
+    BatchLocationStatus, LocationAncestry
+
+
+class InvestigatorCompletionReport(object):
+    def __init__(self, survey=None, batch=None):
+        self.survey = survey
+        self.batch = batch
+
+    def header(self):
+        header = ['Investigator', 'Phone Number']
+        header.extend(LocationType.objects.all().values_list('name', flat=True))
+        return header
+
+    def _households(self):
+        households = Household.objects.all()
+        return households.filter(survey=self.survey) if self.survey else households
+
+    def _required_batches(self, investigators):
+        if not self.survey or self.batch:
+            return dict([(investigator['id'], set([self.batch.id if self.batch else None]))
+                         for investigator in investigators])
+        open_batches = {}
+        statuses = BatchLocationStatus.objects.filter(batch__survey=self.survey).values_list('location', 'batch')
+        for location_id, batch_id in statuses:
+            open_batches.setdefault(location_id, set()).add(batch_id)
+        return dict([(investigator['id'], open_batches.get(investigator['location'], set()))
+                     for investigator in investigators])
+
+    def _member_counts(self):
+        members = HouseholdMember.objects.filter(household__in=self._households()).values('household').annotate(
+            members=Count('id'))
+        return dict([(count['household'], count['members']) for count in members])
+
+    def _completed_member_counts(self, batch_ids):
+        completions = HouseholdMemberBatchCompletion.objects.filter(householdmember__household__in=self._households())
+        if None in batch_ids:
+            completions = completions.filter(batch=None)
+        else:
+            completions = completions.filter(batch__in=batch_ids)
+        completions = completions.values('householdmember__household', 'batch').annotate(
+            members=Count('householdmember', distinct=True))
+        return dict([((count['householdmember__household'], count['batch']), count['members'])
+                     for count in completions])
+
+    def completion_counts(self, investigators):
+        required_batches = self._required_batches(investigators)
+        batch_ids = set()
+        for batches in required_batches.values():
+            batch_ids.update(batches)
+        member_counts = self._member_counts()
+        completed_member_counts = self._completed_member_counts(batch_ids)
+        counts = dict([(investigator['id'], [0, 0]) for investigator in investigators])
+        for household_id, investigator_id in self._households().values_list('id', 'investigator'):
+            if investigator_id not in counts:
+                continue
+            batches = required_batches[investigator_id]
+            members = member_counts.get(household_id, 0)
+            counts[investigator_id][1] += 1
+            if batches and all([completed_member_counts.get((household_id, batch_id), 0) == members
+                                for batch_id in batches]):
+                counts[investigator_id][0] += 1
+        return counts
+
+    def iter_report(self):
+        yield self.header()
+        investigators = list(Investigator.objects.order_by('id').values('id', 'name', 'mobile_number', 'location'))
+        counts = self.completion_counts(investigators)
+        ancestors = LocationAncestry.names_for(set([investigator['location'] for investigator in investigators]))
+        for investigator in investigators:
+            completed, total = counts[investigator['id']]
+            if total and completed == total:
+                yield [investigator['name'], investigator['mobile_number']] + ancestors.get(investigator['location'], [])
+
+    def generate_report(self):
+        return list(self.iter_report())
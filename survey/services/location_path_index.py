@@ -0,0 +1,34 @@
+from rapidsms.contrib.locations.models import Location
+
+
+class LocationPathIndex(object):
+    """Upload-scoped lookup of locations by the lowercased names of their closest levels, loaded in one query."""
+
+    def __init__(self, depth):
+        self.depth = depth
+        parent_attr = Location._mptt_meta.parent_attr
+        locations = dict([(location_id, (name.lower(), parent_id)) for location_id, name, parent_id in
+                          Location.objects.values_list('id', 'name', parent_attr).iterator()])
+        self.paths = {}
+        self.parented_names = set()
+        for location_id in locations:
+            path = self._path(location_id, locations)
+            self.paths.setdefault(path, location_id)
+            self.parented_names.add(path[-2:])
+
+    def _path(self, location_id, locations):
+        names = []
+        while location_id and len(names) < self.depth:
+            name, location_id = locations[location_id]
+            names.append(name)
+        return tuple(reversed(names))
+
+    @classmethod
+    def key(cls, names):
+        return tuple([name.strip().lower() for name in names])
+
+    def has_parented_name(self, names):
+        return self.key(names)[-2:] in self.parented_names
+
+    def location_id(self, names):
+        return self.paths.get(self.key(names))
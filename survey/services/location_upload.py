@@ -1,11 +1,13 @@
 from django.template.defaultfilters import slugify
 from rapidsms.contrib.locations.models import LocationType, Location
-from survey.models import LocationTypeDetails, LocationCode, UploadErrorLog
+from survey.models import LocationTypeDetails, LocationCode, UploadErrorLog, LocationAncestry, BatchCompletionRollup
+from survey.models.locations import rebuild_auto_complete_texts
 from survey.services.csv_uploader import UploadService
 
 
 class UploadLocation(UploadService):
     MODEL = 'LOCATIONS'
+    BATCH_SIZE = 1000
 
     def _get_location_type(self, headers):
         location_types = []
@@ -17,12 +19,67 @@ class UploadLocation(UploadService):
             row_regrouping.append(2 if detail.has_code else 1)
         return location_types, row_regrouping
 
-    def _create_locations(self, csv_rows, location_types, row_regrouping):
-        first_level_location = LocationTypeDetails.objects.all()[0].country
-        for index, row in enumerate(csv_rows):
-            tree_parent = first_level_location
+    def _row_paths(self, location_types, row_regrouping, log_errors=False):
+        for index, row in enumerate(self.csv_uploader.rows()):
+            path = []
             for x_index, cell_value in enumerate(self.regroup_with_code(row, row_regrouping)):
-                tree_parent = self._create_location_and_code(cell_value, index, tree_parent, location_types[x_index])
+                type_ = location_types[x_index]['type']
+                if not cell_value[-1] and location_types[x_index]['detail'].required:
+                    if log_errors:
+                        self.log_error(index+2, "Missing data: %sName should not be empty." % type_.name)
+                else:
+                    path.append((cell_value[-1].strip(), x_index, cell_value[0]))
+            yield index, path
+
+    def _existing_locations(self, location_types):
+        parent_attr = Location._mptt_meta.parent_attr
+        locations = Location.objects.filter(type__in=[location_type['type'] for location_type in location_types])
+        return dict([((name, type_id, parent_id), location_id) for location_id, name, type_id, parent_id in
+                     locations.values_list('id', 'name', 'type', parent_attr)])
+
+    def _new_location(self, name, type_id, parent_id):
+        opts = Location._mptt_meta
+        location = Location(name=name, type_id=type_id)
+        setattr(location, '%s_id' % opts.parent_attr, parent_id)
+        for attr in (opts.tree_id_attr, opts.left_attr, opts.right_attr, opts.level_attr):
+            setattr(location, attr, 0)
+        return location
+
+    def _parent_of(self, path, depth, root_id, known, location_types):
+        parent_id = root_id
+        for name, x_index, code in path[:depth]:
+            parent_id = known[(name, location_types[x_index]['type'].id, parent_id)]
+        return parent_id
+
+    def _codes(self, location_types, row_regrouping, root_id, known):
+        for index, path in self._row_paths(location_types, row_regrouping):
+            parent_id = root_id
+            for name, x_index, code in path:
+                parent_id = known[(name, location_types[x_index]['type'].id, parent_id)]
+                if location_types[x_index]['detail'].has_code:
+                    yield index, parent_id, location_types[x_index], code
+
+    def _create_locations(self, location_types, row_regrouping):
+        first_level_location = LocationTypeDetails.objects.all()[0].country
+        root_id = first_level_location.id if first_level_location else None
+        known = self._existing_locations(location_types)
+        for depth in range(len(location_types)):
+            missing = set()
+            for index, path in self._row_paths(location_types, row_regrouping, log_errors=depth == 0):
+                if len(path) > depth:
+                    name, x_index, code = path[depth]
+                    key = (name, location_types[x_index]['type'].id,
+                           self._parent_of(path, depth, root_id, known, location_types))
+                    if key not in known:
+                        missing.add(key)
+            if missing:
+                Location.objects.bulk_create([self._new_location(*key) for key in missing], batch_size=self.BATCH_SIZE)
+                known = self._existing_locations(location_types)
+        self._create_codes(self._codes(location_types, row_regrouping, root_id, known))
+        Location._tree_manager.rebuild()
+        rebuild_auto_complete_texts()
+        LocationAncestry.invalidate()
+        BatchCompletionRollup.invalidate()
 
     def regroup_with_code(self, row, group_size): # see test...
         new_row = []
@@ -32,33 +89,33 @@ class UploadLocation(UploadService):
             pos = pos+size
         return new_row
 
-    def _create_location_and_code(self, cell_value, index, tree_parent, location_type):
-        type_ = location_type['type']
-        location_detail = location_type['detail']
-        if not cell_value[-1] and location_detail.required:
-            self.log_error(index+2,
-                           "Missing data: %sName should not be empty."%type_.name)
-        else:
-            tree_parent = Location.objects.get_or_create(name=cell_value[-1].strip(), type=type_, tree_parent=tree_parent)[0]
-            if location_detail.has_code:
-                self._create_code(index, tree_parent, location_type, code=cell_value[0])
-        return tree_parent
-
-    def _create_code(self, index, tree_parent, location_type, code):
-        type_ = location_type['type']
-        location_detail = location_type['detail']
-        if len(code) != location_detail.length_of_code:
-            self.log_error(index+2,
+    def _create_codes(self, codes):
+        existing = set()
+        checked_types = set()
+        new_codes = []
+        for index, location_id, location_type, code in codes:
+            type_ = location_type['type']
+            location_detail = location_type['detail']
+            if type_.id not in checked_types:
+                checked_types.add(type_.id)
+                existing.update(LocationCode.objects.filter(location__type=type_).values_list('location', 'code'))
+            if len(code) != location_detail.length_of_code:
+                self.log_error(index+2,
                                "%sCode is shorter or longer than the required %d digits."%(type_.name,  location_detail.length_of_code))
-        else:
-            LocationCode.objects.create(location=tree_parent, code=code)
+            elif (location_id, code) not in existing:
+                existing.add((location_id, code))
+                new_codes.append(LocationCode(location_id=location_id, code=code))
+            if len(new_codes) >= self.BATCH_SIZE:
+                LocationCode.objects.bulk_create(new_codes)
+                new_codes = []
+        LocationCode.objects.bulk_create(new_codes)
 
     def upload(self):
-        headers, rows = self.csv_uploader.split_content()
+        headers = self.csv_uploader.split_content()[0]
         cleaned_headers = self.remove_trailing('Name', in_array=headers, exclude='Code')
         if not cleaned_headers:
             UploadErrorLog.objects.create(model=self.MODEL, filename=self.file.name,
                                           error='Locations not uploaded. %s is not a valid csv file.' % self.file.name)
         else:
             location_types, row_regrouping = self._get_location_type(cleaned_headers)
-            self._create_locations(rows, location_types, row_regrouping)
+            self._create_locations(location_types, row_regrouping)
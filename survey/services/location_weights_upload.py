@@ -1,41 +1,41 @@
-from rapidsms.contrib.locations.models import Location
-
 from django.utils.timezone import utc
 from survey.models import LocationWeight, UploadErrorLog
 from survey.services.csv_uploader import UploadService
+from survey.services.location_path_index import LocationPathIndex
 
 
 class UploadLocationWeights(UploadService):
     MODEL = 'WEIGHTS'
-
-    @classmethod
-    def parents_locations_match(cls, location, given_parents):
-        location_parents = location.get_ancestors().values_list('name', flat=True)
-        check = [parent_name in location_parents for parent_name in given_parents]
-        return check.count(True) == len(given_parents)
+    BATCH_SIZE = 1000
 
     def check_location_errors(self, index, row, headers):
-        lowest_location = row[-2]
-        location = Location.objects.filter(name=lowest_location, tree_parent__name__iexact=row[-3].lower())
-        if not location.exists():
+        if not self.location_index.has_parented_name(row[:-1]):
             self.log_error(index+1, 'There is no %s with name: %s, in %s.' % (headers[-2].lower(), row[-2], row[-3]))
             return
-        if not self.parents_locations_match(location[0], row[:-3]):
+        location_id = self.location_index.location_id(row[:-1])
+        if not location_id:
             self.log_error(index+1, 'The location hierarchy %s does not exist.' % ((' >> '.join(row[:-1]))))
             return
-        return location
+        return location_id
 
-    def save_weight(self, index, row, location, survey):
+    def weight(self, index, row, location_id, survey):
         try:
-            LocationWeight.objects.create(location=location[0], selection_probability=float(row[-1]), survey=survey)
+            return LocationWeight(location_id=location_id, selection_probability=float(row[-1]), survey=survey)
         except ValueError, e:
             self.log_error(index+1, 'Selection probability must be a number.')
 
     def create_locations_weights(self, reader, headers, survey):
+        self.location_index = LocationPathIndex(len(headers) - 1)
+        weights = []
         for index, row in enumerate(reader):
-            location = self.check_location_errors(index, row, headers)
-            if location:
-                self.save_weight(index, row, location, survey)
+            location_id = self.check_location_errors(index, row, headers)
+            weight = location_id and self.weight(index, row, location_id, survey)
+            if weight:
+                weights.append(weight)
+            if len(weights) >= self.BATCH_SIZE:
+                LocationWeight.objects.bulk_create(weights)
+                weights = []
+        LocationWeight.objects.bulk_create(weights)
 
     def upload(self, survey):
         headers, reader = self.csv_uploader.split_content()
@@ -0,0 +1,63 @@
+from multiprocessing import Pool
+
+import numpy
+
+
+def _bootstrap_totals(args):
+    psu_totals, replicates, seed = args
+    psu_count = psu_totals.shape[0]
+    draws = numpy.random.RandomState(seed).multinomial(psu_count, [1.0 / psu_count] * psu_count, size=replicates)
+    return draws.dot(psu_totals)
+
+
+class ReplicateVariance(object):
+    """Standard errors of totals from replicates that drop or resample whole primary sampling units (EAs)."""
+    JACKKNIFE = 'jackknife'
+    BOOTSTRAP = 'bootstrap'
+    METHODS = (JACKKNIFE, BOOTSTRAP)
+    Z_95 = 1.959964
+
+    def __init__(self, method=JACKKNIFE, replicates=200, processes=None, seed=None):
+        if method not in self.METHODS:
+            raise ValueError("Unknown replicate method %s" % method)
+        self.method = method
+        self.replicates = replicates
+        self.processes = processes
+        self.seed = seed
+
+    def signature(self):
+        if self.method == self.JACKKNIFE:
+            return self.method
+        return "%s-%s-%s" % (self.method, self.replicates, self.seed)
+
+    def jackknife_replicates(self, psu_totals):
+        psu_count = psu_totals.shape[0]
+        return (psu_totals.sum(axis=0) - psu_totals) * psu_count / (psu_count - 1.0)
+
+    def bootstrap_replicates(self, psu_totals):
+        seed = self.seed if self.seed is not None else numpy.random.randint(0, 2 ** 31 - 1)
+        if not self.processes or self.processes < 2:
+            return _bootstrap_totals((psu_totals, self.replicates, seed))
+        chunks = [(psu_totals, len(chunk), seed + index)
+                  for index, chunk in enumerate(numpy.array_split(numpy.arange(self.replicates), self.processes))
+                  if len(chunk)]
+        pool = Pool(self.processes)
+        try:
+            return numpy.vstack(pool.map(_bootstrap_totals, chunks))
+        finally:
+            pool.close()
+            pool.join()
+
+    def standard_errors(self, psu_totals):
+        psu_totals = numpy.asarray(psu_totals, dtype=float)
+        if psu_totals.ndim != 2 or psu_totals.shape[0] < 2:
+            return numpy.zeros(psu_totals.shape[-1] if psu_totals.ndim else 0)
+        if self.method == self.JACKKNIFE:
+            replicates = self.jackknife_replicates(psu_totals)
+            psu_count = psu_totals.shape[0]
+            deviations = replicates - replicates.mean(axis=0)
+            return numpy.sqrt((psu_count - 1.0) / psu_count * (deviations ** 2).sum(axis=0))
+        return self.bootstrap_replicates(psu_totals).std(axis=0, ddof=1)
+
+    def confidence_interval(self, estimate, standard_error):
+        return estimate - self.Z_95 * standard_error, estimate + self.Z_95 * standard_error
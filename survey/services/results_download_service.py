@@ -1,9 +1,12 @@
 from rapidsms.contrib.locations.models import Location
-from survey.models import LocationTypeDetails, Household, HouseholdMemberGroup
+from survey.models import LocationTypeDetails, Household, HouseholdMemberGroup, HouseholdHead, HouseholdMember, \
+    NumericalAnswer, TextAnswer, MultiChoiceAnswer
 from survey.utils.views_helper import get_ancestors
 
 
 class ResultsDownloadService(object):
+    HOUSEHOLDS_PER_CHUNK = 500
+
     def __init__(self, survey=None, batch=None):
         self.batch = batch
         self.survey, self.questions = self._set_survey_and_questions(survey)
@@ -28,30 +31,97 @@ class ResultsDownloadService(object):
                 header.append('')
         return header
 
-    def get_summarised_answers(self):
-        data = []
-        all_households = Household.objects.filter(survey=self.survey)
-        locations = list(set(all_households.values_list('ea__locations', flat=True)))
+    def _households(self):
+        return Household.objects.filter(survey=self.survey).exclude(location=None)
+
+    def household_count(self):
+        return self._households().count()
+
+    def household_ids(self):
+        return set(self._households().values_list('id', flat=True))
+
+    def _household_chunks(self, household_ids=None):
+        households = self._households().select_related('location').order_by('id')
+        if household_ids is not None:
+            household_ids = sorted(household_ids)
+            for start in range(0, len(household_ids), self.HOUSEHOLDS_PER_CHUNK):
+                chunk = list(households.filter(id__in=household_ids[start:start + self.HOUSEHOLDS_PER_CHUNK]))
+                if chunk:
+                    yield chunk
+            return
+        last_id = 0
+        while True:
+            chunk = list(households.filter(id__gt=last_id)[:self.HOUSEHOLDS_PER_CHUNK])
+            if not chunk:
+                return
+            yield chunk
+            last_id = chunk[-1].id
+
+    def _members_of(self, households):
+        heads = dict([(head.household_id, head) for head in HouseholdHead.objects.filter(household__in=households)])
+        members = {}
+        for member in HouseholdMember.objects.filter(household__in=households, householdhead=None).order_by('surname'):
+            members.setdefault(member.household_id, []).append(member)
+        for household in households:
+            head = heads.get(household.id, None)
+            yield household, head, ([head] if head else []) + members.get(household.id, [])
+
+    def _answers_in(self, households):
+        answers = {}
+        question_ids = [question.id for question in self.questions]
+        for answer_class in [NumericalAnswer, TextAnswer, MultiChoiceAnswer]:
+            all_answers = answer_class.objects.filter(household__in=households, question__in=question_ids).order_by('id')
+            if answer_class == MultiChoiceAnswer:
+                all_answers = all_answers.select_related('answer')
+            for answer in all_answers:
+                answers.setdefault((answer.household_id, answer.householdmember_id, answer.question_id), answer)
+        return answers
+
+    def _pivot_answers(self, member, head, answers, general_question_ids):
+        member_answers = []
+        for question in self.questions:
+            answered_by = member.id
+            if question.id in general_question_ids:
+                answered_by = head.id if head else None
+            answer = answers.get((member.household_id, answered_by, question.id), None)
+            member_answers.extend(HouseholdMember._format_answer([answer] if answer else [], question))
+        return member_answers
+
+    def iter_household_rows(self, household_ids=None, progress=None):
         general_group = HouseholdMemberGroup.objects.get(name="GENERAL")
-        for location_id in locations:
-            households_in_location = all_households.filter(ea__locations=location_id)
-            household_location = households_in_location[0].location
-            location_ancestors = self._get_ancestors_names(household_location, exclude_type='country')
-            for household in households_in_location:
-                for member in household.all_members():
+        general_question_ids = set([question.id for question in self.questions if question.belongs_to(general_group)])
+        location_ancestors = {}
+        for households in self._household_chunks(household_ids):
+            answers = self._answers_in(households)
+            for household, head, members in self._members_of(households):
+                if household.location_id not in location_ancestors:
+                    location_ancestors[household.location_id] = self._get_ancestors_names(household.location,
+                                                                                          exclude_type='country')
+                for member in members:
                     member_gender = 'Male' if member.male else 'Female'
-                    answers = location_ancestors
-                    answers = answers + [household.household_code, member.surname, str(int(member.get_age())),
-                                         str(member.get_month_of_birth()), str(member.get_year_of_birth()),
-                                         member_gender]
-                    answers = answers + member.answers_for(self.questions, general_group)
-                    data.append(answers)
-        return data
+                    row = location_ancestors[household.location_id]
+                    row = row + [household.household_code, member.surname, str(int(member.get_age())),
+                                 str(member.get_month_of_birth()), str(member.get_year_of_birth()),
+                                 member_gender]
+                    row = row + self._pivot_answers(member, head, answers, general_question_ids)
+                    yield household.id, row
+            if progress:
+                progress(len(households))
+
+    def iter_summarised_answers(self, progress=None):
+        for household_id, row in self.iter_household_rows(progress=progress):
+            yield row
+
+    def get_summarised_answers(self):
+        return list(self.iter_summarised_answers())
+
+    def iter_report(self, progress=None):
+        yield self.set_report_headers()
+        for row in self.iter_summarised_answers(progress):
+            yield row
 
     def generate_report(self):
-        data = [self.set_report_headers()]
-        data.extend(self.get_summarised_answers())
-        return data
+        return list(self.iter_report())
 
     def _get_ancestors_names(self, household_location, exclude_type='country'):
         location_ancestors = get_ancestors(household_location, include_self=True)
@@ -1,8 +1,12 @@
+import numpy
 from django.utils.datastructures import SortedDict
+from rapidsms.contrib.locations.models import Location
 
 
 class SimpleIndicatorService(object):
-    def __init__(self, formula, location_parent):
+    def __init__(self, formula, location_parent, variance=None):
+        self.formula = formula
+        self.variance = variance
         self.count = formula.get_count_type()
         self.survey = formula.indicator.batch.survey
         self.location_parent = location_parent
@@ -13,7 +17,14 @@ class SimpleIndicatorService(object):
     def hierarchical_count_for(self, location_parent):
         return self.count.hierarchical_result_for(location_parent, self.survey)
 
+    def _cached(self, name, compute):
+        from survey.models import IndicatorResultCache
+        return IndicatorResultCache.fetch(self.formula, self.location_parent, self.survey, name, compute)
+
     def get_location_names_and_data_series(self):
+        return self._cached('data_series', self._location_names_and_data_series)
+
+    def _location_names_and_data_series(self):
         options, locations_names = self._arrange_answers_per_options()
         data_series = self.to_high_chart_format(options)
         return data_series, locations_names
@@ -39,14 +50,65 @@ class SimpleIndicatorService(object):
             }))
         return data_series
 
+    def _second_level_locations(self, first_level_locations):
+        parent_attr = Location._mptt_meta.parent_attr
+        children = Location.objects.filter(**{'%s__in' % parent_attr: first_level_locations}).select_related('type')
+        second_level_locations = SortedDict([(location.id, []) for location in first_level_locations])
+        for child in children.order_by('name'):
+            siblings = second_level_locations[getattr(child, '%s_id' % parent_attr)]
+            if len(siblings) < 10:
+                siblings.append(child)
+        return second_level_locations
+
+    def standard_errors_for(self, locations, results=None):
+        from survey.models import EnumerationArea
+        locations = list(locations)
+        results = results if results is not None else self.count.results_for_locations(locations, self.survey)
+        cells = [(location.id, key) for location in locations for key in list(results[location].keys()) + [None]]
+        index = dict([(cell, position) for position, cell in enumerate(cells)])
+        ea_counts = self.count.ea_counts_for_locations(locations, self.survey)
+        ea_ids = set(EnumerationArea.objects.filter(survey=self.survey).values_list('id', flat=True))
+        ea_ids.update(ea_counts.keys())
+        psu_totals = numpy.zeros((len(ea_ids), len(cells)))
+        for row, ea_id in enumerate(ea_ids):
+            for location_id, counts in ea_counts.get(ea_id, {}).items():
+                for key, count in counts.items():
+                    psu_totals[row, index[(location_id, key)]] += count
+                    psu_totals[row, index[(location_id, None)]] += count
+        errors = self.variance.standard_errors(psu_totals)
+        standard_errors = SortedDict()
+        for location in locations:
+            keys = results[location].keys()
+            standard_errors[location] = dict([(key, float(errors[index[(location.id, key)]])) for key in keys])
+            standard_errors[location]['Total'] = float(errors[index[(location.id, None)]])
+        return standard_errors
+
     def tabulated_data_series(self):
+        name = 'tabulated_data-%s' % self.variance.signature() if self.variance else 'tabulated_data'
+        return self._cached(name, self._tabulated_data_series)
+
+    def _add_standard_errors(self, tab_data, answers, errors):
+        for key in answers.keys():
+            tab_data['%s SE' % key] = round(errors[key], 2)
+        tab_data['Total SE'] = round(errors['Total'], 2)
+        lower, upper = self.variance.confidence_interval(tab_data['Total'], errors['Total'])
+        tab_data['Total 95% CI'] = "%.2f - %.2f" % (lower, upper)
+
+    def _tabulated_data_series(self):
         tabulated_data = []
-        first_level_locations = self.location_parent.get_children().order_by('name')[:10]
+        first_level_locations = list(self.location_parent.get_children().order_by('name').select_related('type')[:10])
+        second_level_locations = self._second_level_locations(first_level_locations)
+        all_children = sum(second_level_locations.values(), [])
+        results = self.count.results_for_locations(all_children, self.survey)
+        errors = self.standard_errors_for(all_children, results) if self.variance else {}
         for location in first_level_locations:
-            for child_location, answers in self.hierarchical_count_for(location).items():
+            for child_location in second_level_locations[location.id]:
+                answers = results[child_location]
                 tab_data = SortedDict({location.type.name: location.name})
                 tab_data[child_location.type.name] = child_location.name
                 tab_data.update(answers)
                 tab_data.update({'Total': sum(answers.values())})
+                if self.variance:
+                    self._add_standard_errors(tab_data, answers, errors[child_location])
                 tabulated_data.append(tab_data)
         return tabulated_data
@@ -0,0 +1,66 @@
+from itertools import chain
+
+import numpy
+from rapidsms.contrib.locations.models import Location
+from survey.models import LocationWeight
+from survey.utils.views_helper import descendants_queryset, ancestors_queryset
+
+
+class WeightedEstimator(object):
+    """Weights each answer by the inverse selection probability of the closest weighted location of its household."""
+
+    def __init__(self, question, survey):
+        if question.answer_type == question.TEXT:
+            raise ValueError("Weighted estimates need a numerical or multichoice question")
+        self.question = question
+        self.survey = survey
+
+    def _probabilities(self):
+        return dict(LocationWeight.objects.filter(survey=self.survey).values_list('location', 'selection_probability'))
+
+    def location_weights(self, location):
+        probabilities = self._probabilities()
+        weight = 1.0
+        for ancestor_id in ancestors_queryset(location).values_list('id', flat=True):
+            if probabilities.get(ancestor_id):
+                weight = 1.0 / probabilities[ancestor_id]
+        parent_attr = Location._mptt_meta.parent_attr
+        weights = {}
+        for location_id, parent_id in descendants_queryset(location).values_list('id', parent_attr):
+            if probabilities.get(location_id):
+                weights[location_id] = 1.0 / probabilities[location_id]
+            else:
+                weights[location_id] = weights.get(parent_id, weight)
+        return weights
+
+    def _answers(self, location):
+        answers = self.question.answer_class().objects.filter(question=self.question, household__survey=self.survey,
+                                                              household__location__in=descendants_queryset(location))
+        rows = answers.exclude(answer=None).values_list('household__location', 'answer').iterator()
+        answers = numpy.fromiter(chain.from_iterable(rows), dtype=float).reshape(-1, 2)
+        return answers[:, 0].astype(numpy.int64), answers[:, 1]
+
+    def weighted_answers(self, location):
+        location_weights = self.location_weights(location)
+        location_ids, values = self._answers(location)
+        known_ids = numpy.array(sorted(location_weights.keys()), dtype=numpy.int64)
+        known_weights = numpy.array([location_weights[location_id] for location_id in known_ids], dtype=float)
+        return known_weights[numpy.searchsorted(known_ids, location_ids)], values
+
+    def total(self, location):
+        weights, values = self.weighted_answers(location)
+        return float(numpy.dot(weights, values))
+
+    def mean(self, location):
+        weights, values = self.weighted_answers(location)
+        weight_sum = weights.sum()
+        return float(numpy.dot(weights, values) / weight_sum) if weight_sum else 0
+
+    def proportions(self, location):
+        weights, values = self.weighted_answers(location)
+        weight_sum = weights.sum()
+        proportions = {}
+        for option in self.question.options.all():
+            chosen = weights[values == option.id].sum()
+            proportions[option.text] = float(chosen / weight_sum) if weight_sum else 0
+        return proportions
@@ -0,0 +1,26 @@
+;
+
+jQuery(function($){
+  function csrf_token() {
+    var match = document.cookie.match(/csrftoken=([^;]+)/);
+    return match ? match[1] : '';
+  }
+
+  function track(job) {
+    $('#export-job-status').text(job.status.toLowerCase() + ' (' + job.progress + '%)');
+    if (job.download_url) {
+      window.location = job.download_url;
+    } else if (job.status != 'FAILED' && job.status != 'EXPIRED') {
+      setTimeout(function(){ $.getJSON('/exports/' + job.id + '/', track); }, 2000);
+    }
+  }
+
+  $('#queue-export').on('click', function(){
+    var data = $(this).closest('form').serialize() + '&csrfmiddlewaretoken=' + csrf_token();
+    if ($(this).data('report-type')) {
+      data += '&report_type=' + $(this).data('report-type');
+    }
+    $.post('/exports/', data, track, 'json');
+    return false;
+  });
+});
@@ -4,3 +4,9 @@ from celery.task import task
 @task
 def upload_task(upload_form):
     return upload_form.upload()
+
+
+@task
+def export_task(export_job_id):
+    from survey.models import ExportJob
+    return ExportJob.objects.get(id=export_job_id).run().status
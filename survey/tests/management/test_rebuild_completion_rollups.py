@@ -0,0 +1,37 @@
+from datetime import date
+
+from rapidsms.contrib.locations.models import LocationType, Location
+from survey.management.commands.rebuild_completion_rollups import Command
+from survey.models import Batch, Survey, EnumerationArea, Investigator, Household, HouseholdMember, \
+    HouseholdMemberBatchCompletion, BatchCompletionRollup
+from survey.tests.base_test import BaseTest
+
+
+class FakeStdout(object):
+    def write(self, msg):
+        return msg
+
+
+class RebuildCompletionRollupsTest(BaseTest):
+    def test_recounts_completed_and_total_households(self):
+        city = LocationType.objects.create(name='City', slug='city')
+        kampala = Location.objects.create(name='Kampala', type=city)
+        survey = Survey.objects.create(name="survey")
+        batch = Batch.objects.create(order=1, name="batch", survey=survey)
+        ea = EnumerationArea.objects.create(name="EA", survey=survey)
+        ea.locations.add(kampala)
+        investigator = Investigator.objects.create(name='inv', mobile_number='123456789', ea=ea)
+        household_1 = Household.objects.create(investigator=investigator, ea=ea, survey=survey)
+        household_2 = Household.objects.create(investigator=investigator, ea=ea, survey=survey)
+        member = HouseholdMember.objects.create(household=household_1, date_of_birth=date(1980, 05, 01))
+        HouseholdMember.objects.create(household=household_2, date_of_birth=date(1980, 05, 01))
+        HouseholdMemberBatchCompletion.objects.create(householdmember=member, batch=batch)
+        BatchCompletionRollup.objects.all().delete()
+
+        command = Command()
+        command.stdout = FakeStdout()
+        command.handle()
+
+        rollup = BatchCompletionRollup.objects.get(location=kampala, batch=batch)
+        self.assertEqual(2, rollup.total_households)
+        self.assertEqual(1, rollup.completed_households)
@@ -0,0 +1,25 @@
+from rapidsms.contrib.locations.models import LocationType, Location
+from survey.management.commands.rebuild_location_tree import Command
+from survey.tests.base_test import BaseTest
+from survey.utils.views_helper import get_descendants
+
+
+class FakeStdout(object):
+    def write(self, msg):
+        return msg
+
+
+class RebuildLocationTreeTest(BaseTest):
+    def test_rebuilds_tree_fields_of_locations(self):
+        country = LocationType.objects.create(name='Country', slug='country')
+        city = LocationType.objects.create(name='City', slug='city')
+        uganda = Location.objects.create(name='Uganda', type=country)
+        kampala = Location.objects.create(name='Kampala', type=city, tree_parent=uganda)
+        opts = Location._mptt_meta
+        Location.objects.filter(id=uganda.id).update(**{opts.right_attr: getattr(uganda, opts.left_attr) + 1})
+
+        command = Command()
+        command.stdout = FakeStdout()
+        command.handle()
+
+        self.assertEqual([uganda, kampala], get_descendants(uganda))
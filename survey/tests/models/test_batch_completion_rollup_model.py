@@ -0,0 +1,86 @@
+from datetime import date
+
+from django.db.models.query import QuerySet
+from mock import patch
+from rapidsms.contrib.locations.models import LocationType, Location
+from survey.models import Batch, Survey, EnumerationArea, Investigator, Household, HouseholdMember, \
+    HouseholdMemberBatchCompletion, BatchCompletionRollup
+from survey.tests.base_test import BaseTest
+
+
+class BatchCompletionRollupTest(BaseTest):
+    def setUp(self):
+        country = LocationType.objects.create(name='Country', slug='country')
+        city = LocationType.objects.create(name='City', slug='city')
+        self.uganda = Location.objects.create(name='Uganda', type=country)
+        self.kampala = Location.objects.create(name='Kampala', type=city, tree_parent=self.uganda)
+        self.abim = Location.objects.create(name='Abim', type=city, tree_parent=self.uganda)
+        self.survey = Survey.objects.create(name="survey")
+        self.batch = Batch.objects.create(order=1, name="batch", survey=self.survey)
+        self.kampala_ea = EnumerationArea.objects.create(name="Kampala EA", survey=self.survey)
+        self.kampala_ea.locations.add(self.kampala)
+        abim_ea = EnumerationArea.objects.create(name="Abim EA", survey=self.survey)
+        abim_ea.locations.add(self.abim)
+        investigator = Investigator.objects.create(name='inv', mobile_number='123456789', ea=self.kampala_ea)
+        self.household_1 = Household.objects.create(investigator=investigator, ea=self.kampala_ea, survey=self.survey)
+        self.household_2 = Household.objects.create(investigator=investigator, ea=abim_ea, survey=self.survey)
+        self.member_1 = HouseholdMember.objects.create(household=self.household_1, date_of_birth=date(1980, 05, 01))
+        self.member_2 = HouseholdMember.objects.create(household=self.household_2, date_of_birth=date(1980, 05, 01))
+
+    def test_counts_households_when_they_are_registered(self):
+        self.assertEqual((0, 1), BatchCompletionRollup.totals_under(self.kampala, self.batch))
+        self.assertEqual((0, 2), BatchCompletionRollup.totals_under(self.uganda, self.batch))
+
+    def test_updated_when_member_completions_are_created_and_deleted(self):
+        completion = HouseholdMemberBatchCompletion.objects.create(householdmember=self.member_1, batch=self.batch)
+        self.assertEqual((1, 1), BatchCompletionRollup.totals_under(self.kampala, self.batch))
+        self.assertEqual((1, 2), BatchCompletionRollup.totals_under(self.uganda, self.batch))
+
+        HouseholdMember.objects.create(household=self.household_1, date_of_birth=date(1990, 05, 01))
+        self.assertEqual((0, 1), BatchCompletionRollup.totals_under(self.kampala, self.batch))
+
+        completion.delete()
+        self.assertEqual((0, 2), BatchCompletionRollup.totals_under(self.uganda, self.batch))
+
+    def test_updated_when_household_batch_is_reopened(self):
+        HouseholdMemberBatchCompletion.objects.create(householdmember=self.member_1, household=self.household_1,
+                                                      batch=self.batch)
+        self.assertEqual((1, 1), BatchCompletionRollup.totals_under(self.kampala, self.batch))
+
+        self.household_1.batch_reopen(self.batch)
+        self.assertEqual((0, 1), BatchCompletionRollup.totals_under(self.kampala, self.batch))
+
+    def test_moves_households_between_locations(self):
+        self.household_2.ea = self.kampala_ea
+        self.household_2.save()
+
+        self.assertEqual((0, 2), BatchCompletionRollup.totals_under(self.kampala, self.batch))
+        self.assertEqual((0, 0), BatchCompletionRollup.totals_under(self.abim, self.batch))
+
+    def test_recount_updates_a_rollup_created_by_a_concurrent_request(self):
+        HouseholdMemberBatchCompletion.objects.create(householdmember=self.member_1, batch=self.batch)
+        update = QuerySet.update
+        calls = []
+
+        def update_losing_the_first_race(queryset, **kwargs):
+            calls.append(kwargs)
+            return 0 if len(calls) == 1 else update(queryset, **kwargs)
+
+        with patch.object(QuerySet, 'update', update_losing_the_first_race):
+            BatchCompletionRollup.recount(self.kampala.id, self.batch)
+
+        self.assertEqual(2, len(calls))
+        self.assertEqual(1, BatchCompletionRollup.objects.filter(location=self.kampala, batch=self.batch).count())
+        self.assertEqual((1, 1), BatchCompletionRollup.totals_under(self.kampala, self.batch))
+
+    def test_rebuilt_only_when_a_batch_changes_survey(self):
+        BatchCompletionRollup.objects.filter(batch=self.batch).delete()
+        self.batch.name = "renamed batch"
+        self.batch.save()
+        self.assertEqual((0, 0), BatchCompletionRollup.totals_under(self.uganda, self.batch))
+
+        self.batch.survey = Survey.objects.create(name="another survey")
+        self.batch.save()
+        self.batch.survey = self.survey
+        self.batch.save()
+        self.assertEqual((0, 2), BatchCompletionRollup.totals_under(self.uganda, self.batch))
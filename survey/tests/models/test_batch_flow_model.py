@@ -0,0 +1,90 @@
+from survey.models import Batch, Question, HouseholdMemberGroup, BatchQuestionOrder, AnswerRule, GroupCondition
+from survey.models.batch_flow import BatchFlow
+from survey.tests.base_test import BaseTest
+
+
+class BatchFlowTest(BaseTest):
+    def setUp(self):
+        self.batch = Batch.objects.create(order=1, name="Batch A")
+        self.group_1 = HouseholdMemberGroup.objects.create(name="Group 1", order=1)
+        self.group_2 = HouseholdMemberGroup.objects.create(name="Group 2", order=2)
+        self.question_1 = Question.objects.create(text="Question 1?", answer_type=Question.NUMBER, order=1,
+                                                  group=self.group_1, identifier='Q1')
+        self.question_2 = Question.objects.create(text="Question 2?", answer_type=Question.NUMBER, order=2,
+                                                  group=self.group_1, identifier='Q2')
+        self.question_3 = Question.objects.create(text="Question 3?", answer_type=Question.NUMBER, order=3,
+                                                  group=self.group_2, identifier='Q3')
+        for order, question in enumerate([self.question_1, self.question_2, self.question_3]):
+            question.batches.add(self.batch)
+            BatchQuestionOrder.objects.create(question=question, batch=self.batch, order=order + 1)
+
+    def test_compiles_ordered_questions_and_groups(self):
+        flow = BatchFlow.for_batch(self.batch)
+        self.assertEqual([self.question_1, self.question_2, self.question_3], flow.questions)
+        self.assertEqual([self.group_1, self.group_2], flow.groups)
+        self.assertEqual([self.group_2], flow.groups_from(2))
+        self.assertEqual([self.question_2], flow.questions_in(self.group_1, order_above=1))
+
+    def test_knows_last_question_of_group(self):
+        flow = BatchFlow.for_batch(self.batch)
+        self.assertFalse(flow.is_last_question_of_group(self.question_1))
+        self.assertTrue(flow.is_last_question_of_group(self.question_2))
+        self.assertTrue(flow.is_last_question_of_group(self.question_3))
+
+    def test_next_question_orders_resolve_without_queries(self):
+        subquestion = Question.objects.create(text="Sub question?", answer_type=Question.NUMBER,
+                                              group=self.group_1, subquestion=True, parent=self.question_1)
+        flow = BatchFlow.for_batch(self.batch)
+        with self.assertNumQueries(0):
+            self.assertEqual((0, 0), flow.next_question_orders(None))
+            self.assertEqual((1, 1), flow.next_question_orders(self.question_1))
+            self.assertEqual((1, 1), flow.next_question_orders(subquestion))
+            self.assertEqual((2, 0), flow.next_question_orders(self.question_2))
+
+    def test_holds_rules_of_questions_and_subquestions(self):
+        rule = AnswerRule.objects.create(question=self.question_1, batch=self.batch, action="SKIP_TO",
+                                         condition="EQUALS", validate_with_value=1, next_question=self.question_3)
+        flow = BatchFlow.for_batch(self.batch)
+        with self.assertNumQueries(0):
+            self.assertEqual([rule], flow.rules_for(self.question_1))
+            self.assertEqual(self.question_3, flow.rules_for(self.question_1)[0].next_question)
+            self.assertEqual([], flow.rules_for(self.question_2))
+
+    def test_reuses_compiled_flow_until_invalidated(self):
+        flow = BatchFlow.for_batch(self.batch)
+        self.assertIs(flow, BatchFlow.for_batch(self.batch))
+
+        question_4 = Question.objects.create(text="Question 4?", answer_type=Question.NUMBER, order=4,
+                                             group=self.group_2, identifier='Q4')
+        BatchQuestionOrder.objects.create(question=question_4, batch=self.batch, order=4)
+
+        new_flow = BatchFlow.for_batch(self.batch)
+        self.assertIsNot(flow, new_flow)
+        self.assertIn(question_4, new_flow.questions)
+
+    def test_rebuilds_when_rules_or_group_conditions_change(self):
+        flow = BatchFlow.for_batch(self.batch)
+        AnswerRule.objects.create(question=self.question_2, batch=self.batch, action="END_INTERVIEW",
+                                  condition="EQUALS", validate_with_value=0)
+        self.assertIsNot(flow, BatchFlow.for_batch(self.batch))
+
+        flow = BatchFlow.for_batch(self.batch)
+        condition = GroupCondition.objects.create(attribute="GENDER", condition="EQUALS", value=True)
+        condition.groups.add(self.group_1)
+        self.assertIsNot(flow, BatchFlow.for_batch(self.batch))
+
+    def test_other_processes_load_the_flow_from_the_cached_plan(self):
+        rule = AnswerRule.objects.create(question=self.question_1, batch=self.batch, action="SKIP_TO",
+                                         condition="EQUALS", validate_with_value=1, next_question=self.question_3)
+        flow = BatchFlow.for_batch(self.batch)
+        self.assertEqual([self.question_1.id, self.question_2.id, self.question_3.id],
+                         [question_id for question_id, order in flow.plan['orders']])
+
+        BatchFlow._compiled.clear()
+        loaded = BatchFlow.for_batch(self.batch)
+        self.assertIsNot(flow, loaded)
+        self.assertEqual(flow.version, loaded.version)
+        self.assertEqual(flow.questions, loaded.questions)
+        self.assertEqual([self.group_1, self.group_2], loaded.groups)
+        self.assertEqual([rule], loaded.rules_for(self.question_1))
+        self.assertTrue(loaded.is_last_question_of_group(self.question_2))
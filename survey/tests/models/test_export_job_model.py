@@ -0,0 +1,115 @@
+import os
+import shutil
+import tempfile
+from datetime import date, timedelta
+
+from django.test.utils import override_settings
+from django.utils import timezone
+from rapidsms.contrib.locations.models import Location, LocationType
+from survey.models import HouseholdMemberGroup, GroupCondition, Question, Batch, BatchQuestionOrder, Survey, \
+    EnumerationArea, ExportJob
+from survey.models.backend import Backend
+from survey.models.households import Household, HouseholdHead
+from survey.models.investigator import Investigator
+from survey.tests.base_test import BaseTest
+
+
+class ExportJobTest(BaseTest):
+    def setUp(self):
+        self.exports_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(EXPORTS_ROOT=self.exports_root)
+        self.settings_override.enable()
+        HouseholdMemberGroup.objects.create(name="GENERAL", order=2)
+        member_group = HouseholdMemberGroup.objects.create(name="Greater than 2 years", order=1)
+        condition = GroupCondition.objects.create(attribute="AGE", value=2, condition="GREATER_THAN")
+        condition.groups.add(member_group)
+        self.survey = Survey.objects.create(name='survey name')
+        self.batch = Batch.objects.create(order=1, name="BATCH A", survey=self.survey)
+        self.question = Question.objects.create(text="How many members?", answer_type=Question.NUMBER, order=1,
+                                                identifier="QUESTION_1", group=member_group)
+        self.question.batches.add(self.batch)
+        BatchQuestionOrder.objects.create(question=self.question, batch=self.batch, order=1)
+        location_type = LocationType.objects.create(name='Location', slug='location')
+        kampala = Location.objects.create(name="Kampala", type=location_type)
+        ea = EnumerationArea.objects.create(name="Kampala EA")
+        ea.locations.add(kampala)
+        backend = Backend.objects.create(name='something')
+        self.investigator = Investigator.objects.create(name="investigator", mobile_number="123", ea=ea,
+                                                        backend=backend)
+        household = Household.objects.create(investigator=self.investigator, uid=0, household_code='00010001', ea=ea,
+                                             survey=self.survey)
+        self.head = HouseholdHead.objects.create(household=household, surname="Surname", date_of_birth=date(2000, 9, 1))
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.exports_root)
+
+    def test_runs_export_and_stores_file(self):
+        job = ExportJob.queue(ExportJob.RESULTS, batch=self.batch)
+
+        self.assertEqual(ExportJob.COMPLETED, job.status)
+        self.assertEqual(self.survey, job.survey)
+        self.assertEqual(1, job.total)
+        self.assertEqual(100, job.progress())
+        self.assertTrue(job.is_ready())
+        self.assertTrue(job.file_path().startswith(self.exports_root))
+        self.assertIn('00010001', open(job.file_path()).read())
+
+    def test_reuses_stored_file_until_answers_change(self):
+        job = ExportJob.queue(ExportJob.RESULTS, batch=self.batch)
+        self.assertEqual(job, ExportJob.queue(ExportJob.RESULTS, batch=self.batch))
+
+        self.investigator.member_answered(self.question, self.head, answer=3, batch=self.batch)
+
+        new_job = ExportJob.queue(ExportJob.RESULTS, batch=self.batch)
+        self.assertNotEqual(job, new_job)
+        self.assertTrue(new_job.is_ready())
+        expired = ExportJob.objects.get(id=job.id)
+        self.assertEqual(ExportJob.EXPIRED, expired.status)
+        self.assertTrue(expired.is_ready())
+
+        ExportJob.objects.filter(id=job.id).update(modified=timezone.now() - timedelta(hours=1))
+        self.investigator.member_answered(self.question, self.head, answer=4, batch=self.batch)
+        ExportJob.queue(ExportJob.RESULTS, batch=self.batch)
+        self.assertFalse(ExportJob.objects.filter(id=job.id).exists())
+        self.assertFalse(os.path.exists(job.file_path()))
+        self.assertEqual(ExportJob.EXPIRED, ExportJob.objects.get(id=new_job.id).status)
+
+    def test_recomputes_when_stored_file_is_gone(self):
+        job = ExportJob.queue(ExportJob.INVESTIGATOR_COMPLETION, survey=self.survey)
+        os.remove(job.file_path())
+
+        new_job = ExportJob.queue(ExportJob.INVESTIGATOR_COMPLETION, survey=self.survey)
+        self.assertNotEqual(job, new_job)
+        self.assertTrue(new_job.is_ready())
+        self.assertEqual('investigator.csv', new_job.download_name())
+
+    def test_queues_again_when_a_job_stops_making_progress(self):
+        fingerprint = ExportJob.fingerprint_for(ExportJob.RESULTS, self.survey, self.batch)
+        running = ExportJob.objects.create(report_type=ExportJob.RESULTS, survey=self.survey, batch=self.batch,
+                                           fingerprint=fingerprint, status=ExportJob.RUNNING)
+        self.assertEqual(running, ExportJob.queue(ExportJob.RESULTS, batch=self.batch))
+
+        ExportJob.objects.filter(id=running.id).update(modified=timezone.now() - timedelta(hours=1))
+        new_job = ExportJob.queue(ExportJob.RESULTS, batch=self.batch)
+
+        self.assertNotEqual(running, new_job)
+        self.assertTrue(new_job.is_ready())
+        self.assertFalse(ExportJob.objects.filter(id=running.id, status=ExportJob.RUNNING).exists())
+
+    def test_recomputes_when_locations_change(self):
+        job = ExportJob.queue(ExportJob.RESULTS, batch=self.batch)
+
+        location = Location.objects.get(name="Kampala")
+        location.name = "Kampala Central"
+        location.save()
+
+        self.assertNotEqual(job, ExportJob.queue(ExportJob.RESULTS, batch=self.batch))
+
+    def test_investigator_completion_without_survey_tracks_every_household(self):
+        job = ExportJob.queue(ExportJob.INVESTIGATOR_COMPLETION)
+        self.assertEqual(job, ExportJob.queue(ExportJob.INVESTIGATOR_COMPLETION))
+
+        Household.objects.create(investigator=self.investigator, uid=1, ea=self.investigator.ea, survey=self.survey)
+
+        self.assertNotEqual(job, ExportJob.queue(ExportJob.INVESTIGATOR_COMPLETION))
@@ -0,0 +1,113 @@
+import shutil
+import tempfile
+from datetime import date, timedelta
+
+from django.test.utils import override_settings
+from rapidsms.contrib.locations.models import Location, LocationType
+from survey.models import HouseholdMemberGroup, GroupCondition, Question, Batch, BatchQuestionOrder, Survey, \
+    EnumerationArea, ExportSnapshot
+from survey.models.backend import Backend
+from survey.models.households import Household, HouseholdHead, HouseholdMember
+from survey.models.investigator import Investigator
+from survey.services.results_download_service import ResultsDownloadService
+from survey.tests.base_test import BaseTest
+
+
+class ExportSnapshotTest(BaseTest):
+    def setUp(self):
+        self.exports_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(EXPORTS_ROOT=self.exports_root)
+        self.settings_override.enable()
+        HouseholdMemberGroup.objects.create(name="GENERAL", order=2)
+        member_group = HouseholdMemberGroup.objects.create(name="Greater than 2 years", order=1)
+        condition = GroupCondition.objects.create(attribute="AGE", value=2, condition="GREATER_THAN")
+        condition.groups.add(member_group)
+        self.survey = Survey.objects.create(name='survey name')
+        self.batch = Batch.objects.create(order=1, name="BATCH A", survey=self.survey)
+        self.question = Question.objects.create(text="How many members?", answer_type=Question.NUMBER, order=1,
+                                                identifier="QUESTION_1", group=member_group)
+        self.question.batches.add(self.batch)
+        BatchQuestionOrder.objects.create(question=self.question, batch=self.batch, order=1)
+        location_type = LocationType.objects.create(name='Location', slug='location')
+        kampala = Location.objects.create(name="Kampala", type=location_type)
+        ea = EnumerationArea.objects.create(name="Kampala EA")
+        ea.locations.add(kampala)
+        backend = Backend.objects.create(name='something')
+        self.investigator = Investigator.objects.create(name="investigator", mobile_number="123", ea=ea,
+                                                        backend=backend)
+        self.household_1 = Household.objects.create(investigator=self.investigator, uid=0, household_code='00010001',
+                                                    ea=ea, survey=self.survey)
+        self.household_2 = Household.objects.create(investigator=self.investigator, uid=1, household_code='00010002',
+                                                    ea=ea, survey=self.survey)
+        self.head_1 = HouseholdHead.objects.create(household=self.household_1, surname="First",
+                                                   date_of_birth=date(2000, 9, 1))
+        self.head_2 = HouseholdHead.objects.create(household=self.household_2, surname="Second",
+                                                   date_of_birth=date(2000, 9, 1))
+        self.investigator.member_answered(self.question, self.head_1, answer=1, batch=self.batch)
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.exports_root)
+
+    def full_report(self):
+        return [[str(value) for value in row] for row in ResultsDownloadService(batch=self.batch).iter_report()]
+
+    def test_first_refresh_renders_every_household(self):
+        snapshot = ExportSnapshot.for_survey(self.survey, self.batch).refresh()
+
+        self.assertEqual(2, snapshot.rendered_households)
+        self.assertIsNotNone(snapshot.high_water_mark)
+        self.assertEqual(self.full_report(), list(snapshot.report_rows()))
+
+    def test_refresh_only_renders_households_changed_since_last_run(self):
+        ExportSnapshot.for_survey(self.survey, self.batch).refresh()
+
+        snapshot = ExportSnapshot.for_survey(self.survey, self.batch).refresh()
+        self.assertEqual(0, snapshot.rendered_households)
+
+        self.investigator.member_answered(self.question, self.head_2, answer=2, batch=self.batch)
+        rendered = []
+        snapshot = ExportSnapshot.for_survey(self.survey, self.batch).refresh(progress=rendered.append)
+        self.assertEqual(1, snapshot.rendered_households)
+        self.assertEqual([1], rendered)
+        self.assertEqual(self.full_report(), list(snapshot.report_rows()))
+
+    def test_drops_removed_members_and_households(self):
+        member = HouseholdMember.objects.create(household=self.household_1, surname="Member",
+                                                date_of_birth=date(1990, 1, 1))
+        ExportSnapshot.for_survey(self.survey, self.batch).refresh()
+
+        member.delete()
+        self.household_2.delete()
+
+        snapshot = ExportSnapshot.for_survey(self.survey, self.batch).refresh()
+        self.assertEqual(self.full_report(), list(snapshot.report_rows()))
+        self.assertEqual(2, len(list(snapshot.report_rows())))
+
+    def test_drops_deleted_answers(self):
+        ExportSnapshot.for_survey(self.survey, self.batch).refresh()
+
+        self.investigator.reanswer(self.question)
+
+        snapshot = ExportSnapshot.for_survey(self.survey, self.batch).refresh()
+        self.assertEqual(1, snapshot.rendered_households)
+        self.assertEqual(self.full_report(), list(snapshot.report_rows()))
+
+    def test_renders_every_household_again_after_a_location_is_renamed(self):
+        ExportSnapshot.for_survey(self.survey, self.batch).refresh()
+
+        kampala = Location.objects.get(name="Kampala")
+        kampala.name = "Kampala Central"
+        kampala.save()
+
+        snapshot = ExportSnapshot.for_survey(self.survey, self.batch).refresh()
+        self.assertEqual(2, snapshot.rendered_households)
+        self.assertEqual(self.full_report(), list(snapshot.report_rows()))
+
+    def test_renders_every_household_again_on_a_new_day(self):
+        snapshot = ExportSnapshot.for_survey(self.survey, self.batch).refresh()
+        ExportSnapshot.objects.filter(id=snapshot.id).update(rendered_on=date.today() - timedelta(days=1))
+
+        snapshot = ExportSnapshot.for_survey(self.survey, self.batch).refresh()
+        self.assertEqual(2, snapshot.rendered_households)
+        self.assertEqual(date.today(), snapshot.rendered_on)
@@ -1,5 +1,8 @@
+from datetime import date, timedelta
+
 from django.db import IntegrityError
 from django.test import TestCase
+from survey.models.households import Household, HouseholdMember, HouseholdHead
 from survey.models.householdgroups import GroupCondition
 
 
@@ -130,4 +133,25 @@ class GroupConditionTest(TestCase):
         self.failUnless(gender_condition)
 
         duplicate_condition = GroupCondition(attribute=attribute_type, value=gender_value, condition='EQUALS')
-        self.assertRaises(IntegrityError, duplicate_condition.save)
\ No newline at end of file
+        self.assertRaises(IntegrityError, duplicate_condition.save)
+
+    def test_members_filter_selects_the_members_matching_the_condition(self):
+        household = Household.objects.create(uid=1)
+        today = date.today()
+        for days in [0, 364, 365, 366, 730, 731, 7304, 7305, 7306, 7670, 7671]:
+            HouseholdMember.objects.create(household=household, surname=str(days), male=days % 2 == 0,
+                                           date_of_birth=today - timedelta(days=days))
+        HouseholdHead.objects.create(household=household, surname="head", male=False,
+                                     date_of_birth=today - timedelta(days=7305))
+        conditions = [GroupCondition.objects.create(attribute="AGE", value=20, condition='EQUALS'),
+                      GroupCondition.objects.create(attribute="age", value=1, condition='GREATER_THAN'),
+                      GroupCondition.objects.create(attribute="AGE", value=1, condition='LESS_THAN'),
+                      GroupCondition.objects.create(attribute="GENDER", value="Male", condition='EQUALS'),
+                      GroupCondition.objects.create(attribute="gender", value=False, condition='EQUALS'),
+                      GroupCondition.objects.create(attribute="GENERAL", value="HEAD", condition='EQUALS')]
+        members = list(HouseholdMember.objects.select_subclasses())
+
+        for condition in conditions:
+            expected = [member.id for member in members if member.attribute_matches(condition)]
+            selected = HouseholdMember.objects.filter(condition.members_filter()).values_list('id', flat=True)
+            self.assertEqual(sorted(expected), sorted(selected), str(condition))
@@ -35,15 +35,48 @@ class HouseholdTest(TestCase):
                                                                date_of_birth=date(1980, 2, 2), male=False,
                                                                household=self.household)
 
+    def test_knows_members_belonging_to_a_group_with_the_head_first(self):
+        head = HouseholdHead.objects.create(household=self.household, surname="Head", date_of_birth=date(1970, 1, 1))
+        HouseholdMember.objects.create(surname="Baby", date_of_birth=date.today(), household=self.household)
+        adult = HouseholdMember.objects.create(surname="Adult", date_of_birth=date(1990, 1, 1),
+                                               household=self.household)
+
+        members = self.household.members_belonging_to_group(self.member_group)
+
+        self.assertEqual([head, adult, self.household_member], members)
+        self.assertTrue(members[0].is_head())
+
+    def test_keeps_location_in_sync_with_its_ea(self):
+        self.assertEqual(self.kampala, self.household.location)
+        self.assertIn(self.household, Household.all_households_in(self.uganda, self.survey))
+
+        entebbe = Location.objects.create(name="Entebbe", type=self.city, tree_parent=self.uganda)
+        self.ea.locations.clear()
+        self.ea.locations.add(entebbe)
+        self.assertEqual(entebbe, Household.objects.get(id=self.household.id).location)
+
+        self.ea.locations.remove(entebbe)
+        self.assertIsNone(Household.objects.get(id=self.household.id).location)
+
+    def test_all_households_in_matches_any_location_of_the_ea(self):
+        entebbe = Location.objects.create(name="Entebbe", type=self.city, tree_parent=self.uganda)
+        self.ea.locations.add(entebbe)
+        self.assertEqual(self.kampala, Household.objects.get(id=self.household.id).location)
+
+        self.assertEqual([self.household], list(Household.all_households_in(entebbe, self.survey)))
+        self.assertEqual([self.household], list(Household.all_households_in(self.uganda, self.survey)))
+        self.assertIn(self.investigator, Investigator.lives_under_location(entebbe))
+        self.assertEqual(1, Investigator.lives_under_location(self.uganda).count())
+
     def test_location_hierarchy(self):
         self.assertEquals(self.household.location_hierarchy(), {'Country': self.uganda, 'City': self.kampala})
 
     def test_fields(self):
         hHead = Household()
         fields = [str(item.attname) for item in hHead._meta.fields]
-        self.assertEqual(len(fields), 9)
+        self.assertEqual(len(fields), 10)
         for field in ['id', 'investigator_id', 'created', 'modified', 'uid', 'ea_id', 'random_sample_number',
-                      'survey_id', 'household_code']:
+                      'survey_id', 'household_code', 'location_id']:
             self.assertIn(field, fields)
 
     def test_store(self):
@@ -0,0 +1,86 @@
+from datetime import date
+from django.template.defaultfilters import slugify
+from django.test import TestCase
+from rapidsms.contrib.locations.models import LocationType, Location
+from survey.models import HouseholdMemberGroup, GroupCondition, Question, Batch, HouseholdMemberBatchCompletion, \
+    NumericalAnswer, BatchQuestionOrder, Survey, EnumerationArea, InterviewProgress
+from survey.models.backend import Backend
+from survey.models.households import Household, HouseholdMember
+from survey.models.investigator import Investigator
+
+
+class InterviewProgressTest(TestCase):
+    def setUp(self):
+        self.member_group = HouseholdMemberGroup.objects.create(name="Greater than 2 years", order=1)
+        condition = GroupCondition.objects.create(attribute="AGE", value=2, condition="GREATER_THAN")
+        condition.groups.add(self.member_group)
+        country = LocationType.objects.create(name="Country", slug=slugify("country"))
+        city = LocationType.objects.create(name="City", slug=slugify("city"))
+        uganda = Location.objects.create(name="Uganda", type=country)
+        self.kampala = Location.objects.create(name="Kampala", type=city, tree_parent=uganda)
+        survey = Survey.objects.create(name="survey")
+        ea = EnumerationArea.objects.create(name="EA1", survey=survey)
+        ea.locations.add(self.kampala)
+        backend = Backend.objects.create(name='something backend')
+        self.investigator = Investigator.objects.create(name="inv", mobile_number="123456788", ea=ea, backend=backend)
+        self.household = Household.objects.create(investigator=self.investigator, ea=ea, uid=100, survey=survey)
+        self.household_member = HouseholdMember.objects.create(surname="Member", date_of_birth=date(1980, 2, 2),
+                                                               male=False, household=self.household)
+        self.batch = Batch.objects.create(order=1, name="Batch A")
+        self.batch.open_for_location(self.kampala)
+        self.question_1 = Question.objects.create(text="Question 1?", answer_type=Question.NUMBER, order=1,
+                                                  group=self.member_group, identifier='Q1')
+        self.question_2 = Question.objects.create(text="Question 2?", answer_type=Question.NUMBER, order=2,
+                                                  group=self.member_group, identifier='Q2')
+        for order, question in enumerate([self.question_1, self.question_2]):
+            question.batches.add(self.batch)
+            BatchQuestionOrder.objects.create(question=question, batch=self.batch, order=order + 1)
+
+    def test_records_answers_of_member(self):
+        self.assertIsNone(self.household_member.last_question_answered())
+
+        self.investigator.member_answered(self.question_1, self.household_member, 1, self.batch)
+
+        progress = InterviewProgress.objects.get(householdmember=self.household_member, batch=self.batch)
+        self.assertEqual(set([self.question_1.id]), progress.answered_question_ids())
+        self.assertEqual(self.question_1, progress.last_question)
+        self.assertEqual(self.investigator, progress.investigator)
+        self.assertFalse(progress.completed)
+        self.assertEqual(self.question_1, self.household_member.last_question_answered())
+        self.assertEqual(self.question_1, self.household.last_question_answered())
+        self.assertEqual(self.household_member, self.investigator.last_answered().householdmember)
+
+    def test_marks_completed_when_member_completes_batch(self):
+        self.investigator.member_answered(self.question_1, self.household_member, 1, self.batch)
+        self.investigator.member_answered(self.question_2, self.household_member, 1, self.batch)
+
+        progress = InterviewProgress.objects.get(householdmember=self.household_member, batch=self.batch)
+        self.assertTrue(progress.completed)
+        self.assertEqual(set([self.question_1.id, self.question_2.id]), progress.answered_question_ids())
+        self.assertIsNone(self.household_member.get_next_batch())
+
+    def test_completion_created_directly_marks_progress_completed(self):
+        HouseholdMemberBatchCompletion.objects.create(householdmember=self.household_member, batch=self.batch,
+                                                      household=self.household, investigator=self.investigator)
+        self.assertTrue(InterviewProgress.objects.get(householdmember=self.household_member,
+                                                      batch=self.batch).completed)
+
+    def test_rebuilds_progress_when_answer_is_deleted(self):
+        self.investigator.member_answered(self.question_1, self.household_member, 1, self.batch)
+        self.investigator.member_answered(self.question_2, self.household_member, 1, self.batch)
+
+        NumericalAnswer.objects.filter(question=self.question_2).delete()
+
+        progress = InterviewProgress.objects.get(householdmember=self.household_member, batch=self.batch)
+        self.assertEqual(set([self.question_1.id]), progress.answered_question_ids())
+        self.assertEqual(self.question_1, progress.last_question)
+        self.assertEqual(self.batch, self.household_member.get_next_batch())
+
+    def test_clears_progress_when_answers_are_marked_old(self):
+        self.investigator.member_answered(self.question_1, self.household_member, 1, self.batch)
+
+        self.household_member.mark_past_answers_as_old()
+
+        self.assertFalse(InterviewProgress.objects.filter(householdmember=self.household_member).exists())
+        self.assertIsNone(self.household_member.last_question_answered())
+        self.assertEqual(self.batch, self.household_member.get_next_batch())
@@ -1,5 +1,6 @@
 from datetime import date, datetime, timedelta
 
+from django.core.cache import cache
 from django.test import TestCase
 from mock import patch
 from django.db import IntegrityError, DatabaseError
@@ -43,9 +44,9 @@ class InvestigatorTest(TestCase):
     def test_fields(self):
         investigator = Investigator()
         fields = [str(item.attname) for item in investigator._meta.fields]
-        self.assertEqual(len(fields), 13)
+        self.assertEqual(len(fields), 14)
         for field in ['id', 'name', 'mobile_number', 'created', 'modified', 'male', 'age', 'level_of_education',
-                      'ea_id', 'language', 'backend_id', 'weights', 'is_blocked']:
+                      'ea_id', 'language', 'backend_id', 'weights', 'is_blocked', 'location_id']:
             self.assertIn(field, fields)
 
     def test_store(self):
@@ -58,6 +59,22 @@ class InvestigatorTest(TestCase):
         self.assertEqual(investigator.identity, COUNTRY_PHONE_CODE + investigator.mobile_number)
         self.assertEqual(investigator.weights, 30.99)
 
+    def test_loading_investigators_does_not_touch_the_interview_cache(self):
+        with patch.object(cache, 'get') as cache_get:
+            with patch.object(cache, 'set') as cache_set:
+                list(Investigator.objects.all())
+        self.assertFalse(cache_get.called)
+        self.assertFalse(cache_set.called)
+
+    def test_interview_cache_is_initialised_on_first_use(self):
+        cache.delete(self.investigator.cache_key)
+        self.assertEqual([], self.investigator.get_from_cache('REANSWER'))
+
+        cache.delete(self.investigator.cache_key)
+        self.investigator.set_in_cache('is_head', True)
+        self.assertTrue(self.investigator.get_from_cache('is_head'))
+        self.assertEqual({}, self.investigator.get_from_cache('registration_dict'))
+
     def test_mobile_number_is_unique(self):
         self.failUnlessRaises(IntegrityError, Investigator.objects.create, mobile_number="123456789")
 
@@ -386,6 +403,19 @@ class InvestigatorTest(TestCase):
     def test_location_property(self):
         self.assertEqual(self.kampala, self.investigator.location)
 
+    def test_location_follows_ea_changes(self):
+        entebbe = Location.objects.create(name="Entebbe")
+        ea = EnumerationArea.objects.create(name="EA2", survey=self.survey)
+        ea.locations.add(entebbe)
+
+        self.investigator.ea = ea
+        self.investigator.save()
+        self.assertEqual(entebbe, self.investigator.location)
+        self.assertIn(self.investigator, Investigator.lives_under_location(entebbe))
+
+        entebbe.enumeration_area.clear()
+        self.assertIsNone(Investigator.objects.get(id=self.investigator.id).location)
+
 class InvestigatorGenerateReport(TestCase):
     def setUp(self):
         country = LocationType.objects.create(name="Country", slug=slugify("country"))
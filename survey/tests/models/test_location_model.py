@@ -2,6 +2,7 @@
 from django.test import TestCase
 from rapidsms.contrib.locations.models import LocationType, Location
 from survey.models import LocationAutoComplete
+from survey.models.locations import deferred_auto_complete, rebuild_auto_complete_texts
 
 
 class LocationTest(TestCase):
@@ -49,4 +50,26 @@ class LocationAutoCompleteTest(TestCase):
         self.assertEqual(kampala.auto_complete_text(), "Uganda > Kampala Changed")
 
         soroti = Location.objects.get(name="Soroti")
-        self.assertEqual(soroti.auto_complete_text(), "Uganda > Kampala Changed > Soroti")
\ No newline at end of file
+        self.assertEqual(soroti.auto_complete_text(), "Uganda > Kampala Changed > Soroti")
+
+    def test_defers_auto_complete_texts_until_the_end_of_a_bulk_operation(self):
+        with deferred_auto_complete():
+            uganda = Location.objects.create(name="Uganda")
+            kampala = Location.objects.create(name="Kampala", tree_parent=uganda)
+            self.assertFalse(LocationAutoComplete.objects.exists())
+
+        self.assertEqual(2, LocationAutoComplete.objects.count())
+        self.assertEqual("Uganda > Kampala", kampala.auto_complete_text())
+
+    def test_rebuild_only_rewrites_changed_texts(self):
+        uganda = Location.objects.create(name="Uganda")
+        kampala = Location.objects.create(name="Kampala", tree_parent=uganda)
+        soroti = Location.objects.create(name="Soroti", tree_parent=uganda)
+        unchanged = LocationAutoComplete.objects.get(location=soroti).id
+        Location.objects.filter(id=kampala.id).update(name="Kampala Changed")
+
+        rebuild_auto_complete_texts()
+
+        self.assertEqual("Uganda > Kampala Changed", kampala.auto_complete_text())
+        self.assertEqual(unchanged, LocationAutoComplete.objects.get(location=soroti).id)
+        self.assertEqual(3, LocationAutoComplete.objects.count())
@@ -0,0 +1,40 @@
+from django.test import TestCase
+from rapidsms.contrib.locations.models import LocationType, Location
+from survey.models import LocationSearchIndex
+
+
+class LocationSearchIndexTest(TestCase):
+    def setUp(self):
+        country = LocationType.objects.create(name='Country', slug='country')
+        district = LocationType.objects.create(name='District', slug='district')
+        village = LocationType.objects.create(name='Village', slug='village')
+        self.uganda = Location.objects.create(name="Uganda", type=country)
+        self.kampala = Location.objects.create(name="Kampala", type=district, tree_parent=self.uganda)
+        self.mbarara = Location.objects.create(name="Mbarara", type=district, tree_parent=self.uganda)
+        self.kamwokya = Location.objects.create(name="Kamwokya", type=village, tree_parent=self.kampala)
+        self.bukoto = Location.objects.create(name="Bukoto", type=village, tree_parent=self.mbarara)
+
+    def test_matches_word_prefixes_of_the_whole_path(self):
+        matches = LocationSearchIndex.search("kampala")
+        self.assertEqual([match['id'] for match in matches], [self.kampala.id, self.kamwokya.id])
+
+    def test_prefers_name_matches_then_shallower_locations(self):
+        matches = LocationSearchIndex.search("ka")
+        self.assertEqual([match['id'] for match in matches], [self.kampala.id, self.kamwokya.id])
+        self.assertEqual(matches[0]['text'], "Uganda > Kampala")
+
+    def test_every_word_must_match(self):
+        matches = LocationSearchIndex.search("mba buk")
+        self.assertEqual([match['id'] for match in matches], [self.bukoto.id])
+        self.assertEqual(LocationSearchIndex.search("kampala buk"), [])
+
+    def test_limits_the_number_of_matches(self):
+        self.assertEqual(len(LocationSearchIndex.search("uganda", limit=2)), 2)
+        self.assertEqual(LocationSearchIndex.search("  "), [])
+
+    def test_reloads_after_locations_change(self):
+        self.assertEqual(LocationSearchIndex.search("kisasi"), [])
+        kisasi = Location.objects.create(name="Kisasi", type=self.kamwokya.type, tree_parent=self.kampala)
+        self.assertEqual([match['id'] for match in LocationSearchIndex.search("kisasi")], [kisasi.id])
+        kisasi.delete()
+        self.assertEqual(LocationSearchIndex.search("kisasi"), [])
@@ -0,0 +1,44 @@
+from django.template.defaultfilters import slugify
+from rapidsms.contrib.locations.models import LocationType, Location
+from survey.models import Batch, Survey, OpenBatchIndex
+from survey.tests.base_test import BaseTest
+
+
+class OpenBatchIndexTest(BaseTest):
+    def setUp(self):
+        country = LocationType.objects.create(name="Country", slug=slugify("country"))
+        city = LocationType.objects.create(name="City", slug=slugify("city"))
+        self.uganda = Location.objects.create(name="Uganda", type=country)
+        self.kampala = Location.objects.create(name="Kampala", type=city, tree_parent=self.uganda)
+        self.survey = Survey.objects.create(name="Survey A")
+        self.batch = Batch.objects.create(order=1, name="Batch A", survey=self.survey)
+        self.batch_2 = Batch.objects.create(order=2, name="Batch B", survey=self.survey)
+
+    def test_knows_open_batches_and_survey_of_location(self):
+        self.assertEqual([], OpenBatchIndex.batches_for(self.kampala))
+        self.assertIsNone(Survey.currently_open_survey(self.kampala))
+
+        self.batch_2.open_for_location(self.kampala)
+        self.batch.open_for_location(self.kampala)
+
+        self.assertEqual([self.batch, self.batch_2], OpenBatchIndex.batches_for(self.kampala))
+        self.assertEqual([self.batch, self.batch_2], Batch.open_ordered_batches(self.kampala))
+        self.assertEqual(self.survey, Survey.currently_open_survey(self.kampala))
+        self.assertEqual(self.batch_2, Batch.currently_open_for(self.kampala))
+
+    def test_resolves_from_index_without_queries(self):
+        self.batch.open_for_location(self.kampala)
+        OpenBatchIndex.batches_for(self.kampala)
+        with self.assertNumQueries(0):
+            self.assertEqual([self.batch], OpenBatchIndex.batches_for(self.kampala))
+            self.assertEqual(self.survey, OpenBatchIndex.open_survey_for(self.kampala))
+
+    def test_invalidated_when_batch_is_opened_or_closed(self):
+        self.assertEqual([], OpenBatchIndex.batches_for(self.uganda))
+        self.batch.open_for_location(self.uganda)
+        self.assertEqual([self.batch], OpenBatchIndex.batches_for(self.uganda))
+        self.assertEqual([self.batch], OpenBatchIndex.batches_for(self.kampala))
+
+        self.batch.close_for_location(self.uganda)
+        self.assertEqual([], OpenBatchIndex.batches_for(self.uganda))
+        self.assertIsNone(Survey.currently_open_survey(self.kampala))
@@ -283,6 +283,19 @@ class SimpleIndicatorQuestionCount(BaseTest):
         self.assertEquals(self.question_3.hierarchical_result_for(self.west, self.survey), west_region_responses)
 
 
+    def test_counts_options_for_all_locations_with_a_fixed_number_of_queries(self):
+        self.investigator.member_answered(self.question_3, self.household_head_1, self.yes_option.order, self.batch)
+        self.investigator_2.member_answered(self.question_3, self.household_head_6, self.no_option.order, self.batch)
+        other_survey = Survey.objects.create(name="other")
+        Household.objects.filter(id=self.household_head_7.household_id).update(survey=other_survey)
+        self.investigator_2.member_answered(self.question_3, self.household_head_7, self.no_option.order, self.batch)
+
+        with self.assertNumQueries(5):
+            results = self.question_3.hierarchical_result_for(self.uganda, self.survey)
+
+        self.assertEquals({self.central: {self.yes_option.text: 1, self.no_option.text: 0},
+                           self.west: {self.yes_option.text: 0, self.no_option.text: 1}}, results)
+
 class QuestionOptionTest(TestCase):
     def setUp(self):
         batch = Batch.objects.create(order=1)
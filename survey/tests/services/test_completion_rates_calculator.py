@@ -281,7 +281,23 @@ class HouseholdCompletionJsonService(BaseTest):
         batch = Batch.objects.create(order=1, name='B', survey=survey)
         batch.open_for_location(self.abim)
 
-        with patch.object(BatchLocationCompletionRates, 'percent_completed_households', return_value=10):
-            completion = BatchSurveyCompletionRates(self.district)
-            self.assertEqual(-1, completion.get_completion_formatted_for_json(survey)[kisoro.name])
-            self.assertNotEqual(0, completion.get_completion_formatted_for_json(survey)[self.abim.name])
\ No newline at end of file
+        completed = Household.objects.create(investigator=self.investigator_1, ea=self.investigator_1.ea,
+                                             survey=survey)
+        pending = Household.objects.create(investigator=self.investigator_1, ea=self.investigator_1.ea,
+                                           survey=survey)
+        member = HouseholdMember.objects.create(household=completed, date_of_birth=date(1980, 05, 01))
+        HouseholdMember.objects.create(household=pending, date_of_birth=date(1980, 05, 01))
+        HouseholdMemberBatchCompletion.objects.create(household=completed, householdmember=member, batch=batch,
+                                                      investigator=self.investigator_1)
+
+        completion = BatchSurveyCompletionRates(self.district)
+        self.assertEqual(-1, completion.get_completion_formatted_for_json(survey)[kisoro.name])
+        self.assertEqual(50.0, completion.get_completion_formatted_for_json(survey)[self.abim.name])
+
+    def test_open_location_without_households_is_zero_percent_complete(self):
+        survey = Survey.objects.create(name="open survey", description="open survey", has_sampling=True)
+        batch = Batch.objects.create(order=1, name='B', survey=survey)
+        batch.open_for_location(self.abim)
+
+        completion = BatchSurveyCompletionRates(self.district)
+        self.assertEqual(0, completion.get_completion_formatted_for_json(survey)[self.abim.name])
@@ -28,7 +28,25 @@ class CSVUploaderTest(BaseTest):
         file = File(open(self.filename, 'rb'))
         headers, data = CSVUploader(file).split_content()
         self.assertEqual(self.headers, headers)
-        self.assertEqual(self.data, data)
+        self.assertEqual(self.data, list(data))
+
+    def test_rows_are_read_lazily(self):
+        self.generate_csv_file(self.filename)
+        file = File(open(self.filename, 'rb'))
+        headers, data = CSVUploader(file).split_content()
+        self.assertEqual(self.data[0], data.next())
+        self.assertEqual(self.data[1:], list(data))
+        self.assertEqual(self.data, list(CSVUploader(file).rows()))
+
+    def test_only_a_leading_chunk_is_sniffed_for_binary_content(self):
+        self.generate_csv_file(self.filename)
+        file = File(open(self.filename, 'rb'))
+        file.read()
+        self.assertFalse(CSVUploader(file).file_is_not_csv())
+        self.assertEqual(0, file.tell())
+
+        self.generate_non_csv_file(self.filename)
+        self.assertTrue(CSVUploader(File(open(self.filename, 'rb'))).file_is_not_csv())
 
 class UploaderServiceTest(BaseTest):
 
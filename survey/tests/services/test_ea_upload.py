@@ -110,6 +110,27 @@ class EAUploadTest(BaseTest):
         self.failUnless(retrieved_ea)
         self.assertIn(parish, retrieved_ea[0].locations.all())
 
+    def test_should_link_every_listed_location_to_a_single_ea(self):
+        data = [
+                ['Regiontype', 'Districttype', 'Counttype', 'EA',                   'Parishtype', 'EA'],
+                ['region1',    'district1',    'county1',   'ea_containing_parish', 'parish_1',   ''],
+                ['region1',    'district1',    'county1',   'ea_containing_parish', 'parish_1b',  ''],
+                ['region1',    'district1',    'county1',   'ea_containing_parish', 'parish_1b',  '']]
+        self.write_to_csv('wb', data)
+
+        region = Location.objects.create(name="region1")
+        district = Location.objects.create(name="district1", tree_parent=region)
+        county = Location.objects.create(name="county1", tree_parent=district)
+        parish = Location.objects.create(name="parish_1", tree_parent=county)
+        parish_b = Location.objects.create(name="parish_1b", tree_parent=county)
+        EnumerationArea.objects.create(name='ea_containing_parish', survey=self.survey).locations.add(parish)
+
+        UploadEA(open(self.filename, 'rb')).upload(self.survey)
+
+        self.failIf(UploadErrorLog.objects.filter(model=self.uploader.MODEL, filename=self.filename))
+        retrieved_ea = EnumerationArea.objects.get(survey=self.survey)
+        self.assertEqual([parish, parish_b], list(retrieved_ea.locations.order_by('name')))
+
     def test_not_csv_file(self):
         EnumerationArea.objects.all().delete()
         self.filename = 'not_csv.xls'
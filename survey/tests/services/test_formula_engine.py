@@ -0,0 +1,92 @@
+from datetime import date
+
+from rapidsms.contrib.locations.models import Location
+from survey.models import Batch, HouseholdMemberGroup, Question, QuestionOption, Formula, Survey, EnumerationArea
+from survey.models.backend import Backend
+from survey.models.households import Household, HouseholdMember
+from survey.models.investigator import Investigator
+from survey.services.formula_engine import FormulaEngine
+from survey.tests.base_test import BaseTest
+
+
+class FormulaEngineTest(BaseTest):
+    def setUp(self):
+        self.batch = Batch.objects.create(order=1)
+        member_group = HouseholdMemberGroup.objects.create(name="Greater than 2 years", order=1)
+        self.numerator = Question.objects.create(text="Question 1?", answer_type=Question.NUMBER, order=1,
+                                                 group=member_group)
+        self.denominator = Question.objects.create(text="Question 2?", answer_type=Question.NUMBER, order=2,
+                                                   group=member_group)
+        self.multichoice = Question.objects.create(text="Question 3?", answer_type=Question.MULTICHOICE, order=3,
+                                                   group=member_group)
+        self.option_1 = QuestionOption.objects.create(question=self.multichoice, text="OPTION 1", order=1)
+        self.option_2 = QuestionOption.objects.create(question=self.multichoice, text="OPTION 2", order=2)
+        for question in [self.numerator, self.denominator, self.multichoice]:
+            question.batches.add(self.batch)
+
+        self.uganda = Location.objects.create(name="Uganda")
+        self.kampala = Location.objects.create(name="Kampala", tree_parent=self.uganda)
+        self.abim = Location.objects.create(name="Abim", tree_parent=self.uganda)
+        survey = Survey.objects.create(name="huhu")
+        backend = Backend.objects.create(name='something')
+        self.members = []
+        self.investigators = []
+        for index, (location, weights) in enumerate([(self.kampala, 0.3), (self.abim, 0.9), (self.abim, 0.5)]):
+            ea = EnumerationArea.objects.create(name="EA %d" % index, survey=survey)
+            ea.locations.add(location)
+            investigator = Investigator.objects.create(name="Investigator %d" % index, mobile_number=str(index),
+                                                       ea=ea, backend=backend, weights=weights)
+            self.investigators.append(investigator)
+            for uid in range(2):
+                household = Household.objects.create(investigator=investigator, uid=index * 2 + uid, ea=ea)
+                self.members.append((investigator, HouseholdMember.objects.create(
+                    surname="Member", date_of_birth=date(1980, 2, 2), male=False, household=household)))
+
+    def answer(self, values):
+        for (investigator, member), (numerator, denominator, option) in zip(self.members, values):
+            investigator.member_answered(self.numerator, member, numerator, self.batch)
+            investigator.member_answered(self.denominator, member, denominator, self.batch)
+            investigator.member_answered(self.multichoice, member, option, self.batch)
+
+    def test_numerical_results_match_per_investigator_computation(self):
+        self.answer([(20, 200, 1), (10, 100, 1), (40, 400, 2), (50, 500, 1), (5, 10, 2), (5, 30, 2)])
+        formula = Formula.objects.create(numerator=self.numerator, denominator=self.denominator)
+
+        expected = [formula.compute_numerical_question_for_investigator(investigator)
+                    for investigator in self.investigators]
+
+        self.assertAlmostEqual(expected[0], FormulaEngine(formula).compute_for_location(self.kampala))
+        self.assertAlmostEqual(sum(expected[1:]) / 2, FormulaEngine(formula).compute_for_location(self.abim))
+        self.assertAlmostEqual(sum(expected) / 3, FormulaEngine(formula).compute_for_location(self.uganda))
+
+    def test_multichoice_results_match_per_investigator_computation(self):
+        self.answer([(20, 20, 1), (10, 10, 1), (40, 30, 2), (50, 40, 1), (5, 10, 2), (5, 30, 1)])
+        formula = Formula.objects.create(numerator=self.multichoice, denominator=self.denominator)
+
+        expected = [formula.compute_multichoice_question_for_investigator(investigator)
+                    for investigator in self.investigators]
+
+        result = FormulaEngine(formula).compute_for_location(self.uganda)
+        for option in [self.option_1, self.option_2]:
+            self.assertAlmostEqual(sum([value[option.text] for value in expected]) / 3, result[option.text])
+
+    def test_investigators_without_denominator_answers_count_as_zero(self):
+        investigator, member = self.members[0]
+        investigator.member_answered(self.numerator, member, 20, self.batch)
+        formula = Formula.objects.create(numerator=self.numerator, denominator=self.denominator)
+
+        self.assertEqual(0, FormulaEngine(formula).compute_for_location(self.kampala))
+
+    def test_location_without_investigators_computes_to_zero(self):
+        entebbe = Location.objects.create(name="Entebbe", tree_parent=self.uganda)
+        formula = Formula.objects.create(numerator=self.multichoice, denominator=self.denominator)
+
+        self.assertEqual({self.option_1.text: 0, self.option_2.text: 0},
+                         FormulaEngine(formula).compute_for_location(entebbe))
+
+    def test_query_count_does_not_grow_with_investigators(self):
+        self.answer([(20, 20, 1), (10, 10, 1), (40, 30, 2), (50, 40, 1), (5, 10, 2), (5, 30, 1)])
+        formula = Formula.objects.create(numerator=self.multichoice, denominator=self.denominator)
+
+        with self.assertNumQueries(6):
+            FormulaEngine(formula).compute_for_location(self.uganda)
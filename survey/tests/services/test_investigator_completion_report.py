@@ -0,0 +1,67 @@
+from datetime import datetime
+
+from django.template.defaultfilters import slugify
+from rapidsms.contrib.locations.models import Location, LocationType
+from survey.models import HouseholdMemberGroup, Question, Batch, BatchQuestionOrder, Survey, EnumerationArea, \
+    LocationAncestry
+from survey.models.backend import Backend
+from survey.models.households import Household, HouseholdMember
+from survey.models.investigator import Investigator
+from survey.services.investigator_completion_report import InvestigatorCompletionReport
+from survey.tests.base_test import BaseTest
+
+
+class InvestigatorCompletionReportTest(BaseTest):
+    def setUp(self):
+        country = LocationType.objects.create(name="Country", slug=slugify("country"))
+        district = LocationType.objects.create(name="District", slug=slugify("district"))
+        city = LocationType.objects.create(name="City", slug=slugify("city"))
+        uganda = Location.objects.create(name="Uganda", type=country)
+        self.abim = Location.objects.create(name="Abim", type=district, tree_parent=uganda)
+        self.kampala = Location.objects.create(name="Kampala", type=city, tree_parent=self.abim)
+        self.survey = Survey.objects.create(name='SurveyA')
+        ea = EnumerationArea.objects.create(name="EA1", survey=self.survey)
+        ea.locations.add(self.kampala)
+        self.batch = Batch.objects.create(order=1, name='somebatch', survey=self.survey)
+        self.batch.open_for_location(self.abim)
+        member_group = HouseholdMemberGroup.objects.create(name='group1', order=1)
+        self.question = Question.objects.create(text="some question", answer_type=Question.NUMBER, order=1,
+                                                group=member_group)
+        self.batch.questions.add(self.question)
+        BatchQuestionOrder.objects.create(question=self.question, batch=self.batch, order=1)
+
+        backend = Backend.objects.create(name='something')
+        self.investigators = []
+        self.members = []
+        for index in range(3):
+            investigator = Investigator.objects.create(name="investigator %d" % index,
+                                                       mobile_number="98765432%02d" % index, ea=ea, backend=backend)
+            household = Household.objects.create(investigator=investigator, ea=ea, survey=self.survey)
+            self.members.append(HouseholdMember.objects.create(household=household,
+                                                               date_of_birth=datetime(2000, 02, 02)))
+            self.investigators.append(investigator)
+
+    def test_counts_completed_and_total_households_per_investigator(self):
+        self.investigators[0].member_answered(self.question, self.members[0], 1, self.batch)
+
+        investigators = list(Investigator.objects.values('id', 'name', 'mobile_number', 'location'))
+        counts = InvestigatorCompletionReport(self.survey, batch=self.batch).completion_counts(investigators)
+
+        self.assertEqual([1, 1], counts[self.investigators[0].id])
+        self.assertEqual([0, 1], counts[self.investigators[1].id])
+
+    def test_reports_investigators_who_completed_the_survey_with_their_locations(self):
+        self.investigators[0].member_answered(self.question, self.members[0], 1, self.batch)
+        self.investigators[2].member_answered(self.question, self.members[2], 1, self.batch)
+
+        report = InvestigatorCompletionReport(self.survey).generate_report()
+
+        header = ['Investigator', 'Phone Number'] + list(LocationType.objects.values_list('name', flat=True))
+        self.assertEqual(header, report[0])
+        self.assertEqual([['investigator 0', '9876543200', 'Uganda', 'Abim', 'Kampala'],
+                          ['investigator 2', '9876543202', 'Uganda', 'Abim', 'Kampala']], report[1:])
+
+    def test_query_count_does_not_grow_with_investigators(self):
+        LocationAncestry.names_for([self.kampala.id])
+        with self.assertNumQueries(6):
+            InvestigatorCompletionReport(self.survey).generate_report()
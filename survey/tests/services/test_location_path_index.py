@@ -0,0 +1,24 @@
+from rapidsms.contrib.locations.models import Location
+from survey.services.location_path_index import LocationPathIndex
+from survey.tests.base_test import BaseTest
+
+
+class LocationPathIndexTest(BaseTest):
+    def setUp(self):
+        self.uganda = Location.objects.create(name="Uganda")
+        self.region = Location.objects.create(name="Central", tree_parent=self.uganda)
+        self.district = Location.objects.create(name="Kampala", tree_parent=self.region)
+        self.county = Location.objects.create(name="Nakawa", tree_parent=self.district)
+
+    def test_looks_up_locations_by_the_names_of_their_closest_levels(self):
+        with self.assertNumQueries(1):
+            index = LocationPathIndex(3)
+        self.assertEqual(self.county.id, index.location_id(['central', 'KAMPALA', ' Nakawa ']))
+        self.assertEqual(self.district.id, index.location_id(['Uganda', 'Central', 'Kampala']))
+        self.assertIsNone(index.location_id(['Uganda', 'Kampala', 'Nakawa']))
+
+    def test_knows_names_under_a_parent_regardless_of_the_rest_of_the_path(self):
+        index = LocationPathIndex(3)
+        self.assertTrue(index.has_parented_name(['Uganda', 'Kampala', 'Nakawa']))
+        self.assertFalse(index.has_parented_name(['Central', 'Kampala', 'Kawempe']))
+        self.assertFalse(index.has_parented_name(['Central', 'Kampala', '']))
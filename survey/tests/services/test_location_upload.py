@@ -1,6 +1,6 @@
 import os
 from rapidsms.contrib.locations.models import LocationType, Location
-from survey.models import LocationTypeDetails, UploadErrorLog, LocationCode
+from survey.models import LocationTypeDetails, UploadErrorLog, LocationCode, LocationAutoComplete
 from survey.services.location_upload import UploadLocation
 from survey.tests.base_test import BaseTest
 
@@ -32,6 +32,17 @@ class LocationUploadHelper(BaseTest):
             [self.failUnless(Location.objects.filter(name=location_name, type__name__iexact=types[index].lower())) for
              index, location_name in enumerate(locations)]
 
+    def test_should_build_the_location_tree_and_auto_complete_texts_without_duplicates(self):
+        self.uploader.upload()
+        UploadLocation(open(self.filename, 'rb')).upload()
+
+        self.assertEqual(6, Location.objects.count())
+        region = Location.objects.get(name='region1')
+        county = Location.objects.get(name='county1')
+        self.assertEqual(['district1', 'county1'], [location.name for location in region.get_descendants()])
+        self.assertEqual('region1 > district1 > county1', LocationAutoComplete.objects.get(location=county).text)
+        self.assertEqual(6, LocationAutoComplete.objects.count())
+
     def test_should_log_error_if_a_required_location_type_is_left_blank(self):
         missing_fields_data = [['region3', '', 'county3']]
         self.write_to_csv('ab', missing_fields_data)
@@ -0,0 +1,36 @@
+import numpy
+from django.test import TestCase
+from survey.services.replicate_variance import ReplicateVariance
+
+
+class ReplicateVarianceTest(TestCase):
+    def setUp(self):
+        self.psu_totals = numpy.array([[3, 1], [0, 1], [5, 1], [2, 1]], dtype=float)
+
+    def test_jackknife_standard_errors_of_totals(self):
+        errors = ReplicateVariance(ReplicateVariance.JACKKNIFE).standard_errors(self.psu_totals)
+
+        deviations = self.psu_totals[:, 0] - self.psu_totals[:, 0].mean()
+        self.assertAlmostEqual(numpy.sqrt(4.0 / 3 * (deviations ** 2).sum()), errors[0])
+        self.assertAlmostEqual(0, errors[1])
+
+    def test_bootstrap_is_reproducible_with_a_seed_and_across_processes(self):
+        single = ReplicateVariance(ReplicateVariance.BOOTSTRAP, replicates=400, seed=7)
+        pooled = ReplicateVariance(ReplicateVariance.BOOTSTRAP, replicates=400, seed=7, processes=2)
+
+        errors = single.standard_errors(self.psu_totals)
+        self.assertEqual(list(errors), list(single.standard_errors(self.psu_totals)))
+        self.assertEqual((400, 2), pooled.bootstrap_replicates(self.psu_totals).shape)
+        self.assertAlmostEqual(numpy.sqrt(13), errors[0], delta=1)
+        self.assertAlmostEqual(0, errors[1])
+
+    def test_needs_at_least_two_sampling_units(self):
+        self.assertEqual([0, 0], list(ReplicateVariance().standard_errors(self.psu_totals[:1])))
+
+    def test_rejects_unknown_methods(self):
+        self.assertRaises(ValueError, ReplicateVariance, 'balanced')
+
+    def test_confidence_interval(self):
+        lower, upper = ReplicateVariance().confidence_interval(10, 1)
+        self.assertAlmostEqual(8.04, lower, places=2)
+        self.assertAlmostEqual(11.96, upper, places=2)
@@ -1,4 +1,5 @@
 from datetime import date
+from mock import patch
 from rapidsms.contrib.locations.models import LocationType, Location
 from survey.models import Survey, HouseholdMember, Batch, Investigator, Backend, HouseholdMemberGroup, QuestionModule, Question, BatchQuestionOrder, LocationTypeDetails, QuestionOption, GroupCondition, EnumerationArea
 from survey.services.results_download_service import ResultsDownloadService
@@ -115,6 +116,39 @@ class ResultsDownloadServiceTest(BaseTest):
         for i in range(5):
             self.assertIn(expected_csv_data[i], actual_csv_data)
 
+    def test_streams_report_rows_in_household_chunks(self):
+        HouseholdMemberGroup.objects.create(name="GENERAL", order=2)
+        household_heads = [self.create_household_head(uid, self.investigator, self.batch.survey) for uid in range(3)]
+        for household_head in household_heads:
+            self.investigator.member_answered(self.question_1, household_head, 1, self.batch)
+
+        result_down_load_service = ResultsDownloadService(batch=self.batch)
+        result_down_load_service.HOUSEHOLDS_PER_CHUNK = 2
+        report = result_down_load_service.iter_report()
+
+        self.assertEqual(result_down_load_service.set_report_headers(), report.next())
+        rows = list(report)
+        self.assertEqual(3, len(rows))
+        self.assertEqual([household_head.surname for household_head in household_heads], [row[2] for row in rows])
+        self.assertEqual([result_down_load_service.set_report_headers()] + rows,
+                         result_down_load_service.generate_report())
+
+    def test_pivots_bulk_loaded_answers_per_member(self):
+        HouseholdMemberGroup.objects.create(name="GENERAL", order=2)
+        household_head_1 = self.create_household_head(0, self.investigator, self.batch.survey)
+        household_head_2 = self.create_household_head(1, self.investigator, self.batch.survey)
+        self.investigator.member_answered(self.question_1, household_head_1, 4, self.batch)
+        self.investigator.member_answered(self.question_2, household_head_1, self.yes_option.order, self.batch)
+        self.investigator.member_answered(self.question_1, household_head_2, 7, self.batch)
+
+        with patch.object(HouseholdMember, 'answers_for') as answers_for:
+            rows = ResultsDownloadService(batch=self.batch).get_summarised_answers()
+        self.assertFalse(answers_for.called)
+
+        answers_by_surname = dict([(row[2], row[7:]) for row in rows])
+        self.assertEqual([4, self.yes_option.order, self.yes_option.text, ''], answers_by_surname[household_head_1.surname])
+        self.assertEqual([7, '', ''], answers_by_surname[household_head_2.surname])
+
     def test_should_repeat_questions_in_general_for_all_members(self):
         AGE = '24'
         general_group = HouseholdMemberGroup.objects.create(name="GENERAL", order=2)
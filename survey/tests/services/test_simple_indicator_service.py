@@ -1,6 +1,7 @@
 from random import randint
 from rapidsms.contrib.locations.models import LocationType, Location
 from survey.models import Backend, Investigator, QuestionModule, Question, QuestionOption, Indicator, Formula, Household, HouseholdHead, Batch, MultiChoiceAnswer, HouseholdMemberGroup, Survey, GroupCondition, EnumerationArea
+from survey.services.replicate_variance import ReplicateVariance
 from survey.services.simple_indicator_service import SimpleIndicatorService
 from survey.tests.base_test import BaseTest
 
@@ -102,6 +103,37 @@ class MultiChoiceQuestionSimpleIndicatorServiceTest(BaseTest):
             self.assertEqual(expected_table_data[i], tabulated_data[i])
 
 
+    def test_serves_repeat_views_from_cache_until_the_question_is_answered_again(self):
+        self.investigator.member_answered(self.question_3, self.household_head_1, self.yes_option.order, self.batch)
+        expected = SimpleIndicatorService(self.formula, self.uganda).get_location_names_and_data_series()
+
+        with self.assertNumQueries(0):
+            cached = SimpleIndicatorService(self.formula, self.uganda).get_location_names_and_data_series()
+        self.assertEqual(expected, cached)
+
+        self.investigator.member_answered(self.question_3, self.household_head_2, self.yes_option.order, self.batch)
+        data_series, locations = SimpleIndicatorService(self.formula, self.uganda).get_location_names_and_data_series()
+        self.assertEqual([{'data': [2, 0], 'name': self.yes_option.text}, {'data': [0, 0], 'name': self.no_option.text}],
+                         data_series)
+
+    def test_renamed_options_are_not_served_from_cache(self):
+        SimpleIndicatorService(self.formula, self.uganda).get_location_names_and_data_series()
+
+        self.yes_option.text = "Definitely"
+        self.yes_option.save()
+        data_series, locations = SimpleIndicatorService(self.formula, self.uganda).get_location_names_and_data_series()
+        self.assertIn("Definitely", [series['name'] for series in data_series])
+
+    def test_households_moved_to_another_ea_are_not_served_from_cache(self):
+        self.investigator.member_answered(self.question_3, self.household_head_1, self.yes_option.order, self.batch)
+        data_series, locations = SimpleIndicatorService(self.formula, self.uganda).get_location_names_and_data_series()
+        self.assertEqual([1, 0], data_series[0]['data'])
+
+        self.ea.locations.clear()
+        self.ea.locations.add(self.mbarara)
+        data_series, locations = SimpleIndicatorService(self.formula, self.uganda).get_location_names_and_data_series()
+        self.assertEqual([0, 1], data_series[0]['data'])
+
 class GroupCountSimpleIndicatorServiceTest(BaseTest):
     def setUp(self):
         self.survey = Survey.objects.create(name="haha")
@@ -171,3 +203,12 @@ class GroupCountSimpleIndicatorServiceTest(BaseTest):
         self.assertEqual(4, len(tabulated_data))
         for i in range(4):
             self.assertEqual(expected_table_data[i], tabulated_data[i])
+
+    def test_adds_jackknife_standard_errors_by_enumeration_area_to_details_data(self):
+        simple_indicator_service = SimpleIndicatorService(self.formula, self.uganda, variance=ReplicateVariance())
+        tabulated_data = simple_indicator_service.tabulated_data_series()
+
+        self.assertEqual({'Region': self.central.name, 'District': self.kampala.name, self.general_group.name: 5,
+                          'Total': 5, '%s SE' % self.general_group.name: 5.0, 'Total SE': 5.0,
+                          'Total 95% CI': '-4.80 - 14.80'}, tabulated_data[0])
+        self.assertEqual(4.0, tabulated_data[1]['Total SE'])
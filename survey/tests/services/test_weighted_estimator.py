@@ -0,0 +1,67 @@
+from datetime import date
+
+from rapidsms.contrib.locations.models import Location
+from survey.models import Batch, HouseholdMemberGroup, Question, QuestionOption, Survey, EnumerationArea, LocationWeight
+from survey.models.backend import Backend
+from survey.models.households import Household, HouseholdMember
+from survey.models.investigator import Investigator
+from survey.services.weighted_estimator import WeightedEstimator
+from survey.tests.base_test import BaseTest
+
+
+class WeightedEstimatorTest(BaseTest):
+    def setUp(self):
+        self.survey = Survey.objects.create(name="survey")
+        self.batch = Batch.objects.create(order=1, survey=self.survey)
+        member_group = HouseholdMemberGroup.objects.create(name="Greater than 2 years", order=1)
+        self.question = Question.objects.create(text="How many?", answer_type=Question.NUMBER, order=1,
+                                                group=member_group)
+        self.multichoice = Question.objects.create(text="Which?", answer_type=Question.MULTICHOICE, order=2,
+                                                   group=member_group)
+        self.yes = QuestionOption.objects.create(question=self.multichoice, text="Yes", order=1)
+        self.no = QuestionOption.objects.create(question=self.multichoice, text="No", order=2)
+        self.question.batches.add(self.batch)
+        self.multichoice.batches.add(self.batch)
+
+        self.uganda = Location.objects.create(name="Uganda")
+        self.central = Location.objects.create(name="Central", tree_parent=self.uganda)
+        self.kampala = Location.objects.create(name="Kampala", tree_parent=self.central)
+        self.west = Location.objects.create(name="West", tree_parent=self.uganda)
+        LocationWeight.objects.create(location=self.central, survey=self.survey, selection_probability=0.5)
+
+        backend = Backend.objects.create(name='something')
+        self.members = []
+        for index, location in enumerate([self.kampala, self.kampala, self.west]):
+            ea = EnumerationArea.objects.create(name="EA %d" % index, survey=self.survey)
+            ea.locations.add(location)
+            investigator = Investigator.objects.create(name="Investigator", mobile_number=str(index), ea=ea,
+                                                       backend=backend)
+            household = Household.objects.create(investigator=investigator, uid=index, ea=ea, survey=self.survey)
+            self.members.append((investigator, HouseholdMember.objects.create(
+                surname="Member", date_of_birth=date(1980, 2, 2), household=household)))
+
+    def answer(self, question, answers):
+        for (investigator, member), answer in zip(self.members, answers):
+            investigator.member_answered(question, member, answer, self.batch)
+
+    def test_weights_answers_with_the_closest_weighted_location(self):
+        self.assertEqual({self.uganda.id: 1.0, self.central.id: 2.0, self.kampala.id: 2.0, self.west.id: 1.0},
+                         WeightedEstimator(self.question, self.survey).location_weights(self.uganda))
+        self.assertEqual({self.kampala.id: 2.0},
+                         WeightedEstimator(self.question, self.survey).location_weights(self.kampala))
+
+    def test_computes_weighted_totals_and_means(self):
+        self.answer(self.question, [10, 20, 30])
+        estimator = WeightedEstimator(self.question, self.survey)
+
+        self.assertEqual(90, estimator.total(self.uganda))
+        self.assertEqual(18, estimator.mean(self.uganda))
+        self.assertEqual(15, estimator.mean(self.kampala))
+
+    def test_computes_weighted_proportions(self):
+        self.answer(self.multichoice, [self.yes.order, self.no.order, self.yes.order])
+        estimator = WeightedEstimator(self.multichoice, self.survey)
+
+        self.assertEqual({self.yes.text: 0.6, self.no.text: 0.4}, estimator.proportions(self.uganda))
+        self.assertEqual({self.yes.text: 0, self.no.text: 0}, estimator.proportions(Location.objects.create(
+            name="East", tree_parent=self.uganda)))
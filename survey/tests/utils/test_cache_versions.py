@@ -0,0 +1,27 @@
+from django.core.cache import cache
+from django.test import TestCase
+from mock import patch
+from survey.utils.cache_versions import cache_version, cache_versions, invalidate_version, VERSION_TIMEOUT
+
+
+class CacheVersionsTest(TestCase):
+    def setUp(self):
+        cache.delete_many(['first-version', 'second-version'])
+
+    def test_version_is_kept_until_invalidated(self):
+        version = cache_version('first-version')
+        self.assertEqual(version, cache_version('first-version'))
+
+        invalidate_version('first-version')
+        self.assertNotEqual(version, cache_version('first-version'))
+
+    def test_creates_only_missing_versions(self):
+        first = cache_version('first-version')
+        versions = cache_versions(['first-version', 'second-version'])
+        self.assertEqual(first, versions['first-version'])
+        self.assertEqual(versions['second-version'], cache_version('second-version'))
+
+    def test_stores_new_versions_with_a_long_timeout(self):
+        with patch.object(cache, 'set_many') as set_many:
+            cache_version('first-version')
+        self.assertEqual(VERSION_TIMEOUT, set_many.call_args[0][1])
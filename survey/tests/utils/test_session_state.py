@@ -0,0 +1,64 @@
+from django.core.cache import cache
+from django.test import TestCase
+
+from survey.utils.session_state import session_state, cached_blob, set_in_cached_blob, reset_cached_blob, \
+    delete_cached_blob
+
+
+class SessionStateTest(TestCase):
+    def setUp(self):
+        self.key = "SESSION-test-state"
+        cache.delete(self.key)
+
+    def tearDown(self):
+        cache.delete(self.key)
+
+    def test_writes_directly_outside_a_session_state(self):
+        cached_blob(self.key, {'PAGE': 1, 'HOUSEHOLD': None})
+        set_in_cached_blob(self.key, 'PAGE', 2)
+        self.assertEqual({'PAGE': 2, 'HOUSEHOLD': None}, cache.get(self.key))
+
+    def test_writes_changes_back_once_at_the_end(self):
+        cache.set(self.key, {'PAGE': 1, 'HOUSEHOLD': None})
+        with session_state():
+            set_in_cached_blob(self.key, 'PAGE', 2)
+            set_in_cached_blob(self.key, 'PAGE', 3)
+            self.assertEqual(3, cached_blob(self.key)['PAGE'])
+            self.assertEqual(1, cache.get(self.key)['PAGE'])
+        self.assertEqual({'PAGE': 3, 'HOUSEHOLD': None}, cache.get(self.key))
+
+    def test_merges_changed_fields_into_concurrent_writes(self):
+        cache.set(self.key, {'PAGE': 1, 'HOUSEHOLD': None})
+        with session_state():
+            set_in_cached_blob(self.key, 'PAGE', 2)
+            cache.set(self.key, {'PAGE': 1, 'HOUSEHOLD': 'household'})
+        self.assertEqual({'PAGE': 2, 'HOUSEHOLD': 'household'}, cache.get(self.key))
+
+    def test_reset_and_delete_are_applied_at_the_end(self):
+        defaults = {'PAGE': 1, 'HOUSEHOLD': None}
+        cache.set(self.key, {'PAGE': 5, 'HOUSEHOLD': 'household'})
+        with session_state():
+            reset_cached_blob(self.key, defaults)
+            set_in_cached_blob(self.key, 'PAGE', 2)
+        self.assertEqual({'PAGE': 2, 'HOUSEHOLD': None}, cache.get(self.key))
+        self.assertEqual(1, defaults['PAGE'])
+
+        with session_state():
+            delete_cached_blob(self.key)
+            self.assertIsNone(cached_blob(self.key))
+            self.assertIsNotNone(cache.get(self.key))
+        self.assertIsNone(cache.get(self.key))
+
+    def test_drops_changes_when_the_block_raises(self):
+        cache.set(self.key, {'PAGE': 1, 'HOUSEHOLD': None})
+        try:
+            with session_state():
+                set_in_cached_blob(self.key, 'PAGE', 2)
+                raise ValueError()
+        except ValueError:
+            pass
+        self.assertEqual({'PAGE': 1, 'HOUSEHOLD': None}, cache.get(self.key))
+
+        with session_state():
+            set_in_cached_blob(self.key, 'PAGE', 3)
+        self.assertEqual({'PAGE': 3, 'HOUSEHOLD': None}, cache.get(self.key))
@@ -2,7 +2,8 @@ from django.test import TestCase
 from rapidsms.contrib.locations.models import Location, LocationType
 
 from survey.models import LocationTypeDetails
-from survey.utils.views_helper import contains_key, get_descendants, get_ancestors, clean_query_params, prepend_to_keys
+from survey.utils.views_helper import contains_key, get_descendants, get_ancestors, clean_query_params, prepend_to_keys, \
+    descendants_queryset, ancestors_queryset, descendants_mapping, descendants_filter
 
 
 class ViewsHelperTest(TestCase):
@@ -172,3 +173,39 @@ class ViewsHelperTest(TestCase):
 
         self.assertEqual({'group__batch__id':1, 'group__question__text': 'haha'}, prepend_to_keys(params, 'group__'))
 
+    def test_tree_lookups_use_current_tree_position_of_location(self):
+        country = LocationType.objects.create(name='Country', slug='country')
+        city = LocationType.objects.create(name='City', slug='city')
+        village = LocationType.objects.create(name='Village', slug='village')
+        uganda = Location.objects.create(name='Uganda', type=country)
+        kampala = Location.objects.create(name='Kampala', type=city, tree_parent=uganda)
+        bukoto = Location.objects.create(name='Bukoto', type=village, tree_parent=kampala)
+
+        with self.assertNumQueries(2):
+            self.assertEqual([uganda, kampala, bukoto], list(descendants_queryset(uganda)))
+        with self.assertNumQueries(2):
+            self.assertEqual([kampala, uganda], list(ancestors_queryset(bukoto, ascending=True)))
+        self.assertEqual([uganda, kampala, bukoto], list(ancestors_queryset(bukoto, include_self=True)))
+
+    def test_maps_descendants_to_the_given_locations_that_contain_them(self):
+        country = LocationType.objects.create(name='Country', slug='country')
+        city = LocationType.objects.create(name='City', slug='city')
+        village = LocationType.objects.create(name='Village', slug='village')
+        uganda = Location.objects.create(name='Uganda', type=country)
+        kampala = Location.objects.create(name='Kampala', type=city, tree_parent=uganda)
+        abim = Location.objects.create(name='Abim', type=city, tree_parent=uganda)
+        bukoto = Location.objects.create(name='Bukoto', type=village, tree_parent=kampala)
+        expected = {kampala.id: kampala.id, bukoto.id: kampala.id, abim.id: abim.id}
+
+        self.assertEqual(expected, descendants_mapping([kampala, abim]))
+        with self.assertNumQueries(2):
+            self.assertEqual(expected, descendants_mapping(Location.objects.filter(type=city)))
+
+        self.assertRaises(ValueError, descendants_mapping, [uganda, kampala])
+
+        kampala_locations = Location.objects.filter(descendants_filter([kampala])).order_by('lft')
+        self.assertEqual([kampala, bukoto], list(kampala_locations))
+        self.assertEqual([bukoto], list(Location.objects.filter(descendants_filter([kampala], 'tree_parent__'))))
+
+        Location.objects.filter(id__in=[kampala.id, abim.id]).delete()
+        self.assertEqual({}, descendants_mapping([kampala, abim]))
@@ -1,6 +1,10 @@
+import json
+import shutil
+import tempfile
 from datetime import date, datetime
 from django.template.defaultfilters import slugify
 from django.test import TestCase
+from django.test.utils import override_settings
 from django.test.client import Client
 from django.contrib.auth.models import User, Group, Permission
 
@@ -81,7 +85,7 @@ class ExcelDownloadTest(BaseTest):
 
         contents = "%s\r\n%s\r\n" % (",".join(row1), ",".join(row2))
 
-        self.assertEquals(contents, response.content)
+        self.assertEquals(contents, "".join(response.streaming_content))
 
     def test_downloaded_excel_file_with_unknown_year_and_month_of_birth(self):
         file_name = "%s.csv" % self.batch.name
@@ -102,7 +106,7 @@ class ExcelDownloadTest(BaseTest):
 
         contents = "%s\r\n%s\r\n%s\r\n" % (",".join(row1), ",".join(row2), ",".join(row3))
 
-        self.assertEquals(contents, response.content)
+        self.assertEquals(contents, "".join(response.streaming_content))
         
     def test_downloaded_excel_when_only_survey_supplied(self):
         batchB = Batch.objects.create(order=2, name="different batch", survey=self.survey)
@@ -143,10 +147,37 @@ class ExcelDownloadTest(BaseTest):
         self.assertEquals(response.get('Content-Type'), "text/csv")
         self.assertEquals(response.get('Content-Disposition'), 'attachment; filename="%s"' % file_name)
 
-        self.assertEquals(contents, response.content)
+        self.assertEquals(contents, "".join(response.streaming_content))
+
+    def test_queues_export_and_downloads_stored_file(self):
+        exports_root = tempfile.mkdtemp()
+        try:
+            with override_settings(EXPORTS_ROOT=exports_root):
+                response = self.client.post('/exports/', data={'survey': self.survey.pk, 'batch': self.batch.pk})
+                self.assertEquals(200, response.status_code)
+                job = json.loads(response.content)
+
+                response = self.client.get('/exports/%s/' % job['id'])
+                status = json.loads(response.content)
+                self.assertEquals('COMPLETED', status['status'])
+                self.assertEquals(100, status['progress'])
+                self.assertEquals('/exports/%s/download/' % job['id'], status['download_url'])
+
+                response = self.client.get(status['download_url'])
+                self.assertEquals(200, response.status_code)
+                self.assertEquals(response.get('Content-Disposition'), 'attachment; filename="%s.csv"' % self.batch.name)
+                row = ['Kampala', self.household.household_code, 'Surname', '14', '9', '2000', 'Male', '1', '1',
+                       'OPTION 1', 'ANSWER']
+                self.assertIn(",".join(row), "".join(response.streaming_content))
+
+                response = self.client.post('/exports/', data={'survey': self.survey.pk, 'batch': self.batch.pk})
+                self.assertEquals(job['id'], json.loads(response.content)['id'])
+        finally:
+            shutil.rmtree(exports_root)
 
     def test_restricted_permssion(self):
         self.assert_restricted_permission_for('/aggregates/spreadsheet_report')
+        self.assert_restricted_permission_for('/exports/')
 
 
 class ExcelDownloadViewTest(BaseTest):
@@ -201,7 +232,7 @@ class ReportForCompletedInvestigatorTest(BaseTest):
         row1 = ['Investigator', 'Phone Number']
         row1.extend(list(LocationType.objects.all().values_list('name', flat=True)))
         contents = "%s\r\n" % (",".join(row1))
-        self.assertEquals(contents, response.content)
+        self.assertEquals(contents, "".join(response.streaming_content))
 
     def test_should_have_investigators_who_completed_a_selected_batch(self):
         country = LocationType.objects.create(name="Country", slug=slugify("country"))
@@ -248,9 +279,10 @@ class ReportForCompletedInvestigatorTest(BaseTest):
         row1 = ['Investigator', 'Phone Number']
         row1.extend(list(LocationType.objects.all().values_list('name', flat=True)))
         contents = "%s\r\n" % (",".join(row1))
-        self.assertIn(contents, response.content)
-        [self.assertIn(investigator_details, response.content) for investigator_details in expected_data]
-        [self.assertNotIn(investigator_details, response.content) for investigator_details in unexpected_data]
+        response_content = "".join(response.streaming_content)
+        self.assertIn(contents, response_content)
+        [self.assertIn(investigator_details, response_content) for investigator_details in expected_data]
+        [self.assertNotIn(investigator_details, response_content) for investigator_details in unexpected_data]
 
     def test_restricted_permission(self):
         self.assert_login_required('/investigators/completed/download/')
@@ -265,4 +297,6 @@ class ReportForCompletedInvestigatorTest(BaseTest):
         self.assertEquals(len(response.context['surveys']), 1)
         self.assertEquals(len(response.context['batches']), 1)
         self.assertIn(self.batch, response.context['batches'])
-        self.assertIn(self.survey, response.context['surveys'])
\ No newline at end of file
+        self.assertIn(self.survey, response.context['surveys'])
+        self.assertIn('js/export-jobs.js', response.content)
+        self.assertIn('data-report-type="INVESTIGATOR_COMPLETION"', response.content)
\ No newline at end of file
@@ -83,3 +83,20 @@ class LocationTest(BaseTest):
     def test_login_required(self):
         uganda = Location.objects.create(name='Uganda')
         self.assert_login_required('/locations/%s/children' % uganda.pk)
+
+    def test_search_returns_matching_locations_as_json(self):
+        response = self.client.get('/locations/search/', {'q': 'kamp'})
+        self.failUnlessEqual(response.status_code, 200)
+        content = json.loads(response.content)
+        self.assertEquals(len(content), 2)
+        self.assertEquals(content[0], {'id': self.kampala.pk, 'text': 'Uganda > Kampala'})
+        self.assertEquals(content[1], {'id': self.kampala_city.pk, 'text': 'Uganda > Kampala > Kampala City'})
+
+    def test_search_limits_matches(self):
+        response = self.client.get('/locations/search/', {'q': 'kamp', 'limit': 1})
+        content = json.loads(response.content)
+        self.assertEquals(len(content), 1)
+        self.assertEquals(content[0]['id'], self.kampala.pk)
+
+    def test_search_login_required(self):
+        self.assert_login_required('/locations/search/')
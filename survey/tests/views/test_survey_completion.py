@@ -328,4 +328,36 @@ class HouseholdCompletionJsonViewTest(BaseTest):
         self.assertEqual(response.status_code, 200)
         completion_rates = json.loads(response.content)
         self.assertEqual(completion_rates[self.zombo.name], 25.0)
-        self.assertEqual(completion_rates[self.abim.name], 50.0)
\ No newline at end of file
+        self.assertEqual(completion_rates[self.abim.name], 50.0)
+
+    def test_returns_not_modified_when_etag_matches(self):
+        response = self.client.get('/survey/%s/completion/json/' % self.survey.pk)
+        etag = response['ETag']
+
+        response = self.client.get('/survey/%s/completion/json/' % self.survey.pk, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(304, response.status_code)
+        self.assertEqual(etag, response['ETag'])
+
+        household_member = HouseholdMember.objects.create(household=self.household_1,
+                                                          date_of_birth=datetime.date(1980, 05, 01))
+        HouseholdMemberBatchCompletion.objects.create(householdmember=household_member, batch=self.batch)
+        response = self.client.get('/survey/%s/completion/json/' % self.survey.pk, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(200, response.status_code)
+        self.assertNotEqual(etag, response['ETag'])
+
+    def test_knows_completion_rates_for_requested_location_type(self):
+        response = self.client.get('/survey/%s/completion/json/' % self.survey.pk, {'location_type': 'city'})
+        completion_rates = json.loads(response.content)
+        self.assertEqual(set([self.kampala.name, self.apachi.name]), set(completion_rates.keys()))
+
+        response = self.client.get('/survey/%s/completion/json/' % self.survey.pk,
+                                   {'location_type': self.country.id})
+        self.assertEqual([self.uganda.name], json.loads(response.content).keys())
+
+    def test_location_type_names_are_matched_case_insensitively(self):
+        LocationType.objects.create(name='CITY', slug='upper-city')
+        response = self.client.get('/survey/%s/completion/json/' % self.survey.pk, {'location_type': 'city'})
+        self.assertEqual(200, response.status_code)
+
+        response = self.client.get('/survey/%s/completion/json/' % self.survey.pk, {'location_type': 'no such type'})
+        self.assertEqual(404, response.status_code)
@@ -15,6 +15,7 @@ urlpatterns = patterns('',
     url(r'^locations/enumeration_area/upload/$', 'survey.views.enumeration_area.upload', name='upload_ea'),
     url(r'^locations/weights/$', 'survey.views.location_weights.list_weights', name='list_weights_page'),
     url(r'^locations/weights/error_logs/$', 'survey.views.location_weights.error_logs', name='weights_error_logs_page'),
+    url(r'^locations/search/$', 'survey.views.locations.search', name='search_locations'),
     url(r'^locations/(?P<location_id>\d+)/children', 'survey.views.locations.children', name='get_location_children'),
     url(r'^locations/(?P<location_id>\d+)/enumeration_areas', 'survey.views.locations.enumeration_areas', name='get_enumeration_areas'),
     url(r'^investigators/$', 'survey.views.investigator.list_investigators', name="investigators_page"),
@@ -39,6 +40,9 @@ urlpatterns = patterns('',
     url(r'^aggregates/download_spreadsheet', 'survey.views.excel.download', name='download_excel'),
     url(r'^investigator_report/', 'survey.views.excel.investigator_report', name='investigator_report_page'),
     url(r'^investigators/completed/download/', 'survey.views.excel.completed_investigator', name='download_investigator_excel'),
+    url(r'^exports/$', 'survey.views.excel.queue_export', name='queue_export_page'),
+    url(r'^exports/(?P<export_job_id>\d+)/$', 'survey.views.excel.export_status', name='export_status_page'),
+    url(r'^exports/(?P<export_job_id>\d+)/download/$', 'survey.views.excel.download_export', name='download_export_page'),
     url(r'^accounts/login/$', 'django.contrib.auth.views.login', {'template_name': 'accounts/login.html'}, name='login_page'),
     url(r'^accounts/logout/$', 'django.contrib.auth.views.logout_then_login', name='logout_page'),
     url(r'^accounts/reset_password/$', 'django.contrib.auth.views.password_change',
@@ -1,8 +1,8 @@
 # vim: ai ts=4 sts=4 et sw=4 encoding=utf-8
 from django.conf import settings
-from django.core.cache import cache
 from survey.models import Survey
 from survey.ussd.base import USSDBase
+from survey.utils.session_state import cached_blob, set_in_cached_blob, delete_cached_blob
 
 
 class USSD(USSDBase):
@@ -71,19 +71,16 @@ class USSD(USSDBase):
 
     def set_session(self):
         self.session_string = "SESSION-%s-%s" % (self.request['transactionId'], self.__class__.__name__)
-        if not cache.get(self.session_string):
-            cache.set(self.session_string, self.DEFAULT_SESSION_VARIABLES)
+        cached_blob(self.session_string, self.DEFAULT_SESSION_VARIABLES)
 
     def clear_caches(self):
-        cache.delete(self.session_string)
+        delete_cached_blob(self.session_string)
 
     def get_from_session(self, key):
-        return cache.get(self.session_string)[key]
+        return cached_blob(self.session_string)[key]
 
     def set_in_session(self, key, value):
-        session = cache.get(self.session_string)
-        session[key] = value
-        cache.set(self.session_string, session)
+        set_in_cached_blob(self.session_string, key, value)
 
     def set_investigator_cache(self, key, value):
         self.investigator.set_in_cache(key, value)
@@ -0,0 +1,24 @@
+import uuid
+
+from django.core.cache import cache
+
+# Longest relative expiry memcached accepts; versions only change through invalidate_version.
+VERSION_TIMEOUT = 60 * 60 * 24 * 30
+
+
+def cache_versions(keys):
+    """Current version token stored under each key, creating and storing a fresh one for keys that have none."""
+    versions = cache.get_many(keys)
+    missing = dict([(key, uuid.uuid4().hex) for key in keys if not versions.get(key)])
+    if missing:
+        cache.set_many(missing, VERSION_TIMEOUT)
+        versions.update(missing)
+    return versions
+
+
+def cache_version(key):
+    return cache_versions([key])[key]
+
+
+def invalidate_version(key):
+    cache.delete(key)
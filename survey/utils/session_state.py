@@ -0,0 +1,167 @@
+import copy
+import threading
+
+from django.core.cache import cache
+
+
+class CasClient(object):
+    """gets/add/cas on the memcached client behind a django cache; the only place reaching into its internals."""
+
+    def __init__(self, django_cache):
+        self.cache = django_cache
+        self.client = getattr(django_cache, '_cache', None)
+
+    def supported(self):
+        return bool(getattr(self.client, 'behaviors', {}).get('cas'))
+
+    def gets(self, key):
+        return self.client.gets(self.cache.make_key(key))
+
+    def add(self, key, value):
+        return self.client.add(self.cache.make_key(key), value, self.cache.default_timeout)
+
+    def cas(self, key, value, token):
+        return self.client.cas(self.cache.make_key(key), value, token, self.cache.default_timeout)
+
+
+class SessionState(object):
+    """Request scoped view over the dict blobs kept in memcache.
+
+    Blobs are read once, changes are tracked per field and written back once on flush using gets/cas, merging
+    the changed fields into whatever another request may have stored in between.
+    """
+    CAS_RETRIES = 5
+    _local = threading.local()
+
+    def __init__(self):
+        self.blobs = {}
+        self.dirty = {}
+        self.replaced = set()
+        self.deleted = set()
+        self.discarded = False
+
+    @classmethod
+    def current(cls):
+        return getattr(cls._local, 'state', None)
+
+    @classmethod
+    def begin(cls):
+        state = cls.current()
+        if state:
+            state.depth += 1
+            return state
+        state = cls()
+        state.depth = 1
+        cls._local.state = state
+        return state
+
+    @classmethod
+    def end(cls, discard=False):
+        state = cls.current()
+        if not state:
+            return
+        state.depth -= 1
+        state.discarded = state.discarded or discard
+        if state.depth == 0:
+            cls._local.state = None
+            if not state.discarded:
+                state.flush()
+
+    def load(self, key, defaults=None):
+        if key not in self.blobs:
+            self.blobs[key] = None if key in self.deleted else cache.get(key)
+        if self.blobs[key] is None and defaults is not None:
+            self.reset(key, defaults)
+        return self.blobs[key]
+
+    def get(self, key, field):
+        return self.load(key)[field]
+
+    def set(self, key, field, value, defaults=None):
+        self.load(key, defaults)[field] = value
+        self.dirty.setdefault(key, set()).add(field)
+
+    def reset(self, key, values):
+        self.blobs[key] = copy.deepcopy(values)
+        self.replaced.add(key)
+        self.dirty.pop(key, None)
+
+    def delete(self, key):
+        self.blobs.pop(key, None)
+        self.dirty.pop(key, None)
+        self.replaced.discard(key)
+        self.deleted.add(key)
+
+    def flush(self):
+        for key in self.deleted - self.replaced:
+            cache.delete(key)
+        for key in self.replaced:
+            cache.set(key, self.blobs[key])
+        for key, fields in self.dirty.items():
+            if key not in self.replaced:
+                self._merge(key, dict([(field, self.blobs[key][field]) for field in fields]))
+        self.__init__()
+
+    def _merge(self, key, changes):
+        client = CasClient(cache)
+        if not client.supported():
+            blob = cache.get(key) or self.blobs[key]
+            blob.update(changes)
+            cache.set(key, blob)
+            return
+
+        for attempt in range(self.CAS_RETRIES):
+            blob, token = client.gets(key)
+            if blob is None:
+                blob = dict(self.blobs[key], **changes)
+                if client.add(key, blob):
+                    return
+                continue
+            blob.update(changes)
+            if client.cas(key, blob, token):
+                return
+        cache.set(key, dict(cache.get(key) or self.blobs[key], **changes))
+
+
+class session_state(object):
+    def __enter__(self):
+        return SessionState.begin()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        SessionState.end(discard=exc_type is not None)
+
+
+def cached_blob(key, defaults=None):
+    state = SessionState.current()
+    if state:
+        return state.load(key, defaults)
+    blob = cache.get(key)
+    if blob is None and defaults is not None:
+        cache.set(key, defaults)
+        blob = cache.get(key)
+    return blob
+
+
+def set_in_cached_blob(key, field, value, defaults=None):
+    state = SessionState.current()
+    if state:
+        return state.set(key, field, value, defaults)
+    blob = cache.get(key)
+    if blob is None and defaults is not None:
+        blob = copy.deepcopy(defaults)
+    blob[field] = value
+    cache.set(key, blob)
+
+
+def reset_cached_blob(key, values):
+    state = SessionState.current()
+    if state:
+        return state.reset(key, values)
+    cache.set(key, values)
+
+
+def delete_cached_blob(key):
+    state = SessionState.current()
+    if state:
+        return state.delete(key)
+    cache.delete(key)
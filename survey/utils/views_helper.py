@@ -1,3 +1,8 @@
+import bisect
+
+from django.db.models import Q
+from django.db.models.query import QuerySet
+
 
 def contains_key(params, key):
     return params.has_key(key) and params[key].isdigit()
@@ -7,37 +12,98 @@ def is_not_digit_nor_empty(params, key):
     return key in params and not (params[key] == '' or params[key].isdigit())
 
 
-def _get_descendants(location):
-    children = location.get_children()
-    if not children.exists():
-        return [location]
-    result = [location]
-    for child in children:
-        result.extend(_get_descendants(child))
-    return result
+def _tree_position(location):
+    opts = location._mptt_meta
+    fields = (opts.tree_id_attr, opts.left_attr, opts.right_attr)
+    return type(location)._default_manager.filter(pk=location.pk).values_list(*fields)[0]
 
 
-def get_descendants(location, include_self=True):
-    all_descendants_including_self = _get_descendants(location)
-    if not include_self:
-        all_descendants_including_self.remove(location)
-    return all_descendants_including_self
+def descendants_queryset(location, include_self=True):
+    opts = location._mptt_meta
+    tree_id, left, right = _tree_position(location)
+    lookup = 'e' if include_self else ''
+    return type(location)._default_manager.filter(**{opts.tree_id_attr: tree_id,
+                                                     '%s__gt%s' % (opts.left_attr, lookup): left,
+                                                     '%s__lt%s' % (opts.right_attr, lookup): right}).order_by(opts.left_attr)
+
+
+def ancestors_queryset(location, include_self=False, ascending=False):
+    opts = location._mptt_meta
+    tree_id, left, right = _tree_position(location)
+    lookup = 'e' if include_self else ''
+    order = '-%s' if ascending else '%s'
+    return type(location)._default_manager.filter(**{opts.tree_id_attr: tree_id,
+                                                     '%s__lt%s' % (opts.left_attr, lookup): left,
+                                                     '%s__gt%s' % (opts.right_attr, lookup): right}).order_by(order % opts.left_attr)
+
+
+def _tree_bounds(locations):
+    if isinstance(locations, QuerySet):
+        model = locations.model
+    else:
+        locations = list(locations)
+        if not locations:
+            return None, {}
+        model = type(locations[0])
+        locations = model._default_manager.filter(pk__in=[location.pk for location in locations])
+    opts = model._mptt_meta
+    bounds = {}
+    for location_id, tree_id, left, right in locations.values_list('pk', opts.tree_id_attr, opts.left_attr,
+                                                                   opts.right_attr):
+        bounds.setdefault(tree_id, []).append((left, right, location_id))
+    for tree_bounds in bounds.values():
+        tree_bounds.sort()
+        for (left, right, location_id), (next_left, next_right, next_id) in zip(tree_bounds, tree_bounds[1:]):
+            if next_left < right:
+                raise ValueError("Location %s is nested under location %s." % (next_id, location_id))
+    return model, bounds
 
 
-def _get_ancestors(location):
-    parent = location.tree_parent
-    if not parent:
-        return []
-    result = [parent]
-    result.extend(_get_ancestors(parent))
-    return result
+def descendants_filter(locations, path=''):
+    """Q matching the descendants of locations (themselves included) through a lookup path to a location."""
+    model, bounds = _tree_bounds(locations)
+    if not bounds:
+        return Q(pk__in=[])
+    opts = model._mptt_meta
+    condition = Q()
+    for tree_id, tree_bounds in bounds.items():
+        for left, right, location_id in tree_bounds:
+            condition |= Q(**{path + opts.tree_id_attr: tree_id, '%s%s__gte' % (path, opts.left_attr): left,
+                              '%s%s__lte' % (path, opts.right_attr): right})
+    return condition
+
+
+def descendants_mapping(locations):
+    """Maps every descendant id (locations themselves included) to the id of the location it falls under.
+
+    The locations must not be nested in each other, since a descendant maps to a single location; nested input
+    raises ValueError.
+    """
+    model, bounds = _tree_bounds(locations)
+    if not bounds:
+        return {}
+    opts = model._mptt_meta
+    condition = Q()
+    for tree_id, tree_bounds in bounds.items():
+        condition |= Q(**{opts.tree_id_attr: tree_id, '%s__gte' % opts.left_attr: tree_bounds[0][0],
+                          '%s__lte' % opts.right_attr: tree_bounds[-1][1]})
+    lefts = dict([(tree_id, [left for left, right, location_id in tree_bounds])
+                  for tree_id, tree_bounds in bounds.items()])
+    mapping = {}
+    fields = (opts.tree_id_attr, opts.left_attr, opts.right_attr)
+    for descendant_id, tree_id, left, right in model._default_manager.filter(condition).values_list('pk', *fields):
+        index = bisect.bisect_right(lefts[tree_id], left) - 1
+        if index >= 0 and bounds[tree_id][index][1] >= right:
+            mapping[descendant_id] = bounds[tree_id][index][2]
+    return mapping
+
+
+def get_descendants(location, include_self=True):
+    return list(descendants_queryset(location, include_self))
 
 
 def get_ancestors(location, include_self=False):
-    all_ancestors_including_self = _get_ancestors(location)
-    if include_self:
-        all_ancestors_including_self.insert(0, location)
-    return all_ancestors_including_self
+    return list(ancestors_queryset(location, include_self, ascending=True))
 
 
 def clean_query_params(params):
@@ -1,25 +1,37 @@
 import csv
+import json
 
-from django.shortcuts import render
-from django.http import HttpResponse
+from django.core.servers.basehttp import FileWrapper
+from django.core.urlresolvers import reverse
+from django.shortcuts import render, get_object_or_404
+from django.http import HttpResponse, StreamingHttpResponse, Http404
 from django.contrib.auth.decorators import login_required, permission_required
 
 from survey.forms.filters import SurveyBatchFilterForm
-from survey.models import Survey, Investigator
+from survey.models import Survey, ExportJob
 from survey.models.batch import Batch
+from survey.services.investigator_completion_report import InvestigatorCompletionReport
 from survey.services.results_download_service import ResultsDownloadService
 from survey.utils.views_helper import contains_key
 
 
+class _CSVRowBuffer(object):
+    def write(self, value):
+        return value
+
+
+def _csv_lines(rows):
+    writer = csv.writer(_CSVRowBuffer())
+    for row in rows:
+        yield writer.writerow(row)
+
+
 def _process_export(survey_batch_filter_form):
     batch = survey_batch_filter_form.cleaned_data['batch']
     survey = survey_batch_filter_form.cleaned_data['survey']
-    response = HttpResponse(content_type='text/csv')
+    rows = ResultsDownloadService(batch=batch, survey=survey).iter_report()
+    response = StreamingHttpResponse(_csv_lines(rows), content_type='text/csv')
     response['Content-Disposition'] = 'attachment; filename="%s.csv"' % (batch.name if batch else survey.name)
-    data = ResultsDownloadService(batch=batch, survey=survey).generate_report()
-    writer = csv.writer(response)
-    for row in data:
-        writer.writerow(row)
     return response
 
 
@@ -50,16 +62,53 @@ def completed_investigator(request):
         survey = Survey.objects.get(id=params['survey'])
     if contains_key(params, 'batch'):
         batch = Batch.objects.get(id=params['batch'])
-    response = HttpResponse(content_type='text/csv')
+    rows = InvestigatorCompletionReport(survey, batch=batch).iter_report()
+    response = StreamingHttpResponse(_csv_lines(rows), content_type='text/csv')
     response['Content-Disposition'] = 'attachment; filename="investigator.csv"'
-    data = Investigator.generate_completion_report(survey, batch=batch)
-    writer = csv.writer(response)
-    for row in data:
-        writer.writerow(row)
     return response
 
 @permission_required('auth.can_view_aggregates')
 def investigator_report(request):
     surveys = Survey.objects.all()
     batches = Batch.objects.all()
-    return render(request, 'aggregates/download_investigator.html', {'surveys':surveys, 'batches': batches})
\ No newline at end of file
+    return render(request, 'aggregates/download_investigator.html', {'surveys':surveys, 'batches': batches})
+
+
+def _export_job_json(export_job):
+    data = {'id': export_job.id, 'status': export_job.status, 'progress': export_job.progress(),
+            'error': export_job.error,
+            'download_url': reverse('download_export_page', args=(export_job.id,)) if export_job.is_ready() else None}
+    return HttpResponse(json.dumps(data), mimetype='application/json')
+
+
+@login_required
+@permission_required('auth.can_view_aggregates')
+def queue_export(request):
+    params = request.POST
+    if params.get('report_type', None) == ExportJob.INVESTIGATOR_COMPLETION:
+        survey = Survey.objects.get(id=params['survey']) if contains_key(params, 'survey') else None
+        batch = Batch.objects.get(id=params['batch']) if contains_key(params, 'batch') else None
+        return _export_job_json(ExportJob.queue(ExportJob.INVESTIGATOR_COMPLETION, survey=survey, batch=batch))
+    survey_batch_filter_form = SurveyBatchFilterForm(params)
+    if not survey_batch_filter_form.is_valid():
+        return HttpResponse(json.dumps(survey_batch_filter_form.errors), mimetype='application/json', status=400)
+    export_job = ExportJob.queue(ExportJob.RESULTS, survey=survey_batch_filter_form.cleaned_data['survey'],
+                                 batch=survey_batch_filter_form.cleaned_data['batch'])
+    return _export_job_json(export_job)
+
+
+@login_required
+@permission_required('auth.can_view_aggregates')
+def export_status(request, export_job_id):
+    return _export_job_json(get_object_or_404(ExportJob, id=export_job_id))
+
+
+@login_required
+@permission_required('auth.can_view_aggregates')
+def download_export(request, export_job_id):
+    export_job = get_object_or_404(ExportJob, id=export_job_id)
+    if not export_job.is_ready():
+        raise Http404
+    response = StreamingHttpResponse(FileWrapper(open(export_job.file_path(), 'rb')), content_type='text/csv')
+    response['Content-Disposition'] = 'attachment; filename="%s"' % export_job.download_name()
+    return response
@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.contrib import messages
 from django.core.urlresolvers import reverse
 from django.http import HttpResponseRedirect
@@ -8,6 +9,7 @@ from django.contrib.auth.decorators import permission_required
 from survey.forms.formula import FormulaForm
 from survey.models import Indicator
 from survey.models.formula import Formula
+from survey.services.replicate_variance import ReplicateVariance
 from survey.services.simple_indicator_service import SimpleIndicatorService
 from survey.views.location_widget import LocationWidget
 from survey.utils.views_helper import contains_key
@@ -88,12 +90,18 @@ def simple_indicator(request, indicator_id):
         first_level_location_analyzed = Location.objects.get(id=params['location'])
         selected_location = first_level_location_analyzed
     formula = formula[0]
-    indicator_service = SimpleIndicatorService(formula, first_level_location_analyzed)
+    variance = None
+    if params.get('variance') in ReplicateVariance.METHODS:
+        variance = ReplicateVariance(params['variance'], replicates=settings.INDICATOR_BOOTSTRAP_REPLICATES,
+                                     processes=settings.INDICATOR_REPLICATE_PROCESSES)
+    indicator_service = SimpleIndicatorService(formula, first_level_location_analyzed, variance=variance)
     data_series, locations = indicator_service.get_location_names_and_data_series()
     context = {'request': request,
                'data_series': data_series,
                'tabulated_data': indicator_service.tabulated_data_series(),
                'location_names': locations,
                'indicator': indicator,
+               'variance_methods': ReplicateVariance.METHODS,
+               'selected_variance': variance.method if variance else None,
                'locations': LocationWidget(selected_location, level=hierarchy_limit)}
     return render(request, 'formula/simple_indicator.html', context)
\ No newline at end of file
@@ -14,7 +14,7 @@ from survey.models import Survey, LocationCode, EnumerationArea
 from survey.models.households import Household
 from survey.models.investigator import Investigator
 from survey.views.location_widget import LocationWidget
-from survey.utils.views_helper import contains_key
+from survey.utils.views_helper import contains_key, descendants_queryset
 
 
 CREATE_HOUSEHOLD_DEFAULT_SELECT = ''
@@ -198,8 +198,8 @@ def list_households(request):
     params = request.GET
     if params.has_key('location') and params['location'].isdigit():
         selected_location = Location.objects.get(id=int(params['location']))
-        corresponding_locations = selected_location.get_descendants(include_self=True)
-        all_households = all_households.filter(ea__locations__in=corresponding_locations)
+        corresponding_locations = descendants_queryset(selected_location)
+        all_households = all_households.filter(ea__in=EnumerationArea.in_any_of(corresponding_locations))
 
     if params.has_key('ea') and params['ea'].isdigit():
         selected_ea = EnumerationArea.objects.get(id=int(params['ea']))
@@ -11,7 +11,7 @@ from survey.forms.investigator import *
 from survey.models import EnumerationArea
 from survey.models.investigator import Investigator
 from survey.views.location_widget import LocationWidget
-from survey.utils.views_helper import contains_key
+from survey.utils.views_helper import contains_key, descendants_queryset
 
 CREATE_INVESTIGATOR_DEFAULT_SELECT = ''
 LIST_INVESTIGATOR_DEFAULT_SELECT = 'All'
@@ -86,8 +86,8 @@ def list_investigators(request):
 
     if params.has_key('location') and params['location'].isdigit():
         selected_location = Location.objects.get(id=int(params['location']))
-        corresponding_locations = selected_location.get_descendants(include_self=True)
-        investigators = investigators.filter(ea__locations__in=corresponding_locations)
+        corresponding_locations = descendants_queryset(selected_location)
+        investigators = investigators.filter(ea__in=EnumerationArea.in_any_of(corresponding_locations))
 
     if params.has_key('ea') and params['ea'].isdigit():
         selected_ea = EnumerationArea.objects.get(id=int(params['ea']))
@@ -4,7 +4,7 @@ from django.http import HttpResponse
 from rapidsms.contrib.locations.models import Location
 from django.core.serializers.json import DjangoJSONEncoder
 from django.contrib.auth.decorators import login_required
-from survey.models import EnumerationArea
+from survey.models import EnumerationArea, LocationSearchIndex
 from survey.views.location_widget import LocationWidget
 
 
@@ -21,3 +21,13 @@ def enumeration_areas(request, location_id):
     eas = EnumerationArea.under_(location).values('id', 'name').order_by('name')
     json_dump = json.dumps(list(eas), cls=DjangoJSONEncoder)
     return HttpResponse(json_dump, mimetype='application/json')
+
+
+@login_required
+def search(request):
+    try:
+        limit = min(int(request.GET.get('limit', 10)), 50)
+    except ValueError:
+        limit = 10
+    matches = LocationSearchIndex.search(request.GET.get('q', ''), limit)
+    return HttpResponse(json.dumps(matches), mimetype='application/json')
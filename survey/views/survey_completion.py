@@ -1,10 +1,9 @@
-import json
+import hashlib
 
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required, permission_required
-from django.core.serializers.json import DjangoJSONEncoder
-from django.http import HttpResponse
-from django.shortcuts import render
+from django.http import HttpResponse, HttpResponseNotModified, Http404
+from django.shortcuts import render, get_object_or_404
 from rapidsms.contrib.locations.models import Location, LocationType
 
 from survey.forms.filters import LocationFilterForm
@@ -70,9 +69,23 @@ def show(request):
     return render(request, 'aggregates/completion_status.html', content)
 
 
+def __get_location_type(value):
+    if str(value).isdigit():
+        return get_object_or_404(LocationType, id=value)
+    location_types = LocationType.objects.filter(name__iexact=value).order_by('pk')[:1]
+    if not location_types:
+        raise Http404
+    return location_types[0]
+
+
 def completion_json(request, survey_id):
-    survey = Survey.objects.get(id=survey_id)
-    location_type = LocationType.objects.get(name='District')
-    completion_rates = BatchSurveyCompletionRates(location_type).get_completion_formatted_for_json(survey)
-    json_dump = json.dumps(completion_rates, cls=DjangoJSONEncoder)
-    return HttpResponse(json_dump, mimetype='application/json')
\ No newline at end of file
+    survey = get_object_or_404(Survey, id=survey_id)
+    location_type = __get_location_type(request.GET.get('location_type', 'District'))
+    json_dump = BatchSurveyCompletionRates(location_type).completion_json(survey)
+    etag = '"%s"' % hashlib.md5(json_dump).hexdigest()
+    if request.META.get('HTTP_IF_NONE_MATCH', None) == etag:
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(json_dump, mimetype='application/json')
+    response['ETag'] = etag
+    return response
\ No newline at end of file
@@ -5,6 +5,7 @@ from survey.investigator_configs import *
 from survey.models.investigator import Investigator
 from survey.ussd.ussd_pre_menu import USSDPremenu
 from survey.ussd.ussd_survey import USSDSurvey
+from survey.utils.session_state import session_state
 
 
 @csrf_exempt
@@ -14,7 +15,8 @@ def ussd(request):
     mobile_number = msisdn.replace(COUNTRY_PHONE_CODE, '', 1)
     try:
         investigator = Investigator.objects.get(mobile_number=mobile_number)
-        response = USSDPremenu(investigator, params).respond()
+        with session_state():
+            response = USSDPremenu(investigator, params).respond()
     except Investigator.DoesNotExist:
         response = USSDSurvey.investigator_not_registered_response()
     template = "ussd/%s.txt" % USSD_PROVIDER